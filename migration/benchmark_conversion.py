@@ -0,0 +1,194 @@
+"""
+Offline micro-benchmarks for the v1 -> v2 conversion path.
+
+Measures records/second and peak allocated memory per record for
+`v1_assistant_to_v2_agent`, `prepare_v2_api_payload` and `determine_agent_kind`
+over synthetic assistant corpora (varying tool counts, tool_resources sizes and
+metadata shapes). No network access or Azure credentials are needed.
+
+Usage:
+  python benchmark_conversion.py
+  python benchmark_conversion.py --records 2000 --repeat 7 --output-json output/bench.json
+  python benchmark_conversion.py --compare output/bench.json --tolerance 0.2
+"""
+import os, sys, json, time, random, logging, argparse, tracemalloc
+from typing import List, Dict, Any, Callable
+
+import v1_to_v2_migration as migration
+
+# Tool definitions cycled through when building synthetic assistants
+SYNTHETIC_TOOLS = [
+    {"type": "code_interpreter"},
+    {"type": "file_search"},
+    {"type": "function", "function": {"name": "get_weather", "description": "Get the weather", "parameters": {"type": "object", "properties": {"city": {"type": "string"}}, "required": ["city"]}}},
+    {"type": "mcp", "server_label": "docs", "server_url": "https://example.com/mcp", "require_approval": "never"},
+    {"type": "azure_function", "name": "queue_fn", "description": "Queue trigger", "parameters": {"type": "object"}, "input_queue": {"queue_name": "in"}, "output_queue": {"queue_name": "out"}},
+    {"type": "image_generation"},
+    {"type": "bing_grounding", "bing_grounding": {"search_configurations": [{"connection_id": "conn"}]}},
+]
+
+# Scenario name -> (tool count, files per tool resource, metadata shape)
+SCENARIOS = {
+    "minimal": (0, 0, "empty"),
+    "typical": (3, 5, "flat"),
+    "tool_heavy": (20, 5, "flat"),
+    "resource_heavy": (3, 500, "flat"),
+    "metadata_heavy": (3, 5, "nested"),
+    "string_encoded": (5, 20, "flat"),
+}
+
+def build_metadata(shape: str, rng: random.Random) -> Dict[str, Any]:
+    """Build metadata of the given shape: 'empty', 'flat' (a few strings) or 'nested' (16 keys plus feature flags)."""
+    if shape == "empty":
+        return {}
+    if shape == "flat":
+        return {"team": "agents", "env": rng.choice(["dev", "prod"]), "owner": f"user{rng.randint(1, 999)}"}
+    metadata = {f"key_{i}": f"value_{rng.randint(0, 10**6)}" for i in range(16)}
+    metadata["feature_flags"] = {f"flag_{i}": rng.choice([True, False]) for i in range(8)}
+    return metadata
+
+def build_assistant(index: int, tool_count: int, files_per_resource: int, metadata_shape: str, rng: random.Random, string_encoded: bool = False) -> Dict[str, Any]:
+    """
+    Build one synthetic v1 assistant.
+
+    Args:
+        string_encoded: Encode tools and tool_resources as JSON strings, like some project client exports
+    """
+    tools = [dict(SYNTHETIC_TOOLS[(index + i) % len(SYNTHETIC_TOOLS)]) for i in range(tool_count)]
+    tool_resources = {
+        "file_search": {"vector_store_ids": [f"vs_{index}_{i}" for i in range(max(1, files_per_resource // 50))]},
+        "code_interpreter": {"file_ids": [f"assistant-file-{index}-{i}" for i in range(files_per_resource)]},
+    }
+    assistant = {
+        "id": f"asst_{index:08d}",
+        "object": "assistant",
+        "created_at": 1700000000 + index,
+        "name": f"Benchmark Agent {index}",
+        "description": "Synthetic assistant for conversion benchmarks",
+        "model": rng.choice(["gpt-4o", "gpt-4o-mini", "gpt-4.1"]),
+        "instructions": "You are a helpful assistant. " * rng.randint(1, 20),
+        "tools": json.dumps(tools) if string_encoded else tools,
+        "tool_resources": json.dumps(tool_resources) if string_encoded else tool_resources,
+        "metadata": build_metadata(metadata_shape, rng),
+        "temperature": 0.7,
+        "top_p": 1.0,
+    }
+    return assistant
+
+def build_corpus(scenario: str, records: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build `records` synthetic assistants for a scenario from SCENARIOS."""
+    tool_count, files_per_resource, metadata_shape = SCENARIOS[scenario]
+    rng = random.Random(seed)
+    return [
+        build_assistant(i, tool_count, files_per_resource, metadata_shape, rng, string_encoded=(scenario == "string_encoded"))
+        for i in range(records)
+    ]
+
+def measure(func: Callable[[Any], Any], inputs: List[Any], repeat: int) -> Dict[str, float]:
+    """
+    Time `func` over all inputs (best of `repeat` runs) and measure its peak traced memory per record.
+
+    Returns:
+        {"records_per_second": ..., "us_per_record": ..., "peak_kib_per_record": ...}
+    """
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in inputs:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+
+    # Allocation pass, separate from timing since tracing slows everything down
+    sample = inputs[:min(len(inputs), 200)]
+    peak_total = 0
+    tracemalloc.start()
+    for item in sample:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        func(item)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - baseline
+    tracemalloc.stop()
+
+    return {
+        "records_per_second": len(inputs) / best if best > 0 else float("inf"),
+        "us_per_record": best / len(inputs) * 1e6,
+        "peak_kib_per_record": peak_total / len(sample) / 1024,
+    }
+
+def run_benchmarks(records: int, repeat: int, scenarios: List[str]) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Run every benchmarked function over every scenario corpus."""
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for scenario in scenarios:
+        corpus = build_corpus(scenario, records)
+        converted = [migration.v1_assistant_to_v2_agent(assistant) for assistant in corpus]
+        results[scenario] = {
+            "determine_agent_kind": measure(migration.determine_agent_kind, corpus, repeat),
+            "v1_assistant_to_v2_agent": measure(migration.v1_assistant_to_v2_agent, corpus, repeat),
+            "prepare_v2_api_payload": measure(migration.prepare_v2_api_payload, converted, repeat),
+            "end_to_end": measure(lambda a: migration.prepare_v2_api_payload(migration.v1_assistant_to_v2_agent(a)), corpus, repeat),
+        }
+    return results
+
+def print_results(results: Dict[str, Dict[str, Dict[str, float]]]):
+    """Print results as a table."""
+    print(f"{'scenario':<16} {'function':<26} {'records/s':>12} {'us/record':>10} {'peak KiB/rec':>13}")
+    print("-" * 81)
+    for scenario, functions in results.items():
+        for name, stats in functions.items():
+            print(f"{scenario:<16} {name:<26} {stats['records_per_second']:>12,.0f} {stats['us_per_record']:>10.1f} {stats['peak_kib_per_record']:>13.1f}")
+
+def compare_results(results: Dict[str, Dict[str, Dict[str, float]]], baseline: Dict[str, Dict[str, Dict[str, float]]], tolerance: float) -> List[str]:
+    """
+    Compare throughput with a baseline run.
+
+    Returns:
+        One message per scenario/function whose records/second dropped by more than `tolerance` (0.2 = 20%)
+    """
+    regressions = []
+    for scenario, functions in results.items():
+        for name, stats in functions.items():
+            previous = baseline.get(scenario, {}).get(name)
+            if not previous:
+                continue
+            ratio = stats["records_per_second"] / previous["records_per_second"]
+            if ratio < 1 - tolerance:
+                regressions.append(f"{scenario}/{name}: {previous['records_per_second']:,.0f} -> {stats['records_per_second']:,.0f} records/s ({(1 - ratio) * 100:.0f}% slower)")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the v1 to v2 conversion functions on synthetic assistants (offline).")
+    parser.add_argument('--records', type=int, default=1000, help='Synthetic assistants per scenario (default: 1000).')
+    parser.add_argument('--repeat', type=int, default=5, help='Timing runs per measurement; the best run is reported (default: 5).')
+    parser.add_argument('--scenario', action='append', choices=list(SCENARIOS), help='Scenario to run (can be used multiple times, default: all).')
+    parser.add_argument('--output-json', type=str, help='Write results to this JSON file, e.g. to use as a --compare baseline later.')
+    parser.add_argument('--compare', type=str, help='Baseline JSON from a previous --output-json run; exit with status 1 on throughput regressions.')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed throughput drop versus --compare before failing (default: 0.2 = 20%%).')
+    args = parser.parse_args()
+
+    # Conversion logs would dominate the timings
+    migration.logger.setLevel(logging.ERROR)
+
+    print(f"⏱️  Benchmarking conversion: {args.records} records per scenario, best of {args.repeat}")
+    results = run_benchmarks(args.records, args.repeat, args.scenario or list(SCENARIOS))
+    print_results(results)
+
+    if args.output_json:
+        os.makedirs(os.path.dirname(args.output_json) or ".", exist_ok=True)
+        with open(args.output_json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"💾 Results written to {args.output_json}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            print(f"❌ {len(regressions)} regression(s) versus {args.compare}:")
+            for regression in regressions:
+                print(f"   {regression}")
+            sys.exit(1)
+        print(f"✅ No throughput regressions versus {args.compare} (tolerance {args.tolerance:.0%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+"""
+Lightweight stand-in for the v1 assistants and v2 agents APIs, for load-testing the migration tool locally.
+
+Serves (under any path prefix, so the tool's full workspace/project URLs work unchanged):
+  GET  .../assistants                     v1 listing with limit/after cursor pagination
+  GET  .../assistants/{id}                single v1 assistant
+  POST .../agents/{name}/versions         create a v2 agent version (returns {name}:{version})
+  GET  .../agents/{name}/versions         list versions of an agent
+  GET  .../agents/{name}/versions/{ver}   one agent version
+  GET  .../agents/{name}                  agent with its latest version
+  GET  /_stats                            request, error and throttle counters
+
+Latency, error rates and 429 throttling are configurable, so concurrency, retry and resume behavior
+can be exercised on a laptop. Uses only the standard library.
+
+Usage:
+  python mock_agents_server.py --port 8080 --assistants 5000 --latency-ms 50 --throttle-rate 0.05 --error-rate 0.01
+  AZ_TOKEN=dummy python v1_to_v2_migration.py --use-api \\
+    --v1-base-url http://localhost:8080/v1 --v2-base-url http://localhost:8080/v2 --concurrency 16
+"""
+import re, json, time, random, argparse, threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import List, Dict, Any, Optional
+
+ASSISTANT_PATH = re.compile(r"/assistants(?:/(?P<assistant_id>[^/]+))?/?$")
+AGENT_VERSIONS_PATH = re.compile(r"/agents/(?P<name>[^/]+)/versions(?:/(?P<version>[^/]+))?/?$")
+AGENT_PATH = re.compile(r"/agents/(?P<name>[^/]+)/?$")
+MAX_PAGE_SIZE = 100
+
+def build_assistants(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """Build `count` synthetic v1 assistants with a mix of tools and tool_resources."""
+    rng = random.Random(seed)
+    tool_choices = [
+        [{"type": "code_interpreter"}],
+        [{"type": "file_search"}],
+        [{"type": "function", "function": {"name": "lookup", "parameters": {"type": "object", "properties": {}}}}],
+        [{"type": "code_interpreter"}, {"type": "file_search"}],
+        [],
+    ]
+    assistants = []
+    for i in range(count):
+        assistants.append({
+            "id": f"asst_mock{i:08d}",
+            "object": "assistant",
+            "created_at": 1700000000 + i,
+            "name": f"Mock Agent {i}",
+            "description": None,
+            "model": rng.choice(["gpt-4o", "gpt-4o-mini"]),
+            "instructions": "You are a helpful assistant.",
+            "tools": rng.choice(tool_choices),
+            "tool_resources": {
+                "file_search": {"vector_store_ids": [f"vs_mock{i}"]},
+                "code_interpreter": {"file_ids": [f"assistant-mockfile{i}"]},
+            },
+            "metadata": {"source": "mock"},
+            "temperature": 1.0,
+            "top_p": 1.0,
+        })
+    return assistants
+
+def load_assistants(path: str) -> List[Dict[str, Any]]:
+    """Load v1 assistants from a JSONL export (one assistant per line)."""
+    assistants = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                assistants.append(json.loads(line))
+    return assistants
+
+class MockState:
+    """Shared, thread-safe server state: the v1 corpus, created v2 versions and counters."""
+
+    def __init__(self, assistants: List[Dict[str, Any]], latency_ms: float, jitter_ms: float, error_rate: float, throttle_rate: float, retry_after: float, seed: Optional[int] = None):
+        self.assistants = assistants
+        self.assistant_index = {a["id"]: i for i, a in enumerate(assistants)}
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.agents: Dict[str, List[Dict[str, Any]]] = {}
+        self.stats = {"requests": 0, "throttled": 0, "errors": 0, "versions_created": 0}
+        self.lock = threading.Lock()
+        self.rng = random.Random(seed)
+
+    def count(self, key: str):
+        with self.lock:
+            self.stats[key] += 1
+
+    def roll(self) -> float:
+        with self.lock:
+            return self.rng.random()
+
+    def create_version(self, name: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        with self.lock:
+            versions = self.agents.setdefault(name, [])
+            version = str(len(versions) + 1)
+            record = {
+                "object": "agent.version",
+                "id": f"{name}:{version}",
+                "name": name,
+                "version": version,
+                "created_at": int(time.time()),
+                "description": payload.get("description"),
+                "metadata": payload.get("metadata", {}),
+                "definition": payload.get("definition", {}),
+            }
+            versions.append(record)
+            self.stats["versions_created"] += 1
+            return record
+
+    def get_versions(self, name: str) -> List[Dict[str, Any]]:
+        with self.lock:
+            return list(self.agents.get(name, []))
+
+class MockAgentsHandler(BaseHTTPRequestHandler):
+    """Request handler; the MockState lives on the server object."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real service
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def send_json(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def simulate_conditions(self) -> bool:
+        """Apply latency, then maybe answer with 429 or 500. Returns True if a failure response was sent."""
+        state = self.server.state
+        state.count("requests")
+        delay = state.latency_ms + (state.roll() * 2 - 1) * state.jitter_ms
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+        if state.throttle_rate and state.roll() < state.throttle_rate:
+            state.count("throttled")
+            self.send_json(429, {"error": {"code": "TooManyRequests", "message": "Mock throttling"}}, {"Retry-After": f"{state.retry_after:g}"})
+            return True
+        if state.error_rate and state.roll() < state.error_rate:
+            state.count("errors")
+            self.send_json(500, {"error": {"code": "InternalServerError", "message": "Mock failure"}})
+            return True
+        return False
+
+    def read_json_body(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return json.loads(raw) if raw else {}
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        state = self.server.state
+        if parsed.path == "/_stats":
+            with state.lock:
+                self.send_json(200, dict(state.stats, agents=len(state.agents)))
+            return
+        if self.simulate_conditions():
+            return
+
+        match = ASSISTANT_PATH.search(parsed.path)
+        if match:
+            assistant_id = match.group("assistant_id")
+            if assistant_id:
+                index = state.assistant_index.get(assistant_id)
+                if index is None:
+                    self.send_json(404, {"error": {"code": "NotFound", "message": f"No assistant found with id '{assistant_id}'"}})
+                else:
+                    self.send_json(200, state.assistants[index])
+                return
+            query = parse_qs(parsed.query)
+            limit = min(int((query.get("limit") or [20])[0]), MAX_PAGE_SIZE)
+            after = (query.get("after") or [None])[0]
+            start = state.assistant_index[after] + 1 if after in state.assistant_index else 0
+            page = state.assistants[start:start + limit]
+            self.send_json(200, {
+                "object": "list",
+                "data": page,
+                "first_id": page[0]["id"] if page else None,
+                "last_id": page[-1]["id"] if page else None,
+                "has_more": start + limit < len(state.assistants),
+            })
+            return
+
+        match = AGENT_VERSIONS_PATH.search(parsed.path)
+        if match:
+            versions = state.get_versions(match.group("name"))
+            version = match.group("version")
+            if version:
+                found = [v for v in versions if v["version"] == version]
+                if found:
+                    self.send_json(200, found[0])
+                else:
+                    self.send_json(404, {"error": {"code": "NotFound", "message": "Agent version not found"}})
+            else:
+                self.send_json(200, {"object": "list", "data": versions, "has_more": False})
+            return
+
+        match = AGENT_PATH.search(parsed.path)
+        if match:
+            versions = state.get_versions(match.group("name"))
+            if versions:
+                self.send_json(200, {"object": "agent", "id": match.group("name"), "name": match.group("name"), "versions": {"latest": versions[-1]}})
+            else:
+                self.send_json(404, {"error": {"code": "NotFound", "message": "Agent not found"}})
+            return
+
+        self.send_json(404, {"error": {"code": "NotFound", "message": f"Unknown path {parsed.path}"}})
+
+    def do_POST(self):
+        parsed = urlparse(self.path)
+        body = self.read_json_body()
+        if self.simulate_conditions():
+            return
+        match = AGENT_VERSIONS_PATH.search(parsed.path)
+        if match and not match.group("version"):
+            if not isinstance(body, dict) or "definition" not in body:
+                self.send_json(400, {"error": {"code": "BadRequest", "message": "Request body must contain 'definition'"}})
+                return
+            self.send_json(200, self.server.state.create_version(match.group("name"), body))
+            return
+        self.send_json(404, {"error": {"code": "NotFound", "message": f"Unknown path {parsed.path}"}})
+
+def create_server(host: str, port: int, state: MockState, verbose: bool = False) -> ThreadingHTTPServer:
+    """Create (but don't start) the mock server; port 0 picks a free port."""
+    server = ThreadingHTTPServer((host, port), MockAgentsHandler)
+    server.daemon_threads = True
+    server.state = state
+    server.verbose = verbose
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock v1 assistants / v2 agents API server for load-testing the migration tool.")
+    parser.add_argument('--host', default="127.0.0.1", help='Interface to listen on (default: 127.0.0.1; use 0.0.0.0 for Docker).')
+    parser.add_argument('--port', type=int, default=8080, help='Port to listen on (default: 8080).')
+    parser.add_argument('--assistants', type=int, default=1000, help='Number of synthetic v1 assistants to serve (default: 1000).')
+    parser.add_argument('--input-jsonl', type=str, help='Serve v1 assistants from this JSONL export instead of synthetic ones.')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='Added latency per request in milliseconds (default: 0).')
+    parser.add_argument('--jitter-ms', type=float, default=0.0, help='Random +/- variation of the latency in milliseconds (default: 0).')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500 (default: 0).')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429 (default: 0).')
+    parser.add_argument('--retry-after', type=float, default=1.0, help='Retry-After seconds sent with 429 responses (default: 1).')
+    parser.add_argument('--seed', type=int, help='Random seed for reproducible error/throttle sequences.')
+    parser.add_argument('--verbose', action='store_true', help='Log every request.')
+    args = parser.parse_args()
+
+    assistants = load_assistants(args.input_jsonl) if args.input_jsonl else build_assistants(args.assistants)
+    state = MockState(assistants, args.latency_ms, args.jitter_ms, args.error_rate, args.throttle_rate, args.retry_after, args.seed)
+    server = create_server(args.host, args.port, state, args.verbose)
+
+    print(f"🧪 Mock agents server on http://{args.host}:{server.server_address[1]}")
+    print(f"   {len(assistants)} v1 assistants, latency {args.latency_ms:g}±{args.jitter_ms:g} ms, "
+          f"errors {args.error_rate:.1%}, throttling {args.throttle_rate:.1%} (Retry-After {args.retry_after:g}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"\n📊 Stats: {json.dumps(dict(state.stats, agents=len(state.agents)))}")
+
+if __name__ == "__main__":
+    main()
@@ -281,6 +281,12 @@ try {
         Write-Host "${Blue}🔧 Passing beta version requirement to container${Reset}"
     }
     
+    # Persist the migration journal (used by --resume) outside the container.
+    # Docker Desktop maps file ownership for Windows bind mounts, so HOST_UID/HOST_GID aren't passed here;
+    # the entrypoint never chowns the mounted directory either way.
+    $outputDir = Join-Path (Get-Location) "output"
+    New-Item -ItemType Directory -Force -Path $outputDir | Out-Null
+    
     docker run --rm -it `
         @dockerEnvVars `
         -e COSMOS_DB_CONNECTION_STRING="$env:COSMOS_DB_CONNECTION_STRING" `
@@ -301,6 +307,7 @@ try {
         -e AZURE_RESOURCE_GROUP="$env:AZURE_RESOURCE_GROUP" `
         -e AZURE_PROJECT_NAME="$env:AZURE_PROJECT_NAME" `
         -v "$env:USERPROFILE\.azure:/home/migration/.azure" `
+        -v "${outputDir}:/app/output" `
         v1-to-v2-migration `
         @filteredArguments
     
@@ -207,7 +207,9 @@ DOCKER_CMD="docker run --rm -it \
     -e AZURE_PROJECT_NAME=\"$AZURE_PROJECT_NAME\" \
     -e NEED_BETA_VERSION=\"$NEED_BETA_VERSION\" \
     -e AZ_TOKEN=\"$SOURCE_TOKEN\" \
-    -e PRODUCTION_TOKEN=\"$PRODUCTION_TOKEN\""
+    -e PRODUCTION_TOKEN=\"$PRODUCTION_TOKEN\" \
+    -e HOST_UID=\"$(id -u)\" \
+    -e HOST_GID=\"$(id -g)\""
 
 echo -e "${GREEN}🏭 Passing both source and production tokens to container${NC}"
 
@@ -218,9 +220,16 @@ else
     echo -e "${GREEN}✅ Using standard azure-ai-projects version 1.0.0${NC}"
 fi
 
+# Persist the migration journal (used by --resume) outside the container.
+# The entrypoint needs root to install packages, so instead of `docker run --user` we pass
+# HOST_UID/HOST_GID and it drops to your uid/gid: ./output stays writable and owned by you
+# (the entrypoint never chowns the mounted directory).
+mkdir -p "$(pwd)/output"
+
 # Complete the Docker command
 DOCKER_CMD="$DOCKER_CMD \
     -v \"$HOME/.azure:/home/migration/.azure\" \
+    -v \"$(pwd)/output:/app/output\" \
     v1-to-v2-migration"
 
 # Add script arguments
@@ -1,18 +1,34 @@
-import os, sys, time, json, argparse, subprocess, requests
-from typing import List, Dict, Any, Optional
-from azure.cosmos import CosmosClient, exceptions
-from read_cosmos_data import fetch_data
-from azure.ai.agents.models import AzureFunctionStorageQueue, AzureFunctionTool
-
-# Import AIProjectClient for project endpoint support
-try:
-    from azure.ai.projects import AIProjectClient
-    from azure.identity import DefaultAzureCredential, AzureCliCredential
-    from azure.core.credentials import AccessToken
-    PROJECT_CLIENT_AVAILABLE = True
-except ImportError:
-    PROJECT_CLIENT_AVAILABLE = False
-    print("⚠️  Warning: azure-ai-projects package not available. Project endpoint functionality disabled.")
+import os, sys, time, json, math, argparse, subprocess, requests, threading, logging, pprint, queue, atexit, hashlib, contextlib, re, importlib.util, asyncio
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Iterable, Callable, Mapping
+from urllib.parse import urlparse
+# Azure SDKs (azure.cosmos, azure.ai.projects, azure.identity) and read_cosmos_data (pandas) are imported
+# where they are used, so --help, dry runs and API-only runs don't pay for loading them
+
+# Per-record output goes through this logger so --log-level / --progress can quiet it down
+logger = logging.getLogger("v1_to_v2_migration")
+DEFAULT_LOG_LEVEL = "INFO"
+LOG_LEVELS = ["DEBUG", "INFO", "WARNING", "ERROR"]
+
+def configure_logging(level: str = DEFAULT_LOG_LEVEL):
+    """
+    Send migration log records to stdout as plain messages, matching the script's print-style output.
+    """
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.handlers[:] = [handler]
+    logger.setLevel(getattr(logging, level.upper(), logging.INFO))
+    logger.propagate = False
+
+def module_available(name: str) -> bool:
+    """Check whether a module can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+# AIProjectClient for project endpoint support (imported on first use)
+PROJECT_CLIENT_AVAILABLE = module_available("azure.ai.projects") and module_available("azure.identity")
 
 # Cosmos DB Configuration
 COSMOS_CONNECTION_STRING = os.getenv("COSMOS_CONNECTION_STRING") or None
@@ -42,37 +58,579 @@ PRODUCTION_SUBSCRIPTION = os.getenv("PRODUCTION_SUBSCRIPTION")  # e.g., "b161545
 PRODUCTION_TENANT = os.getenv("PRODUCTION_TENANT")  # e.g., "33e577a9-b1b8-4126-87c0-673f197bf624"
 PRODUCTION_TOKEN = os.getenv("PRODUCTION_TOKEN")  # Production token from PowerShell script
 
-# v1 API base URL
-BASE_V1 = f"https://{HOST}/agents/v1.0/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/{RESOURCE_GROUP}/providers/Microsoft.MachineLearningServices/workspaces/{WORKSPACE}"
-# v2 API base URL - will be determined based on production vs local mode
-BASE_V2 = None  # Will be set dynamically based on production resource configuration
+# v1 API base URL (AGENTS_V1_BASE_URL / --v1-base-url override it, e.g. to point at mock_agents_server.py)
+BASE_V1 = os.getenv("AGENTS_V1_BASE_URL") or f"https://{HOST}/agents/v1.0/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/{RESOURCE_GROUP}/providers/Microsoft.MachineLearningServices/workspaces/{WORKSPACE}"
+# v2 API base URL - determined by production vs local mode unless AGENTS_V2_BASE_URL / --v2-base-url set it explicitly
+BASE_V2 = os.getenv("AGENTS_V2_BASE_URL") or None
+
+# Bulk migration tuning (overridden by --concurrency / --rate-limit)
+DEFAULT_CONCURRENCY = 1  # Number of assistants migrated in parallel (1 = serial, original behavior)
+DEFAULT_RATE_LIMIT = 0.0  # Max requests per second per host (0 = unlimited)
+
+class HostRateLimiter:
+    """
+    Thread-safe per-host rate limiter.
+    Spaces out requests to the same host so that at most `rate` requests per second are started,
+    regardless of how many worker threads are issuing them.
+    """
+    def __init__(self, rate: float = 0.0):
+        self.rate = rate
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def acquire(self, url: str):
+        """Block until a request to the host of `url` is allowed."""
+        if not self.rate or self.rate <= 0:
+            return
+        host = urlparse(url).netloc
+        interval = 1.0 / self.rate
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + interval
+        delay = slot - now
+        if delay > 0:
+            time.sleep(delay)
+
+RATE_LIMITER = HostRateLimiter(DEFAULT_RATE_LIMIT)
+
+# Adaptive concurrency for agent version POSTs (--adaptive-concurrency)
+ADAPTIVE_INITIAL_LIMIT = 4
+ADAPTIVE_LATENCY_TOLERANCE = 2.0  # A response slower than this multiple of the baseline latency doesn't raise the limit
+ADAPTIVE_BASELINE_DRIFT = 1.05  # Baseline creeps up by this factor per response, so one lucky fast response doesn't pin it
+ADAPTIVE_DECREASE_COOLDOWN = 1.0  # Seconds between two decreases, so a burst of 429s halves the limit only once
+
+# Per-thread count of throttled (429/503) responses, so a limiter can tell whether its own request was throttled
+_THROTTLED_RESPONSES = threading.local()
+
+def throttled_response_count() -> int:
+    """Number of throttled responses the current thread has received so far."""
+    return getattr(_THROTTLED_RESPONSES, "count", 0)
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD limit on in-flight requests to one v2 target, for endpoints that throttle at unknown rates.
+    
+    - Additive increase: the limit grows by about one per `limit` successful responses, while latency stays
+      within ADAPTIVE_LATENCY_TOLERANCE of the baseline
+    - Multiplicative decrease: the limit halves when a request was throttled (429/503), at most once per cooldown
+    - Failed or slow responses hold the limit where it is
+    """
+    def __init__(self, max_limit: int, initial_limit: int = ADAPTIVE_INITIAL_LIMIT, min_limit: int = 1, name: str = ""):
+        self.max_limit = max(max_limit, min_limit)
+        self.min_limit = min_limit
+        self.limit = float(min(max(initial_limit, min_limit), self.max_limit))
+        self.name = name
+        self.in_flight = 0
+        self._baseline: Optional[float] = None
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+    
+    @property
+    def current(self) -> int:
+        """The whole number of requests currently allowed in flight."""
+        return max(int(self.limit), self.min_limit)
+    
+    @contextlib.contextmanager
+    def slot(self):
+        """Hold one in-flight slot around a request, and adjust the limit from its outcome."""
+        with self._cond:
+            while self.in_flight >= self.current:
+                self._cond.wait()
+            self.in_flight += 1
+        throttled_before = throttled_response_count()
+        started = time.monotonic()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            self._update(time.monotonic() - started, throttled_response_count() > throttled_before, succeeded)
+            with self._cond:
+                self.in_flight -= 1
+                self._cond.notify_all()
+    
+    def _update(self, latency: float, throttled: bool, succeeded: bool):
+        with self._cond:
+            previous = self.current
+            if throttled:
+                now = time.monotonic()
+                if now - self._last_decrease < ADAPTIVE_DECREASE_COOLDOWN:
+                    return
+                self._last_decrease = now
+                self.limit = max(float(self.min_limit), self.limit / 2)
+                if self.current < previous:
+                    METRICS.increment("limit_decreases")
+                    logger.info(f"📉 Throttled by {self.name or 'the v2 API'}: lowering agent version POST concurrency to {self.current}")
+                return
+            if not succeeded:
+                return
+            self._baseline = latency if self._baseline is None else min(latency, self._baseline * ADAPTIVE_BASELINE_DRIFT)
+            if latency <= self._baseline * ADAPTIVE_LATENCY_TOLERANCE and self.limit < self.max_limit:
+                self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                if self.current > previous:
+                    METRICS.increment("limit_increases")
+                    logger.debug(f"📈 Raising agent version POST concurrency for {self.name or 'the v2 API'} to {self.current}")
+                    self._cond.notify_all()
+
+# Per-target limiters, created on first use; None while --adaptive-concurrency is off
+ADAPTIVE_MAX_LIMIT: Optional[int] = None
+ADAPTIVE_START_LIMIT = ADAPTIVE_INITIAL_LIMIT
+_ADAPTIVE_LIMITERS: Dict[str, AdaptiveConcurrencyLimiter] = {}
+_ADAPTIVE_LIMITERS_LOCK = threading.Lock()
+
+def get_adaptive_limiter(target: str) -> Optional[AdaptiveConcurrencyLimiter]:
+    """Return the adaptive limiter for a v2 target (see get_target_key), or None if adaptive concurrency is off."""
+    if ADAPTIVE_MAX_LIMIT is None:
+        return None
+    with _ADAPTIVE_LIMITERS_LOCK:
+        limiter = _ADAPTIVE_LIMITERS.get(target)
+        if limiter is None:
+            limiter = AdaptiveConcurrencyLimiter(ADAPTIVE_MAX_LIMIT, ADAPTIVE_START_LIMIT, name=target or "")
+            _ADAPTIVE_LIMITERS[target] = limiter
+        return limiter
+
+def adaptive_limits() -> Dict[str, int]:
+    """Current POST concurrency limit of every v2 target seen so far."""
+    with _ADAPTIVE_LIMITERS_LOCK:
+        return {target: limiter.current for target, limiter in _ADAPTIVE_LIMITERS.items()}
+
+# Run metrics (--metrics-report / --otel)
+DEFAULT_METRICS_REPORT = os.path.join("output", "migration_metrics.json")
+METRIC_STAGES = ["fetch", "convert", "lookup", "post"]
+
+def percentile(sorted_values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of an already sorted list (None when empty)."""
+    if not sorted_values:
+        return None
+    rank = max(math.ceil(pct / 100.0 * len(sorted_values)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+class MigrationMetrics:
+    """
+    Thread-safe collector for per-stage timings, per-host HTTP latency, retries, throttles and record outcomes.
+    Produces a JSON report at the end of a run and can mirror everything to OpenTelemetry metrics.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+        self._stages: Dict[str, List[float]] = {}
+        self._hosts: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+        self._otel = None
+    
+    def start(self):
+        """Restart the run clock (records/second is measured from here)."""
+        self.started = time.monotonic()
+    
+    def enable_opentelemetry(self) -> bool:
+        """
+        Also record metrics through the OpenTelemetry API (exported by whatever SDK/exporter is configured,
+        e.g. when run under `opentelemetry-instrument`). Returns False if opentelemetry-api isn't installed.
+        """
+        try:
+            from opentelemetry import metrics as otel_metrics
+        except ImportError:
+            return False
+        meter = otel_metrics.get_meter("v1_to_v2_migration")
+        self._otel = {
+            "stage": meter.create_histogram("migration.stage.duration", unit="s", description="Time spent per record in each migration stage"),
+            "http": meter.create_histogram("migration.http.duration", unit="s", description="HTTP request latency per host"),
+            "counter": meter.create_counter("migration.events", description="Records, retries and throttles"),
+        }
+        return True
+    
+    def observe(self, stage: str, seconds: float):
+        """Record the duration of one record's pass through `stage`."""
+        with self._lock:
+            self._stages.setdefault(stage, []).append(seconds)
+        if self._otel:
+            self._otel["stage"].record(seconds, {"stage": stage})
+    
+    def observe_request(self, host: str, seconds: float):
+        """Record one HTTP attempt's latency for `host`."""
+        with self._lock:
+            self._hosts.setdefault(host, []).append(seconds)
+        if self._otel:
+            self._otel["http"].record(seconds, {"host": host})
+    
+    def increment(self, name: str, amount: int = 1, **attributes):
+        """Increase a counter such as 'retries', 'throttles', 'succeeded' or 'failed'."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+        if self._otel:
+            self._otel["counter"].add(amount, dict(attributes, event=name))
+    
+    @contextlib.contextmanager
+    def timed(self, stage: str):
+        """Context manager recording the duration of the enclosed block under `stage`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start)
+    
+    def timed_iter(self, items: Iterable[Any], stage: str = "fetch") -> Iterable[Any]:
+        """Pass items through, recording how long each one took to arrive from the source under `stage`."""
+        iterator = iter(items)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            self.observe(stage, time.perf_counter() - start)
+            yield item
+    
+    @staticmethod
+    def _summarize(values: List[float]) -> Dict[str, Any]:
+        ordered = sorted(values)
+        return {
+            "count": len(ordered),
+            "total_s": round(sum(ordered), 4),
+            "p50_ms": round(percentile(ordered, 50) * 1000, 2) if ordered else None,
+            "p95_ms": round(percentile(ordered, 95) * 1000, 2) if ordered else None,
+            "p99_ms": round(percentile(ordered, 99) * 1000, 2) if ordered else None,
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else None,
+        }
+    
+    def report(self) -> Dict[str, Any]:
+        """Build the run report as a JSON-serializable dict."""
+        with self._lock:
+            stages = {stage: list(values) for stage, values in self._stages.items()}
+            hosts = {host: list(values) for host, values in self._hosts.items()}
+            counters = dict(self._counters)
+        elapsed = time.monotonic() - self.started
+        processed = counters.get("succeeded", 0) + counters.get("failed", 0)
+        ordered_stages = [stage for stage in METRIC_STAGES if stage in stages] + sorted(set(stages) - set(METRIC_STAGES))
+        return {
+            "elapsed_s": round(elapsed, 3),
+            "records": {
+                "processed": processed,
+                "succeeded": counters.get("succeeded", 0),
+                "failed": counters.get("failed", 0),
+                "skipped_unchanged": counters.get("skipped_unchanged", 0),
+                "per_second": round(processed / elapsed, 2) if elapsed > 0 else None,
+            },
+            "retries": counters.get("retries", 0),
+            "throttles": counters.get("throttles", 0),
+            "adaptive_concurrency": {
+                "limits": adaptive_limits(),
+                "increases": counters.get("limit_increases", 0),
+                "decreases": counters.get("limit_decreases", 0),
+            } if ADAPTIVE_MAX_LIMIT is not None else None,
+            "stages": {stage: self._summarize(stages[stage]) for stage in ordered_stages},
+            "http_by_host": {host: self._summarize(values) for host, values in sorted(hosts.items())},
+        }
+    
+    def write_report(self, path: str) -> Dict[str, Any]:
+        """Write the report as JSON to `path` and return it."""
+        report = self.report()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        return report
+
+METRICS = MigrationMetrics()
+
+# Shared HTTP connection pool and retry policy (pool size is matched to --concurrency in main())
+HTTP_POOL_SIZE = 10
+MAX_RETRIES = int(os.getenv("MIGRATION_MAX_RETRIES") or 5)
+RETRY_BACKOFF_BASE = 1.0  # Seconds; doubled on every attempt
+RETRY_BACKOFF_MAX = 60.0  # Upper bound for a single wait, including Retry-After
+RETRY_ALWAYS_STATUS_CODES = {429, 503}  # Throttled/unavailable: request was not processed, safe to retry any method
+RETRY_IDEMPOTENT_STATUS_CODES = {500, 502, 504}  # Only retried for methods that can be safely repeated
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+def _new_http_session(pool_size: int) -> requests.Session:
+    """Build a keep-alive session whose connection pool holds up to `pool_size` connections per host."""
+    session = requests.Session()
+    # Retries are handled by send_request so they can honor Retry-After and be reported
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def configure_http_session(pool_size: int = HTTP_POOL_SIZE) -> requests.Session:
+    """
+    (Re)create the shared HTTP session used by every API call in this script.
+    Connections are kept alive and reused across requests and worker threads.
+    
+    Args:
+        pool_size: Maximum number of pooled connections per host (should be >= the number of concurrent workers)
+    """
+    global _http_session
+    session = _new_http_session(pool_size)
+    with _http_session_lock:
+        previous, _http_session = _http_session, session
+    if previous is not None:
+        previous.close()
+    return session
+
+def get_http_session() -> requests.Session:
+    """Return the shared HTTP session, creating it on first use."""
+    global _http_session
+    if _http_session is None:
+        with _http_session_lock:
+            if _http_session is None:
+                _http_session = _new_http_session(HTTP_POOL_SIZE)
+    return _http_session
+
+def get_retry_delay(response: Optional[requests.Response], attempt: int) -> float:
+    """
+    Compute how long to wait before the next attempt.
+    Honors the Retry-After header (seconds or HTTP date) when present, otherwise uses exponential backoff with jitter.
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                return min(max(float(retry_after), 0.0), RETRY_BACKOFF_MAX)
+            except ValueError:
+                try:
+                    from email.utils import parsedate_to_datetime
+                    retry_at = parsedate_to_datetime(retry_after).timestamp()
+                    return min(max(retry_at - time.time(), 0.0), RETRY_BACKOFF_MAX)
+                except (TypeError, ValueError):
+                    pass
+    import random
+    delay = min(RETRY_BACKOFF_BASE * (2 ** attempt), RETRY_BACKOFF_MAX)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+def send_request(method: str, url: str, **kwargs) -> requests.Response:
+    """
+    Send a request over the shared session, retrying throttled (429/503) and transient failures.
+    
+    - 429/503 are retried for every method, waiting for Retry-After when the server provides it
+    - 500/502/504 and connection errors/timeouts are retried only for idempotent methods
+    - The final response is returned as-is; callers decide how to handle the status code
+    """
+    session = get_http_session()
+    idempotent = method.upper() in IDEMPOTENT_METHODS
+    attempt = 0
+    while True:
+        RATE_LIMITER.acquire(url)
+        started = time.perf_counter()
+        try:
+            resp = session.request(method, url, **kwargs)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            METRICS.observe_request(urlparse(url).netloc, time.perf_counter() - started)
+            if not idempotent or attempt >= MAX_RETRIES:
+                raise
+            delay = get_retry_delay(None, attempt)
+            logger.info(f"🔁 {method} {url} failed ({type(e).__name__}), retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+        else:
+            METRICS.observe_request(urlparse(url).netloc, time.perf_counter() - started)
+            if resp.status_code in RETRY_ALWAYS_STATUS_CODES:
+                METRICS.increment("throttles", host=urlparse(url).netloc)
+                _THROTTLED_RESPONSES.count = throttled_response_count() + 1
+            retryable = resp.status_code in RETRY_ALWAYS_STATUS_CODES or (idempotent and resp.status_code in RETRY_IDEMPOTENT_STATUS_CODES)
+            if not retryable or attempt >= MAX_RETRIES:
+                return resp
+            delay = get_retry_delay(resp, attempt)
+            logger.info(f"🔁 {method} {url} returned {resp.status_code}, retrying in {delay:.1f}s (attempt {attempt + 1}/{MAX_RETRIES})")
+            resp.close()
+        METRICS.increment("retries", host=urlparse(url).netloc)
+        time.sleep(delay)
+        attempt += 1
 
 def create_cosmos_client_from_connection_string(connection_string: str):
     """
     Create a Cosmos DB client using a connection string.
     """
+    from azure.cosmos import CosmosClient
     try:
         return CosmosClient.from_connection_string(connection_string)
     except Exception as e:
-        print(f"Failed to create Cosmos client from connection string: {e}")
+        logger.info(f"Failed to create Cosmos client from connection string: {e}")
         raise
 
+# Streaming Cosmos DB reader configuration
+COSMOS_PAGE_SIZE = 100  # Items requested per query page
+DEFAULT_COSMOS_PARALLELISM = 4  # Feed ranges queried concurrently (1 = single cross-partition query)
+# Only the v1 assistant fields the converter reads are kept from each document's `data`
+COSMOS_ASSISTANT_FIELDS = [
+    "id", "name", "description", "model", "instructions", "tools", "tool_resources", "metadata",
+    "temperature", "top_p", "response_format", "created_at", "internal_metadata",
+]
+
+def build_cosmos_assistant_query(assistant_id: Optional[str] = None, assistant_ids: Optional[List[str]] = None) -> tuple:
+    """
+    Build the v1 assistant query, projecting each document's `data` (an object, or a JSON string in some containers).
+    ID filters can't look inside string `data`, so those documents always match and are filtered after decoding
+    (see cosmos_data_to_assistant).
+    
+    Returns:
+        (query, parameters) - assistant IDs are passed as query parameters, never formatted into the SQL
+    """
+    query = "SELECT c.data FROM c WHERE c.object_type = 'v1_assistant'"
+    parameters = []
+    if assistant_id:
+        query += " AND (c.data.id = @assistant_id OR IS_STRING(c.data))"
+        parameters.append({"name": "@assistant_id", "value": assistant_id})
+    elif assistant_ids:
+        query += " AND (ARRAY_CONTAINS(@assistant_ids, c.data.id) OR IS_STRING(c.data))"
+        parameters.append({"name": "@assistant_ids", "value": list(assistant_ids)})
+    return query, parameters
+
+def cosmos_data_to_assistant(data: Any, assistant_ids: Optional[set] = None) -> Optional[Dict[str, Any]]:
+    """
+    Turn a document's `data` into an assistant dict holding COSMOS_ASSISTANT_FIELDS, decoding JSON string data.
+    
+    Returns:
+        The assistant, or None if `data` isn't an assistant object with an `id` or its id isn't in `assistant_ids`
+    """
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except json.JSONDecodeError as e:
+            logger.warning(f"⚠️  Skipping v1 assistant document whose data is not valid JSON: {e}")
+            return None
+    if not isinstance(data, dict) or not data.get("id"):
+        logger.warning("⚠️  Skipping v1 assistant document without an assistant id")
+        return None
+    if assistant_ids is not None and data["id"] not in assistant_ids:
+        return None
+    return {field: data[field] for field in COSMOS_ASSISTANT_FIELDS if data.get(field) is not None}
+
+def read_assistant_from_cosmos(connection_string: str, item_id: str, partition_key: Any, assistant_id: Optional[str] = None, database_name: str = DATABASE_NAME, container_name: str = SOURCE_CONTAINER) -> Optional[Dict[str, Any]]:
+    """
+    Point-read one v1 assistant document by its Cosmos item ID and partition key (a single cheap read instead of a query).
+    
+    Returns:
+        The assistant dict (COSMOS_ASSISTANT_FIELDS of the document's `data`), or None if the item doesn't exist
+        or isn't the expected v1 assistant
+    """
+    from azure.cosmos import exceptions
+    client = create_cosmos_client_from_connection_string(connection_string)
+    container = client.get_database_client(database_name).get_container_client(container_name)
+    try:
+        document = container.read_item(item=item_id, partition_key=partition_key)
+    except exceptions.CosmosResourceNotFoundError:
+        return None
+    
+    if document.get("object_type") != "v1_assistant":
+        return None
+    return cosmos_data_to_assistant(document.get("data"), {assistant_id} if assistant_id else None)
+
+def iter_cosmos_query_pages(container, query: str, page_size: int = COSMOS_PAGE_SIZE, feed_range: Optional[Dict[str, Any]] = None, continuation_token: Optional[str] = None, parameters: Optional[List[Dict[str, Any]]] = None) -> Iterable[List[Dict[str, Any]]]:
+    """
+    Run a Cosmos DB query one page at a time, following continuation tokens.
+    
+    Args:
+        feed_range: Restrict the query to one feed range (physical partition range); cross-partition otherwise
+        continuation_token: Resume a previous query from this token
+        parameters: Query parameters, e.g. [{"name": "@assistant_id", "value": "asst_..."}]
+    """
+    query_kwargs = {"query": query, "max_item_count": page_size}
+    if parameters:
+        query_kwargs["parameters"] = parameters
+    if feed_range is not None:
+        query_kwargs["feed_range"] = feed_range
+    else:
+        query_kwargs["enable_cross_partition_query"] = True
+    
+    pager = container.query_items(**query_kwargs).by_page(continuation_token)
+    for page in pager:
+        items = list(page)
+        logger.debug(f"   📄 Cosmos page: {len(items)} item(s), continuation: {'yes' if pager.continuation_token else 'none'}")
+        yield items
+
+def iter_assistants_from_cosmos(connection_string: str, assistant_id: Optional[str] = None, assistant_ids: Optional[List[str]] = None, parallelism: int = DEFAULT_COSMOS_PARALLELISM, page_size: int = COSMOS_PAGE_SIZE, database_name: str = DATABASE_NAME, container_name: str = SOURCE_CONTAINER) -> Iterable[Dict[str, Any]]:
+    """
+    Stream v1 assistants out of the Cosmos DB source container as query pages arrive.
+    With parallelism > 1 (and an azure-cosmos version that exposes feed ranges) each feed range is queried
+    by its own thread; records are handed over through a bounded queue so memory stays flat.
+    """
+    client = create_cosmos_client_from_connection_string(connection_string)
+    container = client.get_database_client(database_name).get_container_client(container_name)
+    query, parameters = build_cosmos_assistant_query(assistant_id, assistant_ids)
+    wanted_ids = {assistant_id} if assistant_id else (set(assistant_ids) if assistant_ids else None)
+    
+    def to_assistants(page: List[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+        for item in page:
+            assistant = cosmos_data_to_assistant(item.get("data"), wanted_ids)
+            if assistant is not None:
+                yield assistant
+    
+    feed_ranges = []
+    if parallelism > 1 and not assistant_id and hasattr(container, "read_feed_ranges"):
+        feed_ranges = list(container.read_feed_ranges())
+    
+    if len(feed_ranges) <= 1:
+        for page in iter_cosmos_query_pages(container, query, page_size, parameters=parameters):
+            yield from to_assistants(page)
+        return
+    
+    logger.info(f"⚡ Reading {len(feed_ranges)} Cosmos feed ranges with {min(parallelism, len(feed_ranges))} parallel queries")
+    pages = queue.Queue(maxsize=parallelism * 2)
+    done = object()
+    stop = threading.Event()
+    
+    def hand_over(item) -> bool:
+        # Never block forever on a full queue: the consumer may have stopped reading
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def read_feed_range(feed_range):
+        try:
+            for page in iter_cosmos_query_pages(container, query, page_size, feed_range=feed_range, parameters=parameters):
+                if not hand_over(page):
+                    return
+        except Exception as e:
+            hand_over(e)
+        finally:
+            hand_over(done)
+    
+    with ThreadPoolExecutor(max_workers=min(parallelism, len(feed_ranges)), thread_name_prefix="cosmos-reader") as executor:
+        for feed_range in feed_ranges:
+            executor.submit(read_feed_range, feed_range)
+        try:
+            remaining = len(feed_ranges)
+            while remaining:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                    continue
+                if isinstance(page, Exception):
+                    raise page
+                yield from to_assistants(page)
+        finally:
+            # Unblock readers if the consumer stopped early or a feed range failed
+            stop.set()
+            while True:
+                try:
+                    pages.get_nowait()
+                except queue.Empty:
+                    break
+
 def ensure_database_and_container(client, database_name: str, container_name: str):
     """
     Ensure the database and container exist, create them if they don't.
     """
+    from azure.cosmos import exceptions
     try:
         database = client.get_database_client(database_name)
-        print(f"Database '{database_name}' found")
+        logger.debug(f"Database '{database_name}' found")
     except exceptions.CosmosResourceNotFoundError:
-        print(f"Creating database '{database_name}'")
+        logger.debug(f"Creating database '{database_name}'")
         database = client.create_database_if_not_exists(id=database_name)
     
     try:
         container = database.get_container_client(container_name)
-        print(f"Container '{container_name}' found")
+        logger.debug(f"Container '{container_name}' found")
     except exceptions.CosmosResourceNotFoundError:
-        print(f"Creating container '{container_name}'")
+        logger.debug(f"Creating container '{container_name}'")
         container = database.create_container_if_not_exists(
             id=container_name,
             partition_key={'paths': ['/id'], 'kind': 'Hash'}
@@ -101,18 +659,36 @@ def get_production_v2_base_url(resource_name: str, subscription_id: str, project
 # Production authentication is now handled by the PowerShell wrapper
 # which generates both AZ_TOKEN and PRODUCTION_TOKEN environment variables
 
-def get_token_from_az(tenant_id: Optional[str] = None) -> Optional[str]:
+# Token cache configuration
+AI_TOKEN_SCOPE = "https://ai.azure.com/.default"
+TOKEN_REFRESH_MARGIN = 300  # Refresh tokens this many seconds before they expire
+TOKEN_DEFAULT_LIFETIME = 3600  # Assumed lifetime when a token's expiry can't be decoded
+TOKEN_FETCH_RETRY_INTERVAL = 30  # Minimum seconds between failed az CLI attempts for the same tenant/scope
+
+def decode_token_expiry(token: str) -> Optional[int]:
+    """
+    Decode the `exp` claim (epoch seconds) from a JWT access token without validating it.
+    Returns None if the token is not a decodable JWT.
+    """
+    try:
+        import base64
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return int(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+def run_az_get_access_token(scope: str = AI_TOKEN_SCOPE, tenant_id: Optional[str] = None) -> Optional[str]:
     """
-    Runs the az CLI to get an access token for the AI resource scope.
+    Runs the az CLI to get an access token for the given scope.
     Returns the token string on success, or None on failure.
-    
-    Args:
-        tenant_id: Optional tenant ID to authenticate with
+    Prefer TOKEN_CACHE.get() over calling this directly so the subprocess is only spawned when needed.
     """
     try:
         cmd = [
             "az", "account", "get-access-token",
-            "--scope", "https://ai.azure.com/.default",
+            "--scope", scope,
             "--query", "accessToken",
             "-o", "tsv"
         ]
@@ -120,18 +696,18 @@ def get_token_from_az(tenant_id: Optional[str] = None) -> Optional[str]:
         # Add tenant parameter if provided
         if tenant_id:
             cmd.extend(["--tenant", tenant_id])
-            print(f"🔐 Requesting token for tenant: {tenant_id}")
+            logger.info(f"🔐 Requesting token for tenant: {tenant_id}")
         
-        # capture output (shell=True needed for Windows)
-        proc = subprocess.run(cmd, capture_output=True, text=True, shell=True)
+        # capture output (shell is only needed on Windows to resolve az.cmd)
+        proc = subprocess.run(cmd, capture_output=True, text=True, shell=(os.name == "nt"))
         if proc.returncode != 0:
-            print("az CLI returned non-zero exit code when fetching token:", proc.stderr.strip())
+            logger.warning("az CLI returned non-zero exit code when fetching token: %s", proc.stderr.strip())
             return None
         
         # Clean the token output - get only the last non-empty line that looks like a token
         lines = [line.strip() for line in proc.stdout.strip().split('\n') if line.strip()]
         if not lines:
-            print("az CLI returned empty token.")
+            logger.info("az CLI returned empty token.")
             return None
         
         # JWT tokens start with 'ey' or are long strings (>100 chars)
@@ -147,63 +723,151 @@ def get_token_from_az(tenant_id: Optional[str] = None) -> Optional[str]:
             
         return token
     except FileNotFoundError:
-        print("az CLI not found on PATH. Please install Azure CLI or set AZ_TOKEN env var.")
+        logger.info("az CLI not found on PATH. Please install Azure CLI or set AZ_TOKEN env var.")
         return None
     except Exception as ex:
-        print("Unexpected error while running az CLI:", ex)
+        logger.warning("Unexpected error while running az CLI: %s", ex)
+        return None
+
+class TokenCache:
+    """
+    Thread-safe access token cache keyed by (tenant, scope), shared by all workers.
+    
+    - Expiry is taken from the JWT `exp` claim instead of being assumed
+    - Tokens are refreshed in the background shortly before they expire, so callers rarely wait on az CLI
+    - Concurrent callers needing the same token trigger a single az CLI call
+    - Tokens provided up front (AZ_TOKEN / PRODUCTION_TOKEN) can be seeded and are refreshed the same way
+    """
+    def __init__(self, fetcher: Callable[[str, Optional[str]], Optional[str]] = run_az_get_access_token, refresh_margin: int = TOKEN_REFRESH_MARGIN):
+        self.fetcher = fetcher
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, tuple] = {}  # key -> (token, expires_on)
+        self._key_locks: Dict[tuple, threading.Lock] = {}
+        self._timers: Dict[tuple, threading.Timer] = {}
+        self._last_failure: Dict[tuple, float] = {}
+
+    def _key(self, tenant_id: Optional[str], scope: str) -> tuple:
+        return (tenant_id or "", scope)
+
+    def _key_lock(self, key: tuple) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def _store(self, key: tuple, token: str) -> int:
+        expires_on = decode_token_expiry(token) or int(time.time()) + TOKEN_DEFAULT_LIFETIME
+        with self._lock:
+            self._entries[key] = (token, expires_on)
+            self._last_failure.pop(key, None)
+            # Schedule a background refresh shortly before expiry
+            previous = self._timers.pop(key, None)
+            if previous is not None:
+                previous.cancel()
+            delay = max(expires_on - self.refresh_margin - time.time(), 1)
+            timer = threading.Timer(delay, self._background_refresh, args=(key,))
+            timer.daemon = True
+            self._timers[key] = timer
+            timer.start()
+        return expires_on
+
+    def _fetch(self, key: tuple) -> Optional[str]:
+        """Fetch a new token for `key`, remembering failures so a broken az CLI isn't spawned on every call."""
+        with self._lock:
+            last_failure = self._last_failure.get(key)
+        if last_failure and time.time() - last_failure < TOKEN_FETCH_RETRY_INTERVAL:
+            return None
+        tenant_id, scope = key
+        token = self.fetcher(scope, tenant_id or None)
+        if token:
+            self._store(key, token)
+        else:
+            with self._lock:
+                self._last_failure[key] = time.time()
+        return token
+
+    def _background_refresh(self, key: tuple):
+        with self._key_lock(key):
+            if self._fetch(key):
+                logger.info(f"🔄 Token refreshed in background for tenant: {key[0] or 'default'}")
+
+    def put(self, token: str, tenant_id: Optional[str] = None, scope: str = AI_TOKEN_SCOPE) -> int:
+        """Seed the cache with an externally provided token. Returns its expiry (epoch seconds)."""
+        return self._store(self._key(tenant_id, scope), token)
+
+    def get_entry(self, tenant_id: Optional[str] = None, scope: str = AI_TOKEN_SCOPE, force_refresh: bool = False, stale_token: Optional[str] = None) -> Optional[tuple]:
+        """
+        Return (token, expires_on) for the tenant/scope, fetching a new token only when needed.
+        
+        Args:
+            force_refresh: Fetch a new token even if the cached one looks valid (e.g., after a 401)
+            stale_token: The token that was rejected; if another worker already replaced it, the replacement is returned without a new fetch
+        """
+        key = self._key(tenant_id, scope)
+        
+        def usable(entry):
+            if entry is None:
+                return False
+            if force_refresh:
+                return stale_token is not None and entry[0] != stale_token
+            return entry[1] - self.refresh_margin > time.time()
+        
+        with self._lock:
+            entry = self._entries.get(key)
+        if usable(entry):
+            return entry
+        
+        with self._key_lock(key):
+            # Another worker may have refreshed while we waited for the lock
+            with self._lock:
+                entry = self._entries.get(key)
+            if usable(entry):
+                return entry
+            self._fetch(key)
+            with self._lock:
+                entry = self._entries.get(key)
+        
+        # Fall back to a cached token that is close to (but not past) expiry if the refresh failed
+        if entry is not None and entry[1] > time.time() and (not force_refresh or entry[0] != stale_token):
+            return entry
         return None
 
+    def get(self, tenant_id: Optional[str] = None, scope: str = AI_TOKEN_SCOPE, force_refresh: bool = False, stale_token: Optional[str] = None) -> Optional[str]:
+        """Return a valid token string for the tenant/scope, or None if one can't be obtained."""
+        entry = self.get_entry(tenant_id, scope, force_refresh, stale_token)
+        return entry[0] if entry else None
+
+TOKEN_CACHE = TokenCache()
+
+# Tenant whose cached token backs the global TOKEN (None while TOKEN is unmanaged)
+API_TOKEN_TENANT: Optional[str] = None
+
+def get_token_from_az(tenant_id: Optional[str] = None) -> Optional[str]:
+    """
+    Get an access token for the AI resource scope, running the az CLI only when the shared cache
+    has no valid token for the tenant.
+    Returns the token string on success, or None on failure.
+    
+    Args:
+        tenant_id: Optional tenant ID to authenticate with
+    """
+    return TOKEN_CACHE.get(tenant_id)
+
 class ManualAzureCliCredential:
     """
     A custom credential class that uses our manual az CLI token extraction.
     This works around issues with the azure-identity AzureCliCredential in containers.
+    Tokens come from the shared TOKEN_CACHE, so az CLI is only invoked when a token is missing or about to expire.
     """
     def get_token(self, *scopes, **kwargs):
         """Get an access token using az CLI."""
-        try:
-            # Try different scopes based on what's requested
-            if scopes:
-                scope = scopes[0]
-            else:
-                # Default to Azure AI scope for Azure AI Projects (confirmed correct audience)
-                scope = "https://ai.azure.com/.default"
-            
-            cmd = [
-                "az", "account", "get-access-token",
-                "--scope", scope,
-                "--query", "accessToken",
-                "-o", "tsv"
-            ]
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, shell=True)
-            if proc.returncode != 0:
-                # Try without suppressing stderr to get the actual error
-                proc_debug = subprocess.run(cmd, capture_output=True, text=True, shell=True)
-                raise Exception(f"az CLI returned error: {proc_debug.stderr.strip()}")
-            
-            # Clean the token output - get only the last non-empty line (the actual token)
-            lines = [line.strip() for line in proc.stdout.strip().split('\n') if line.strip()]
-            if not lines:
-                raise Exception("az CLI returned empty token")
-            
-            # The token should be the last line that looks like a token (starts with ey)
-            token = None
-            for line in reversed(lines):
-                if line.startswith('ey') or len(line) > 50:  # JWT tokens start with 'ey' or are long strings
-                    token = line
-                    break
-            
-            if not token:
-                # Fallback to the last line if no obvious token found
-                token = lines[-1]
-            
-            # Return a proper AccessToken object
-            import time
-            # Token expires in 1 hour (3600 seconds)
-            expires_on = int(time.time()) + 3600
-            return AccessToken(token, expires_on)
-            
-        except Exception as e:
-            raise Exception(f"Failed to get token via az CLI: {e}")
+        from azure.core.credentials import AccessToken
+        # Default to Azure AI scope for Azure AI Projects (confirmed correct audience)
+        scope = scopes[0] if scopes else AI_TOKEN_SCOPE
+        entry = TOKEN_CACHE.get_entry(kwargs.get("tenant_id"), scope)
+        if not entry:
+            raise Exception(f"Failed to get token via az CLI for scope {scope}")
+        # Return a proper AccessToken object with the real expiry
+        return AccessToken(entry[0], entry[1])
 
 class StaticTokenCredential:
     """
@@ -212,26 +876,45 @@ class StaticTokenCredential:
     """
     def __init__(self, token: str):
         self.token = token
+        # Use the expiry encoded in the token, assuming 1 hour if it can't be decoded
+        self.expires_on = decode_token_expiry(token) or int(time.time()) + TOKEN_DEFAULT_LIFETIME
         
     def get_token(self, *scopes, **kwargs):
         """Return the static token."""
-        import time
-        # Assume token expires in 1 hour (3600 seconds)
-        expires_on = int(time.time()) + 3600
-        return AccessToken(self.token, expires_on)
+        from azure.core.credentials import AccessToken
+        return AccessToken(self.token, self.expires_on)
+
+# One credential and one AIProjectClient per endpoint/connection string for the whole run,
+# so per-assistant calls don't pay credential chain probing and client construction again
+_AZURE_CREDENTIAL = None
+_PROJECT_CLIENTS: Dict[tuple, Any] = {}
+_PROJECT_CLIENTS_LOCK = threading.Lock()
+_AZURE_CREDENTIAL_LOCK = threading.Lock()
 
 def get_azure_credential():
     """
-    Get the appropriate Azure credential for the current environment.
+    Get the Azure credential for the current environment, created once and reused for the process lifetime.
+    """
+    global _AZURE_CREDENTIAL
+    if _AZURE_CREDENTIAL is None:
+        with _AZURE_CREDENTIAL_LOCK:
+            if _AZURE_CREDENTIAL is None:
+                _AZURE_CREDENTIAL = create_azure_credential()
+    return _AZURE_CREDENTIAL
+
+def create_azure_credential():
+    """
+    Create the appropriate Azure credential for the current environment.
     Prefers static token credential when AZ_TOKEN is available.
     """
     if not PROJECT_CLIENT_AVAILABLE:
         raise ImportError("azure-identity package is required for credential functionality")
+    from azure.identity import DefaultAzureCredential
     
     # Check if we have a static token from environment variable (highest priority)
     static_token = os.environ.get('AZ_TOKEN')
     if static_token:
-        print("🔑 Using static token from AZ_TOKEN environment variable")
+        logger.info("🔑 Using static token from AZ_TOKEN environment variable")
         return StaticTokenCredential(static_token)
     
     # Check if we're likely in a container environment
@@ -240,20 +923,20 @@ def get_azure_credential():
     if is_container:
         # In container, use DefaultAzureCredential which has better fallback handling for version mismatches
         try:
-            print("🐳 Container environment detected, using DefaultAzureCredential for better compatibility")
+            logger.info("🐳 Container environment detected, using DefaultAzureCredential for better compatibility")
             return DefaultAzureCredential()
         except Exception as e:
-            print(f"⚠️  DefaultAzureCredential failed: {e}")
-            print("💡 Falling back to manual Azure CLI credential")
+            logger.warning(f"⚠️  DefaultAzureCredential failed: {e}")
+            logger.info("💡 Falling back to manual Azure CLI credential")
             try:
                 return ManualAzureCliCredential()
             except Exception as e2:
-                print(f"⚠️  Manual Azure CLI credential also failed: {e2}")
-                print("💡 This might be due to Azure CLI version mismatch between host and container")
-                raise Exception(f"All credential methods failed. Host CLI: 2.77.0, Container CLI: 2.78.0. Try: az upgrade")
+                logger.warning(f"⚠️  Manual Azure CLI credential also failed: {e2}")
+                logger.info("💡 This might be due to Azure CLI version mismatch between host and container")
+                raise Exception("All credential methods failed. Host CLI: 2.77.0, Container CLI: 2.78.0. Try: az upgrade")
     else:
         # On host system, use default credential chain
-        print("🖥️  Host environment detected, using default credential chain")
+        logger.info("🖥️  Host environment detected, using default credential chain")
         return DefaultAzureCredential()
 
 def set_api_token(force_refresh: bool = False, tenant_id: Optional[str] = None) -> bool:
@@ -265,32 +948,62 @@ def set_api_token(force_refresh: bool = False, tenant_id: Optional[str] = None)
         force_refresh: If True, ignore existing tokens and get a fresh one from az CLI
         tenant_id: Optional tenant ID to authenticate with (uses SOURCE_TENANT if not provided)
     """
-    global TOKEN
+    global TOKEN, API_TOKEN_TENANT
+    
+    # Use provided tenant or default to SOURCE_TENANT
+    if tenant_id is None:
+        tenant_id = API_TOKEN_TENANT if force_refresh and API_TOKEN_TENANT else SOURCE_TENANT
     
     # If force refresh is requested, skip environment variable and get fresh token
     if not force_refresh:
-        # Check environment variable first
+        # Check environment variable first; seeding the cache lets it be refreshed before it expires
         env_token = os.getenv("AZ_TOKEN")
         if env_token:
+            TOKEN_CACHE.put(env_token, tenant_id)
             TOKEN = env_token
+            API_TOKEN_TENANT = tenant_id
             return True
     
-    # Use provided tenant or default to SOURCE_TENANT
-    if tenant_id is None:
-        tenant_id = SOURCE_TENANT
-    
-    # Try az CLI (either forced or as fallback) with tenant
-    token = get_token_from_az(tenant_id)
+    # Try the token cache (az CLI only runs when needed) with tenant.
+    # On a forced refresh, workers that hit 401 concurrently share a single new token.
+    token = TOKEN_CACHE.get(tenant_id, force_refresh=force_refresh, stale_token=TOKEN if force_refresh else None)
     if token:
+        if token != TOKEN:
+            logger.info(f"🔄 Token refreshed from az CLI for tenant: {tenant_id}")
         TOKEN = token
-        print(f"🔄 Token refreshed from az CLI for tenant: {tenant_id}")
+        API_TOKEN_TENANT = tenant_id
         return True
     return False
 
+def get_api_token() -> Optional[str]:
+    """Return the current API token, picking up any refresh done in the background by the token cache."""
+    global TOKEN
+    if API_TOKEN_TENANT is not None:
+        cached = TOKEN_CACHE.get(API_TOKEN_TENANT)
+        if cached:
+            TOKEN = cached
+    return TOKEN
+
+def get_production_token(tenant_id: Optional[str] = None) -> Optional[str]:
+    """
+    Return the production token, refreshed through the token cache when it is close to expiry.
+    
+    Args:
+        tenant_id: Production tenant of the target (manifest mode). Tenants other than PRODUCTION_TENANT
+                   get their tokens from az CLI through the shared cache, once per tenant.
+    """
+    if tenant_id and tenant_id != PRODUCTION_TENANT:
+        return TOKEN_CACHE.get(tenant_id)
+    if not PRODUCTION_TOKEN:
+        return None
+    return TOKEN_CACHE.get(PRODUCTION_TENANT) or PRODUCTION_TOKEN
+
 def do_api_request_with_token(method: str, url: str, token: str, **kwargs) -> requests.Response:
     """
-    Wrapper around requests.request with specific token authentication.
+    Wrapper around the shared HTTP session with specific token authentication and retry logic.
+    Responses with a status in `expected_statuses` (e.g. (404,)) are returned instead of raised.
     """
+    expected_statuses = kwargs.pop("expected_statuses", ())
     headers = kwargs.pop("headers", {})
     headers["Authorization"] = f"Bearer {token}"
     headers["Accept"] = "application/json"
@@ -304,40 +1017,44 @@ def do_api_request_with_token(method: str, url: str, token: str, **kwargs) -> re
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         host_type = "localhost" if "localhost" in url else "host.docker.internal (Docker)"
-        print(f"🏠 Making request to {host_type} with extended timeout and no SSL verification: {url}")
+        logger.debug(f"🏠 Making request to {host_type} with extended timeout and no SSL verification: {url}")
     elif "timeout" not in kwargs:
         kwargs["timeout"] = 30
 
     try:
-        resp = requests.request(method, url, **kwargs)
-        resp.raise_for_status()
+        resp = send_request(method, url, **kwargs)
+        if resp.status_code not in expected_statuses:
+            resp.raise_for_status()
         return resp
     
     except requests.exceptions.Timeout as e:
-        print(f"⏰ Request timed out: {e}")
-        print("💡 This usually means:")
-        print("   - The server is not running")
-        print("   - The server is overloaded")
-        print("   - The endpoint doesn't exist")
+        logger.debug(f"⏰ Request timed out: {e}")
+        logger.debug("💡 This usually means:")
+        logger.debug("   - The server is not running")
+        logger.debug("   - The server is overloaded")
+        logger.debug("   - The endpoint doesn't exist")
         if "localhost" in url or "host.docker.internal" in url:
-            print("   - Check if the v2 API server is running")
+            logger.debug("   - Check if the v2 API server is running")
         raise
     except requests.exceptions.ConnectionError as e:
-        print(f"🔌 Connection failed: {e}")
+        logger.debug(f"🔌 Connection failed: {e}")
         if "localhost" in url or "host.docker.internal" in url:
-            print("💡 Make sure the v2 API server is running")
+            logger.debug("💡 Make sure the v2 API server is running")
         raise
     except requests.exceptions.RequestException as e:
-        print(f"❌ API request failed: {e}")
+        logger.error(f"❌ API request failed: {e}")
         raise
 
 def do_api_request(method: str, url: str, **kwargs) -> requests.Response:
     """
-    Wrapper around requests.request with authentication and retry logic.
+    Wrapper around the shared HTTP session with authentication and retry logic.
+    Responses with a status in `expected_statuses` (e.g. (404,)) are returned instead of raised.
     """
+    expected_statuses = kwargs.pop("expected_statuses", ())
     headers = kwargs.pop("headers", {})
-    if TOKEN:
-        headers["Authorization"] = f"Bearer {TOKEN}"
+    token = get_api_token()
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
     headers["Accept"] = "application/json"
     kwargs["headers"] = headers
 
@@ -349,64 +1066,64 @@ def do_api_request(method: str, url: str, **kwargs) -> requests.Response:
         import urllib3
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
         host_type = "localhost" if "localhost" in url else "host.docker.internal (Docker)"
-        print(f"🏠 Making request to {host_type} with extended timeout and no SSL verification: {url}")
+        logger.debug(f"🏠 Making request to {host_type} with extended timeout and no SSL verification: {url}")
     elif "timeout" not in kwargs:
         kwargs["timeout"] = 30
 
     try:
-        resp = requests.request(method, url, **kwargs)
+        resp = send_request(method, url, **kwargs)
         if resp.status_code == 401:
-            print("Received 401 Unauthorized. Trying to refresh token...")
-            time.sleep(5)
-            if set_api_token(force_refresh=True):  # Force refresh from az CLI on 401
+            logger.debug("Received 401 Unauthorized. Trying to refresh token...")
+            if set_api_token(force_refresh=True):  # Force refresh from az CLI on 401 (shared with other workers)
                 headers["Authorization"] = f"Bearer {TOKEN}"
                 kwargs["headers"] = headers
-                resp = requests.request(method, url, **kwargs)
+                resp = send_request(method, url, **kwargs)
             else:
-                print("Token refresh failed.")
+                logger.debug("Token refresh failed.")
         
-        resp.raise_for_status()
+        if resp.status_code not in expected_statuses:
+            resp.raise_for_status()
         return resp
     
     except requests.exceptions.Timeout as e:
-        print(f"⏰ Request timed out: {e}")
-        print("💡 This usually means:")
-        print("   - The server is not running")
-        print("   - The server is overloaded")
-        print("   - The endpoint doesn't exist")
+        logger.debug(f"⏰ Request timed out: {e}")
+        logger.debug("💡 This usually means:")
+        logger.debug("   - The server is not running")
+        logger.debug("   - The server is overloaded")
+        logger.debug("   - The endpoint doesn't exist")
         if "localhost" in url or "host.docker.internal" in url:
-            print("   - Check if the v2 API server is running")
+            logger.debug("   - Check if the v2 API server is running")
         raise
     except requests.exceptions.ConnectionError as e:
-        print(f"🔌 Connection failed: {e}")
+        logger.debug(f"🔌 Connection failed: {e}")
         if "localhost" in url or "host.docker.internal" in url:
-            print("💡 Make sure the v2 API server is running")
+            logger.debug("💡 Make sure the v2 API server is running")
         raise
     except requests.exceptions.RequestException as e:
-        print(f"❌ API request failed: {e}")
+        logger.error(f"❌ API request failed: {e}")
         raise
 
 def test_v2_api_connectivity() -> bool:
-    """Test if the local v2 API server is reachable."""
+    """Test if the local v2 API server (or the --v2-base-url override) is reachable."""
     # Build local development URL for testing
-    local_base = f"https://{LOCAL_HOST}/agents/v2.0/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/{RESOURCE_GROUP_V2}/providers/Microsoft.MachineLearningServices/workspaces/{WORKSPACE_V2}"
+    local_base = BASE_V2 or f"https://{LOCAL_HOST}/agents/v2.0/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/{RESOURCE_GROUP_V2}/providers/Microsoft.MachineLearningServices/workspaces/{WORKSPACE_V2}"
     
     try:
         # Try a simple GET request to the base URL
-        print(f"🔍 Testing connectivity to {local_base}...")
-        response = requests.get(local_base, verify=False, timeout=10)
-        print(f"✅ Server responded with status code: {response.status_code}")
+        logger.info(f"🔍 Testing connectivity to {local_base}...")
+        response = get_http_session().get(local_base, verify=False, timeout=10)
+        logger.info(f"✅ Server responded with status code: {response.status_code}")
         return True
     except requests.exceptions.Timeout:
-        print(f"⏰ Timeout connecting to {local_base}")
-        print("💡 The server might not be running or is too slow to respond")
+        logger.info(f"⏰ Timeout connecting to {local_base}")
+        logger.info("💡 The server might not be running or is too slow to respond")
         return False
     except requests.exceptions.ConnectionError:
-        print(f"🔌 Cannot connect to {local_base}")
-        print("💡 Make sure the v2 API server is running")
+        logger.info(f"🔌 Cannot connect to {local_base}")
+        logger.info("💡 Make sure the v2 API server is running")
         return False
     except Exception as e:
-        print(f"❌ Unexpected error testing connectivity: {e}")
+        logger.error(f"❌ Unexpected error testing connectivity: {e}")
         return False
 
 def get_assistant_from_api(assistant_id: str) -> Dict[str, Any]:
@@ -416,164 +1133,316 @@ def get_assistant_from_api(assistant_id: str) -> Dict[str, Any]:
     r = do_api_request("GET", url, params=params)
     return r.json()
 
-def list_assistants_from_api() -> List[Dict[str, Any]]:
-    """List all v1 assistants from API."""
-    url = f"{BASE_V1}/assistants"
-    params = {"api-version": API_VERSION, "limit": "100", "include[]": "internal_metadata"}
-    r = do_api_request("GET", url, params=params)
-    response_data = r.json()
+DEFAULT_FETCH_CONCURRENCY = 8  # Parallel single-assistant fetches when migrating an ID list
+
+def read_assistant_ids_file(path: str) -> List[str]:
+    """
+    Read assistant IDs from a file: one per line (commas also separate IDs), blank lines and '#' comments ignored.
+    Duplicates are dropped, keeping the first occurrence's position.
+    """
+    assistant_ids = []
+    seen = set()
+    duplicates = 0
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0]
+            for assistant_id in line.replace(",", " ").split():
+                if assistant_id in seen:
+                    duplicates += 1
+                    continue
+                seen.add(assistant_id)
+                assistant_ids.append(assistant_id)
+    if duplicates:
+        logger.info(f"   Ignored {duplicates} duplicate assistant ID(s) in {path}")
+    return assistant_ids
+
+def iter_assistants_by_id(assistant_ids: Iterable[str], fetch_one: Callable[[str], Dict[str, Any]], concurrency: int = DEFAULT_FETCH_CONCURRENCY, source_name: str = "source", on_failure: Optional[Callable[[str, str], None]] = None) -> Iterable[Dict[str, Any]]:
+    """
+    Fetch assistants one ID at a time with up to `concurrency` requests in flight (over the shared HTTP session),
+    yielding each assistant as soon as it arrives so conversion overlaps with fetching.
+    IDs that fail to fetch are reported, passed to `on_failure(assistant_id, error)` if given, and skipped.
+    """
+    def fetch(assistant_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            return fetch_one(assistant_id)
+        except Exception as e:
+            logger.error(f"❌ Failed to fetch assistant {assistant_id} from {source_name}: {e}")
+            if on_failure:
+                on_failure(assistant_id, str(e))
+            return None
+    
+    if concurrency <= 1:
+        for assistant_id in assistant_ids:
+            assistant = fetch(assistant_id)
+            if assistant:
+                yield assistant
+        return
+    
+    max_in_flight = concurrency * 2
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="fetch") as executor:
+        in_flight = set()
+        for assistant_id in assistant_ids:
+            in_flight.add(executor.submit(fetch, assistant_id))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.result():
+                        yield future.result()
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.result():
+                    yield future.result()
+
+# Page size used when listing v1 assistants (the v1 API caps `limit` at 100)
+LIST_PAGE_SIZE = 100
+
+def extract_list_page(response_data: Any) -> tuple:
+    """
+    Extract one page of results from a v1 list response.
+    
+    Returns:
+        (items, has_more, last_id) where last_id is the cursor to pass as `after` for the next page
+    """
+    items = None
+    has_more = False
+    last_id = None
     
     # Handle different response formats
     if isinstance(response_data, dict):
-        if "data" in response_data:
-            return response_data["data"]
-        elif "assistants" in response_data:
-            return response_data["assistants"]
-        elif "items" in response_data:
-            return response_data["items"]
+        for key in ("data", "assistants", "items"):
+            if key in response_data:
+                items = response_data[key]
+                break
+        has_more = bool(response_data.get("has_more", False))
+        last_id = response_data.get("last_id")
     elif isinstance(response_data, list):
-        return response_data
+        items = response_data
+    
+    if not isinstance(items, list):
+        # If we can't find a list, return empty
+        logger.info(f"Warning: Unexpected API response format: {type(response_data)}")
+        return [], False, None
+    
+    if not last_id and items and isinstance(items[-1], dict):
+        last_id = items[-1].get("id")
+    
+    return items, has_more and bool(last_id), last_id
+
+def iter_paginated(fetch_page: Callable[[Optional[str]], Any]) -> Iterable[Dict[str, Any]]:
+    """
+    Yield items from a cursor-paginated v1 list endpoint, following `after`/`has_more`.
+    
+    The next page is requested in the background while the current page is being consumed,
+    so downstream conversion can start on page 1 while page 2 is still in flight.
+    At most two pages are held in memory at any time.
+    
+    Args:
+        fetch_page: Callable taking the `after` cursor (None for the first page) and returning the parsed JSON response
+    """
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="page-prefetch") as prefetcher:
+        pending = prefetcher.submit(fetch_page, None)
+        seen_cursors = set()
+        while pending is not None:
+            items, has_more, last_id = extract_list_page(pending.result())
+            pending = None
+            if has_more and last_id not in seen_cursors:
+                seen_cursors.add(last_id)
+                pending = prefetcher.submit(fetch_page, last_id)
+            yield from items
+
+def iter_assistants_from_api(page_size: int = LIST_PAGE_SIZE) -> Iterable[Dict[str, Any]]:
+    """Stream all v1 assistants from API page by page."""
+    url = f"{BASE_V1}/assistants"
     
-    # If we can't find a list, return empty
-    print(f"Warning: Unexpected API response format: {type(response_data)}")
-    return []
+    def fetch_page(after: Optional[str]) -> Any:
+        params = {"api-version": API_VERSION, "limit": str(page_size), "include[]": "internal_metadata"}
+        if after:
+            params["after"] = after
+        return do_api_request("GET", url, params=params).json()
+    
+    yield from iter_paginated(fetch_page)
+
+def list_assistants_from_api() -> List[Dict[str, Any]]:
+    """List all v1 assistants from API."""
+    return list(iter_assistants_from_api())
+
+_PROJECT_CONNECTION_PACKAGE_READY = False
 
 def ensure_project_connection_package():
-    """Ensure the correct azure-ai-projects version is installed for project connection string functionality."""
-    try:
-        # Test if we have the from_connection_string method
-        from azure.ai.projects import AIProjectClient
-        if hasattr(AIProjectClient, 'from_connection_string'):
-            print("✅ Correct azure-ai-projects version already installed (1.0.0b10)")
-            return True
-        else:
-            print("⚠️  Current azure-ai-projects version doesn't support from_connection_string")
-            print("🔄 Upgrading to azure-ai-projects==1.0.0b10...")
-            
-            import subprocess
-            import sys
-            
-            # Upgrade to the beta version
-            result = subprocess.run([
-                sys.executable, "-m", "pip", "install", "--upgrade", "azure-ai-projects==1.0.0b10"
-            ], capture_output=True, text=True)
-            
-            if result.returncode == 0:
-                print("✅ Successfully upgraded to azure-ai-projects==1.0.0b10")
-                # Force reimport after upgrade
-                import importlib
-                import azure.ai.projects
-                importlib.reload(azure.ai.projects)
-                return True
-            else:
-                print(f"❌ Failed to upgrade package: {result.stderr}")
-                return False
-                
-    except ImportError:
-        print("❌ azure-ai-projects package not found")
-        print("🔄 Installing azure-ai-projects==1.0.0b10...")
+    """
+    Check (once per run) that the installed azure-ai-projects supports project connection strings.
+    Nothing is installed at runtime: install azure-ai-projects==1.0.0b10 up front
+    (the Docker image does this when NEED_BETA_VERSION=true).
+    """
+    global _PROJECT_CONNECTION_PACKAGE_READY
+    if _PROJECT_CONNECTION_PACKAGE_READY:
+        return True
+    _PROJECT_CONNECTION_PACKAGE_READY = _check_project_connection_package()
+    return _PROJECT_CONNECTION_PACKAGE_READY
+
+def _check_project_connection_package():
+    if not PROJECT_CLIENT_AVAILABLE:
+        logger.error("❌ azure-ai-projects and azure-identity are required for project connection string functionality")
+        logger.info("💡 Install with: pip install azure-ai-projects==1.0.0b10 azure-identity")
+        return False
+    from azure.ai.projects import AIProjectClient
+    if not hasattr(AIProjectClient, 'from_connection_string'):
+        logger.error("❌ The installed azure-ai-projects version doesn't support from_connection_string")
+        logger.info("💡 Install with: pip install azure-ai-projects==1.0.0b10 (or set NEED_BETA_VERSION=true for the Docker image)")
+        return False
+    logger.info("✅ Correct azure-ai-projects version installed (1.0.0b10)")
+    return True
+
+def normalize_sdk_value(value: Any) -> Any:
+    """
+    Convert a value from an SDK model into plain JSON types in a single pass:
+    models/mappings become dicts, tuples become lists, str/int enums become their values,
+    and anything else that isn't JSON-native (datetimes, ...) becomes str(value).
+    """
+    if value is None or type(value) in (str, int, float, bool):
+        return value
+    if isinstance(value, Mapping):
+        return {key if isinstance(key, str) else str(key): normalize_sdk_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [normalize_sdk_value(item) for item in value]
+    if hasattr(value, 'model_dump'):
+        return normalize_sdk_value(value.model_dump())
+    # Enum subclasses of str/int/float serialize as their plain value
+    if isinstance(value, str):
+        return str.__str__(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    return str(value)
+
+def normalize_sdk_object(agent: Any) -> Dict[str, Any]:
+    """Convert an SDK agent object (pydantic-style model or mapping model) into a plain assistant dict."""
+    if hasattr(agent, 'model_dump'):
+        return normalize_sdk_value(agent.model_dump())
+    return normalize_sdk_value(dict(agent))
+
+def get_project_connection_client(project_connection_string: str):
+    """
+    Return the AIProjectClient for a project connection string, creating it on first use.
+    Requires azure-ai-projects==1.0.0b10 (from_connection_string).
+    """
+    key = ("connection_string", project_connection_string)
+    project_client = _PROJECT_CLIENTS.get(key)
+    if project_client is not None:
+        return project_client
+    
+    with _PROJECT_CLIENTS_LOCK:
+        project_client = _PROJECT_CLIENTS.get(key)
+        if project_client is not None:
+            return project_client
         
-        import subprocess
-        import sys
+        # Ensure we have the correct version
+        if not ensure_project_connection_package():
+            raise ImportError("azure-ai-projects==1.0.0b10 is required for project connection string functionality")
+        from azure.ai.projects import AIProjectClient
         
-        result = subprocess.run([
-            sys.executable, "-m", "pip", "install", "azure-ai-projects==1.0.0b10"
-        ], capture_output=True, text=True)
+        # Try to use from_connection_string method (available in beta versions)
+        try:
+            project_client = AIProjectClient.from_connection_string(
+                credential=get_azure_credential(),
+                conn_str=project_connection_string
+            )
+            logger.debug("✅ Using AIProjectClient.from_connection_string method")
+        except AttributeError:
+            # This shouldn't happen after the version check, but keep as fallback
+            logger.warning("⚠️  from_connection_string not available")
+            raise ImportError("azure-ai-projects==1.0.0b10 is required for project connection string functionality")
         
-        if result.returncode == 0:
-            print("✅ Successfully installed azure-ai-projects==1.0.0b10")
-            return True
-        else:
-            print(f"❌ Failed to install package: {result.stderr}")
-            return False
+        _PROJECT_CLIENTS[key] = project_client
+        return project_client
 
-def get_assistant_from_project_connection(project_connection_string: str, assistant_id: str) -> Dict[str, Any]:
-    """Get v1 assistant details from AIProjectClient using connection string."""
-    global AIProjectClient, PROJECT_CLIENT_AVAILABLE
+def get_project_client(project_endpoint: str, subscription_id: Optional[str] = None, resource_group_name: Optional[str] = None, project_name: Optional[str] = None):
+    """
+    Return the AIProjectClient for a project endpoint, creating it on first use.
+    Subscription, resource group and project name are passed only when all three are known.
+    """
+    key = ("endpoint", project_endpoint, subscription_id, resource_group_name, project_name)
+    project_client = _PROJECT_CLIENTS.get(key)
+    if project_client is not None:
+        return project_client
     
-    if not PROJECT_CLIENT_AVAILABLE:
-        print("❌ azure-ai-projects package is required for project connection string functionality")
-        print("🔄 Attempting to install the correct version...")
-        if not ensure_project_connection_package():
-            raise ImportError("Failed to install azure-ai-projects==1.0.0b10")
+    with _PROJECT_CLIENTS_LOCK:
+        project_client = _PROJECT_CLIENTS.get(key)
+        if project_client is not None:
+            return project_client
+        
+        from azure.ai.projects import AIProjectClient
+        
+        # Try different AIProjectClient constructor patterns for different versions
+        try:
+            # Try the newer constructor with additional parameters (if provided)
+            if subscription_id and resource_group_name and project_name:
+                project_client = AIProjectClient(
+                    endpoint=project_endpoint,
+                    credential=get_azure_credential(),
+                    subscription_id=subscription_id,
+                    resource_group_name=resource_group_name,
+                    project_name=project_name
+                )
+            else:
+                # Fallback to the original constructor (should work with most versions)
+                project_client = AIProjectClient(
+                    endpoint=project_endpoint,
+                    credential=get_azure_credential(),
+                )
+        except TypeError as type_error:
+            # If that fails, try with just endpoint and credential
+            logger.warning(f"   ⚠️  Trying alternative AIProjectClient constructor due to: {type_error}")
+            try:
+                project_client = AIProjectClient(
+                    endpoint=project_endpoint,
+                    credential=get_azure_credential(),
+                )
+            except Exception as fallback_error:
+                raise RuntimeError(f"Could not initialize AIProjectClient with any constructor pattern. Original error: {type_error}, Fallback error: {fallback_error}")
+        
+        _PROJECT_CLIENTS[key] = project_client
+        return project_client
 
-        # Re-import after installation
+def close_project_clients():
+    """Close every cached AIProjectClient (registered with atexit)."""
+    with _PROJECT_CLIENTS_LOCK:
+        clients = list(_PROJECT_CLIENTS.values())
+        _PROJECT_CLIENTS.clear()
+    for project_client in clients:
         try:
-            from azure.ai.projects import AIProjectClient
-            PROJECT_CLIENT_AVAILABLE = True
-        except ImportError:
-            raise ImportError("Failed to import AIProjectClient after installation")    # Ensure we have the correct version
-    if not ensure_project_connection_package():
-        raise ImportError("azure-ai-projects==1.0.0b10 is required for project connection string functionality")
-    
-    # Try to use from_connection_string method (available in beta versions)
-    try:
-        project_client = AIProjectClient.from_connection_string(
-            credential=get_azure_credential(),
-            conn_str=project_connection_string
-        )
-        print("✅ Using AIProjectClient.from_connection_string method")
-    except AttributeError:
-        # This shouldn't happen now, but keep as fallback
-        print("⚠️  from_connection_string not available after upgrade")
-        raise ImportError("azure-ai-projects==1.0.0b10 is required for project connection string functionality")
-    
-    with project_client:
-        agent = project_client.agents.get_agent(assistant_id)
-        # Convert the agent object to dictionary format with proper JSON serialization
-        if hasattr(agent, 'model_dump'):
-            return json.loads(json.dumps(agent.model_dump(), default=str))
-        else:
-            return json.loads(json.dumps(dict(agent), default=str))
+            project_client.close()
+        except Exception:
+            pass
+
+atexit.register(close_project_clients)
+
+def get_assistant_from_project_connection(project_connection_string: str, assistant_id: str) -> Dict[str, Any]:
+    """Get v1 assistant details from AIProjectClient using connection string."""
+    project_client = get_project_connection_client(project_connection_string)
+    agent = project_client.agents.get_agent(assistant_id)
+    # Convert the agent object to a plain dictionary
+    return normalize_sdk_object(agent)
+
+def iter_assistants_from_project_connection(project_connection_string: str) -> Iterable[Dict[str, Any]]:
+    """Stream all v1 assistants from AIProjectClient using connection string, page by page."""
+    project_client = get_project_connection_client(project_connection_string)
+    # list_agents() pages lazily, so agents are yielded as each page arrives
+    for agent in project_client.agents.list_agents():
+        # Convert agent objects to plain dictionaries
+        yield normalize_sdk_object(agent)
 
 def list_assistants_from_project_connection(project_connection_string: str) -> List[Dict[str, Any]]:
     """List all v1 assistants from AIProjectClient using connection string."""
-    global AIProjectClient, PROJECT_CLIENT_AVAILABLE
-    
-    if not PROJECT_CLIENT_AVAILABLE:
-        print("❌ azure-ai-projects package is required for project connection string functionality")
-        print("🔄 Attempting to install the correct version...")
-        if not ensure_project_connection_package():
-            raise ImportError("Failed to install azure-ai-projects==1.0.0b10")
-
-        # Re-import after installation
-        try:
-            from azure.ai.projects import AIProjectClient
-            PROJECT_CLIENT_AVAILABLE = True
-        except ImportError:
-            raise ImportError("Failed to import AIProjectClient after installation")    # Ensure we have the correct version
-    if not ensure_project_connection_package():
-        raise ImportError("azure-ai-projects==1.0.0b10 is required for project connection string functionality")
-    
-    # Try to use from_connection_string method (available in beta versions)
-    try:
-        project_client = AIProjectClient.from_connection_string(
-            credential=get_azure_credential(),
-            conn_str=project_connection_string
-        )
-        print("✅ Using AIProjectClient.from_connection_string method")
-    except AttributeError:
-        # This shouldn't happen now, but keep as fallback
-        print("⚠️  from_connection_string not available after upgrade")
-        raise ImportError("azure-ai-projects==1.0.0b10 is required for project connection string functionality")
-    
-    with project_client:
-        agents = project_client.agents.list_agents()
-        # Convert agent objects to dictionary format with proper JSON serialization
-        agent_list = []
-        for agent in agents:
-            if hasattr(agent, 'model_dump'):
-                agent_dict = json.loads(json.dumps(agent.model_dump(), default=str))
-            else:
-                agent_dict = json.loads(json.dumps(dict(agent), default=str))
-            agent_list.append(agent_dict)
-        return agent_list
+    return list(iter_assistants_from_project_connection(project_connection_string))
 
 def get_assistant_from_project(project_endpoint: str, assistant_id: str, subscription_id: Optional[str] = None, resource_group_name: Optional[str] = None, project_name: Optional[str] = None) -> Dict[str, Any]:
     """Get v1 assistant details from project endpoint using direct API calls (bypassing AIProjectClient SDK bug)."""
     
     # Since direct API calls work and AIProjectClient has issues, use direct REST API
-    print(f"   🌐 Using direct API call to project endpoint (bypassing AIProjectClient SDK)")
+    logger.debug("   🌐 Using direct API call to project endpoint (bypassing AIProjectClient SDK)")
     
     # Build the direct API URL
     if not project_endpoint.endswith('/'):
@@ -585,30 +1454,30 @@ def get_assistant_from_project(project_endpoint: str, assistant_id: str, subscri
     # Add API version parameter
     params = {"api-version": API_VERSION}
     
-    print(f"   📞 Making direct API call to: {api_url}")
-    print(f"   🔧 Using API version: {API_VERSION}")
+    logger.debug(f"   📞 Making direct API call to: {api_url}")
+    logger.debug(f"   🔧 Using API version: {API_VERSION}")
     
     try:
         # Make the direct API request
         response = do_api_request("GET", api_url, params=params)
         result = response.json()
         
-        print(f"   ✅ Successfully retrieved assistant via direct API call")
-        print(f"   📋 Assistant ID: {result.get('id', 'N/A')}")
-        print(f"   📋 Assistant Name: {result.get('name', 'N/A')}")
+        logger.debug("   ✅ Successfully retrieved assistant via direct API call")
+        logger.debug(f"   📋 Assistant ID: {result.get('id', 'N/A')}")
+        logger.debug(f"   📋 Assistant Name: {result.get('name', 'N/A')}")
         
         return result
         
     except Exception as e:
-        print(f"   ❌ Direct API call failed: {e}")
+        logger.error(f"   ❌ Direct API call failed: {e}")
         
         # Fallback to AIProjectClient if available (for debugging)
         if PROJECT_CLIENT_AVAILABLE:
-            print(f"   🔄 Attempting fallback to AIProjectClient...")
+            logger.debug("   🔄 Attempting fallback to AIProjectClient...")
             
             # Extract project information from endpoint if not provided
             if not subscription_id or not resource_group_name or not project_name:
-                print(f"   🔍 Some project parameters missing, attempting to extract from endpoint or environment...")
+                logger.debug("   🔍 Some project parameters missing, attempting to extract from endpoint or environment...")
                 
                 # Use environment variables as fallbacks
                 subscription_id = subscription_id or os.getenv("AGENTS_SUBSCRIPTION") or "921496dc-987f-410f-bd57-426eb2611356"
@@ -620,42 +1489,31 @@ def get_assistant_from_project(project_endpoint: str, assistant_id: str, subscri
                     project_match = re.search(r'/projects/([^/?]+)', project_endpoint)
                     if project_match:
                         project_name = project_match.group(1)
-                        print(f"   📝 Extracted project name from endpoint: {project_name}")
+                        logger.debug(f"   📝 Extracted project name from endpoint: {project_name}")
                     else:
                         project_name = "default-project"
-                        print(f"   ⚠️  Could not extract project name from endpoint, using default: {project_name}")
+                        logger.warning(f"   ⚠️  Could not extract project name from endpoint, using default: {project_name}")
                 
-                print(f"   📋 Using: subscription={subscription_id[:8]}..., resource_group={resource_group_name}, project={project_name}")
+                logger.debug(f"   📋 Using: subscription={subscription_id[:8]}..., resource_group={resource_group_name}, project={project_name}")
             
-            # Initialize AIProjectClient with all required parameters
+            # Use the cached AIProjectClient with all required parameters
             try:
-                project_client = AIProjectClient(
-                    endpoint=project_endpoint,
-                    credential=get_azure_credential(),
-                    subscription_id=subscription_id,
-                    resource_group_name=resource_group_name,
-                    project_name=project_name
-                )
+                project_client = get_project_client(project_endpoint, subscription_id, resource_group_name, project_name)
+                agent = project_client.agents.get_agent(assistant_id)
+                # Convert the agent object to a plain dictionary
+                return normalize_sdk_object(agent)
                 
-                with project_client:
-                    agent = project_client.agents.get_agent(assistant_id)
-                    # Convert the agent object to dictionary format with proper JSON serialization
-                    if hasattr(agent, 'model_dump'):
-                        return json.loads(json.dumps(agent.model_dump(), default=str))
-                    else:
-                        return json.loads(json.dumps(dict(agent), default=str))
-                        
             except Exception as client_error:
-                print(f"   ❌ AIProjectClient fallback also failed: {client_error}")
+                logger.error(f"   ❌ AIProjectClient fallback also failed: {client_error}")
                 raise RuntimeError(f"Both direct API call and AIProjectClient failed. Direct API error: {e}, AIProjectClient error: {client_error}")
         else:
             raise
 
-def list_assistants_from_project(project_endpoint: str, subscription_id: Optional[str] = None, resource_group_name: Optional[str] = None, project_name: Optional[str] = None) -> List[Dict[str, Any]]:
-    """List all v1 assistants from project endpoint using direct API calls (bypassing AIProjectClient SDK bug)."""
+def iter_assistants_from_project(project_endpoint: str, subscription_id: Optional[str] = None, resource_group_name: Optional[str] = None, project_name: Optional[str] = None, page_size: int = LIST_PAGE_SIZE) -> Iterable[Dict[str, Any]]:
+    """Stream all v1 assistants from project endpoint page by page using direct API calls (bypassing AIProjectClient SDK bug)."""
     
     # Since direct API calls work and AIProjectClient has issues, use direct REST API
-    print(f"   🌐 Using direct API call to project endpoint (bypassing AIProjectClient SDK)")
+    logger.debug("   🌐 Using direct API call to project endpoint (bypassing AIProjectClient SDK)")
     
     # Build the direct API URL
     if not project_endpoint.endswith('/'):
@@ -664,89 +1522,158 @@ def list_assistants_from_project(project_endpoint: str, subscription_id: Optiona
     # Remove trailing slash if present, then add the assistants path
     api_url = project_endpoint.rstrip('/') + '/assistants'
     
-    # Add API version parameter
-    params = {"api-version": API_VERSION, "limit": "100"}
+    logger.debug(f"   📞 Making direct API call to: {api_url}")
+    logger.debug(f"   🔧 Using API version: {API_VERSION}")
     
-    print(f"   📞 Making direct API call to: {api_url}")
-    print(f"   🔧 Using API version: {API_VERSION}")
+    def fetch_page(after: Optional[str]) -> Any:
+        # Add API version and cursor parameters
+        params = {"api-version": API_VERSION, "limit": str(page_size)}
+        if after:
+            params["after"] = after
+        return do_api_request("GET", api_url, params=params).json()
     
+    yielded = 0
     try:
-        # Make the direct API request
-        response = do_api_request("GET", api_url, params=params)
-        result = response.json()
-        
-        # Handle different response formats (same logic as list_assistants_from_api)
-        if isinstance(result, dict):
-            if "data" in result:
-                agent_list = result["data"]
-            elif "assistants" in result:
-                agent_list = result["assistants"]
-            elif "items" in result:
-                agent_list = result["items"]
-            else:
-                # If we can't find a list, return empty
-                print(f"   ⚠️  Unexpected API response format: {type(result)}")
-                agent_list = []
-        elif isinstance(result, list):
-            agent_list = result
-        else:
-            # If we can't find a list, return empty
-            print(f"   ⚠️  Unexpected API response format: {type(result)}")
-            agent_list = []
-        
-        print(f"   ✅ Successfully retrieved {len(agent_list)} assistants via direct API call")
+        for assistant in iter_paginated(fetch_page):
+            yielded += 1
+            yield assistant
         
-        return agent_list
+        logger.debug(f"   ✅ Successfully retrieved {yielded} assistants via direct API call")
         
     except Exception as e:
-        print(f"   ❌ Direct API call failed: {e}")
+        logger.error(f"   ❌ Direct API call failed: {e}")
         
-        # Fallback to AIProjectClient if available (for debugging)
-        if PROJECT_CLIENT_AVAILABLE:
-            print(f"   🔄 Attempting fallback to AIProjectClient...")
+        # Fallback to AIProjectClient only if nothing was streamed yet (otherwise records would be duplicated)
+        if PROJECT_CLIENT_AVAILABLE and yielded == 0:
+            logger.debug("   🔄 Attempting fallback to AIProjectClient...")
             
-            # Try different AIProjectClient constructor patterns for different versions
-            try:
-                # Try the newer constructor with additional parameters (if provided)
-                if subscription_id and resource_group_name and project_name:
-                    project_client = AIProjectClient(
-                        endpoint=project_endpoint,
-                        credential=get_azure_credential(),
-                        subscription_id=subscription_id,
-                        resource_group_name=resource_group_name,
-                        project_name=project_name
-                    )
-                else:
-                    # Fallback to the original constructor (should work with most versions)
-                    project_client = AIProjectClient(
-                        endpoint=project_endpoint,
-                        credential=get_azure_credential(),
-                    )
-            except TypeError as type_error:
-                # If that fails, try with just endpoint and credential
-                print(f"   ⚠️  Trying alternative AIProjectClient constructor due to: {type_error}")
-                try:
-                    project_client = AIProjectClient(
-                        endpoint=project_endpoint,
-                        credential=get_azure_credential(),
-                    )
-                except Exception as fallback_error:
-                    raise RuntimeError(f"Could not initialize AIProjectClient with any constructor pattern. Original error: {type_error}, Fallback error: {fallback_error}")
+            project_client = get_project_client(project_endpoint, subscription_id, resource_group_name, project_name)
             
-            with project_client:
-                agents = project_client.agents.list_agents()
-                # Convert agent objects to dictionary format with proper JSON serialization
-                agent_list = []
-                for agent in agents:
-                    if hasattr(agent, 'model_dump'):
-                        agent_dict = json.loads(json.dumps(agent.model_dump(), default=str))
-                    else:
-                        agent_dict = json.loads(json.dumps(dict(agent), default=str))
-                    agent_list.append(agent_dict)
-                return agent_list
+            # list_agents() pages lazily, so agents are yielded as each page arrives
+            for agent in project_client.agents.list_agents():
+                # Convert agent objects to plain dictionaries
+                yield normalize_sdk_object(agent)
         else:
             raise
 
+def list_assistants_from_project(project_endpoint: str, subscription_id: Optional[str] = None, resource_group_name: Optional[str] = None, project_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """List all v1 assistants from project endpoint using direct API calls (bypassing AIProjectClient SDK bug)."""
+    return list(iter_assistants_from_project(project_endpoint, subscription_id, resource_group_name, project_name))
+
+def get_v2_agents_base_url(production_resource: Optional[str] = None, production_subscription: Optional[str] = None) -> str:
+    """
+    Return the v2 API base URL that /agents/... paths are appended to: the --v2-base-url override,
+    the production endpoint, or the local development server.
+    """
+    if BASE_V2:
+        # Explicit v2 base URL (e.g. a local mock server) takes precedence
+        logger.debug(f"🎯 Using v2 base URL override: {BASE_V2}")
+        return BASE_V2
+    if production_resource and production_subscription:
+        # Production mode: use Azure AI services endpoint format
+        logger.debug("🏭 Using PRODUCTION endpoint")
+        return get_production_v2_base_url(production_resource, production_subscription, production_resource)
+    # Local development mode
+    logger.debug("🏠 Using LOCAL development endpoint")
+    return f"https://{LOCAL_HOST}/agents/v2.0/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/{RESOURCE_GROUP_V2}/providers/Microsoft.MachineLearningServices/workspaces/{WORKSPACE_V2}"
+
+def get_latest_agent_version(agent_name: str, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_token: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetch the latest version of a v2 agent.
+    
+    Args:
+        production_token: Token for the production target (default: get_production_token())
+    
+    Returns:
+        The latest agent version object, or None if the agent doesn't exist
+    """
+    agent_name = agent_name.lower()
+    url = f"{get_v2_agents_base_url(production_resource, production_subscription)}/agents/{agent_name}"
+    params = {"api-version": API_VERSION}
+    production_token = production_token or (get_production_token() if production_resource else None)
+    if production_resource and production_token:
+        response = do_api_request_with_token("GET", url, production_token, params=params, expected_statuses=(404,))
+    else:
+        response = do_api_request("GET", url, params=params, expected_statuses=(404,))
+    if response.status_code == 404:
+        return None
+    agent = response.json()
+    return (agent.get("versions") or {}).get("latest")
+
+# Metadata key holding the hash of the migrated definition, used to skip re-posting unchanged agents
+CONTENT_HASH_METADATA_KEY = "migration_content_hash"
+# Metadata that changes on every run and must not affect the hash
+CONTENT_HASH_EXCLUDED_METADATA = {"migration_timestamp", CONTENT_HASH_METADATA_KEY}
+
+def compute_payload_hash(api_payload: Dict[str, Any]) -> str:
+    """
+    Stable SHA-256 of a prepared v2 payload (description, definition and metadata, minus per-run fields).
+    """
+    metadata = {k: v for k, v in (api_payload.get("metadata") or {}).items() if k not in CONTENT_HASH_EXCLUDED_METADATA}
+    canonical = dict(api_payload, metadata=metadata)
+    encoded = json.dumps(canonical, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+def get_target_key(production_resource: Optional[str] = None, production_subscription: Optional[str] = None) -> str:
+    """
+    Identify the v2 target that get_v2_agents_base_url resolves to, for per-target caches, limits and journal entries:
+    the --v2-base-url override, "subscription/resource", or "" for the local development server.
+    """
+    if BASE_V2:
+        return BASE_V2
+    return f"{production_subscription or ''}/{production_resource}" if production_resource else ""
+
+class KnownContentHashes:
+    """
+    Thread-safe cache of the content hash of each agent's latest version ((target, agent name) -> hash, id, version).
+    Seeded from the journal so reruns don't need a GET per agent; filled from the v2 API otherwise.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: Dict[tuple, Dict[str, Any]] = {}
+    
+    def seed_from_journal(self, journal: "MigrationJournal", target: str = ""):
+        """
+        Load the hashes of versions this tool posted to `target` in previous runs.
+        Entries posted to another target (or written before the journal recorded targets) are ignored. Entries are
+        loaded in post order, so when several assistants map to one agent name the most recent post wins.
+        """
+        for state in journal.posted_states(target):
+            if state.get("agent_name") and state.get("content_hash"):
+                self.put(state["agent_name"], state["content_hash"], state.get("v2_id"), state.get("v2_version"), target=target)
+    
+    def get(self, agent_name: str, target: str = "") -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get((target, agent_name.lower()))
+            return dict(entry) if entry else None
+    
+    def put(self, agent_name: str, content_hash: Optional[str], v2_id: Optional[str] = None, v2_version: Optional[str] = None, target: str = ""):
+        with self._lock:
+            self._entries[(target, agent_name.lower())] = {"content_hash": content_hash, "v2_id": v2_id, "v2_version": v2_version}
+
+KNOWN_CONTENT_HASHES = KnownContentHashes()
+
+def find_unchanged_agent_version(agent_name: str, content_hash: str, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_token: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Return the known latest version of an agent if it already carries `content_hash`, otherwise None.
+    The local cache is consulted first; the v2 API is only asked about agents the cache hasn't seen.
+    """
+    target = get_target_key(production_resource, production_subscription)
+    known = KNOWN_CONTENT_HASHES.get(agent_name, target)
+    if known is None:
+        try:
+            latest = get_latest_agent_version(agent_name, production_resource, production_subscription, production_token)
+        except Exception as e:
+            # Can't tell - creating a new version is the safe fallback
+            logger.debug(f"   Could not look up existing versions of '{agent_name}': {e}")
+            return None
+        if latest is None:
+            return None
+        remote_hash = (latest.get("metadata") or {}).get(CONTENT_HASH_METADATA_KEY)
+        known = {"content_hash": remote_hash, "v2_id": latest.get("id"), "v2_version": latest.get("version")}
+        KNOWN_CONTENT_HASHES.put(agent_name, remote_hash, known["v2_id"], known["v2_version"], target=target)
+    return known if known.get("content_hash") == content_hash else None
+
 def create_agent_version_via_api(agent_name: str, agent_version_data: Dict[str, Any], production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_token: Optional[str] = None) -> Dict[str, Any]:
     """
     Create a v2 agent version using the v2 API endpoint.
@@ -756,7 +1683,7 @@ def create_agent_version_via_api(agent_name: str, agent_version_data: Dict[str,
         agent_version_data: The agent version payload matching v2 API format
         production_resource: Optional production resource name (e.g., "nextgen-eastus")
         production_subscription: Optional production subscription ID
-        production_token: Optional production token for authentication
+        production_token: Optional production token for authentication (default: get_production_token())
     
     Returns:
         API response data
@@ -764,69 +1691,54 @@ def create_agent_version_via_api(agent_name: str, agent_version_data: Dict[str,
     # Build the v2 API endpoint URL based on mode (production vs local)
     # Ensure agent name is lowercase for API compliance
     agent_name = agent_name.lower()
-    
-    if production_resource and production_subscription:
-        # Production mode: use Azure AI services endpoint format
-        base_url = get_production_v2_base_url(production_resource, production_subscription, production_resource)
-        url = f"{base_url}/agents/{agent_name}/versions"
-        print(f"🏭 Using PRODUCTION endpoint")
-    else:
-        # Local development mode: use the existing BASE_V2 format
-        if BASE_V2 is None:
-            # Fallback to local development URL if not set
-            local_base = f"https://{LOCAL_HOST}/agents/v2.0/subscriptions/{SUBSCRIPTION_ID}/resourceGroups/{RESOURCE_GROUP_V2}/providers/Microsoft.MachineLearningServices/workspaces/{WORKSPACE_V2}"
-            url = f"{local_base}/agents/{agent_name}/versions"
-        else:
-            url = f"{BASE_V2}/agents/{agent_name}/versions"
-        print(f"🏠 Using LOCAL development endpoint")
+    url = f"{get_v2_agents_base_url(production_resource, production_subscription)}/agents/{agent_name}/versions"
     
     params = {"api-version": API_VERSION}
     
-    print(f"🌐 Creating agent version via v2 API:")
-    print(f"   URL: {url}")
-    print(f"   Agent Name: {agent_name}")
-    print(f"   API Version: {API_VERSION}")
-    print(f"   Full params: {params}")
-    
-    # Debug: Show the actual request body
-    print(f"🔍 Request Body Debug:")
-    print(f"   Type: {type(agent_version_data)}")
-    print(f"   Keys: {list(agent_version_data.keys()) if isinstance(agent_version_data, dict) else 'Not a dict'}")
-    if isinstance(agent_version_data, dict):
-        import json
-        print(f"   Full JSON payload:")
-        print(json.dumps(agent_version_data, indent=2, default=str)[:2000] + "..." if len(str(agent_version_data)) > 2000 else json.dumps(agent_version_data, indent=2, default=str))
+    logger.debug("🌐 Creating agent version via v2 API:")
+    logger.debug(f"   URL: {url}")
+    logger.debug(f"   Agent Name: {agent_name}")
+    logger.debug(f"   API Version: {API_VERSION}")
+    logger.debug(f"   Full params: {params}")
+    
+    # Debug: Show the actual request body (only serialized when debug logging is enabled)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("🔍 Request Body Debug:")
+        logger.debug(f"   Type: {type(agent_version_data)}")
+        logger.debug(f"   Keys: {list(agent_version_data.keys()) if isinstance(agent_version_data, dict) else 'Not a dict'}")
+        if isinstance(agent_version_data, dict):
+            payload_json = json.dumps(agent_version_data, indent=2, default=str)
+            logger.debug("   Full JSON payload:\n%s", payload_json[:2000] + "..." if len(payload_json) > 2000 else payload_json)
     
     try:
         # Make the POST request to create the agent version with appropriate token
         # Use production token from environment if available and production resource is specified
-        if production_resource and PRODUCTION_TOKEN:
-            print(f"   🔑 Using production token for authentication")
-            response = do_api_request_with_token("POST", url, PRODUCTION_TOKEN, params=params, json=agent_version_data)
+        production_token = production_token or (get_production_token() if production_resource else None)
+        if production_resource and production_token:
+            logger.debug("   🔑 Using production token for authentication")
+            response = do_api_request_with_token("POST", url, production_token, params=params, json=agent_version_data)
         else:
-            print(f"   🔑 Using standard token for authentication")
+            logger.debug("   🔑 Using standard token for authentication")
             response = do_api_request("POST", url, params=params, json=agent_version_data)
         result = response.json()
         
-        print(f"✅ Successfully created agent version via v2 API")
-        print(f"   Response ID: {result.get('id', 'N/A')}")
+        logger.debug("✅ Successfully created agent version via v2 API")
+        logger.debug(f"   Response ID: {result.get('id', 'N/A')}")
         
         return result
         
     except requests.exceptions.HTTPError as e:
-        print(f"❌ Failed to create agent version via v2 API: {e}")
-        if hasattr(e, 'response') and e.response:
-            print(f"🔍 Response Status Code: {e.response.status_code}")
+        logger.error(f"❌ Failed to create agent version via v2 API: {e}")
+        if getattr(e, 'response', None) is not None:
+            logger.error(f"🔍 Response Status Code: {e.response.status_code}")
             try:
                 error_response = e.response.json()
-                print(f"🔍 Error Response JSON:")
-                import json
-                print(json.dumps(error_response, indent=2))
-            except:
-                print(f"🔍 Error Response Text: {e.response.text[:1000]}")
+                logger.error("🔍 Error Response JSON:\n%s", json.dumps(error_response, indent=2))
+            except ValueError:
+                logger.error(f"🔍 Error Response Text: {e.response.text[:1000]}")
         raise
     except Exception as e:
-        print(f"❌ Failed to create agent version via v2 API: {e}")
+        logger.error(f"❌ Failed to create agent version via v2 API: {e}")
         raise
 
 def prepare_v2_api_payload(v2_agent_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -876,12 +1788,12 @@ def prepare_v2_api_payload(v2_agent_data: Dict[str, Any]) -> Dict[str, Any]:
     # Remove None values to keep payload clean
     api_payload = {k: v for k, v in api_payload.items() if v is not None}
     
-    print(f"🔧 Prepared v2 API payload:")
-    print(f"   Description: {api_payload.get('description', 'N/A')}")
-    print(f"   Metadata keys: {list(api_payload.get('metadata', {}).keys())}")
-    print(f"   Definition kind: {api_payload.get('definition', {}).get('kind', 'N/A')}")
-    print(f"   Migration info: Original v1 ID = {migration_notes['original_v1_id']}")
-    print(f"   All metadata values converted to strings")
+    logger.debug("🔧 Prepared v2 API payload:")
+    logger.debug(f"   Description: {api_payload.get('description', 'N/A')}")
+    logger.debug(f"   Metadata keys: {list(api_payload.get('metadata', {}).keys())}")
+    logger.debug(f"   Definition kind: {api_payload.get('definition', {}).get('kind', 'N/A')}")
+    logger.debug(f"   Migration info: Original v1 ID = {migration_notes['original_v1_id']}")
+    logger.debug("   All metadata values converted to strings")
     
     return api_payload
 
@@ -917,54 +1829,124 @@ def determine_agent_kind(v1_assistant: Dict[str, Any]) -> str:
     # Default to prompt agent for all assistants (test assumption: all are prompt agents)
     return "prompt"
 
-def v1_assistant_to_v2_agent(v1_assistant: Dict[str, Any], agent_name: Optional[str] = None, version: str = "1") -> Dict[str, Any]:
+# Tool types that exist in v1 but not in v2, with the warning shown when an assistant uses them
+UNSUPPORTED_TOOL_WARNINGS = {
+    "connected_agent": [
+        "   ⚠️  WARNING: Your classic agent includes connected agents, which aren't supported in the new experience.",
+        "   ℹ️  These connected agents won't be carried over when you create the new agent.",
+        "   💡 To orchestrate multiple agents, use a workflow instead.",
+    ],
+    "event_binding": [
+        "   ⚠️  WARNING: Your classic agent uses 'event_binding' which isn't supported in the new experience.",
+        "   ℹ️  This tool won't be carried over when you create the new agent.",
+    ],
+    "output_binding": [
+        "   ⚠️  WARNING: Your classic agent uses 'output_binding' which isn't supported in the new experience.",
+        "   ℹ️  This tool won't be carried over when you create the new agent.",
+        "   💡 Consider using 'capture_structured_outputs' in your new agent instead.",
+    ],
+}
+
+def parse_json_field(value: Any, expected_type: type, field_name: str) -> Any:
     """
-    Transform a v1 assistant object to v2 agent structure.
-    Based on the migration document mapping from v1 Agent to v2 AgentObject + AgentVersionObject.
+    Return `value` if it already has `expected_type`; decode it if it is a JSON string (from project client or export
+    serialization). Anything else - including non-JSON strings - is reported and returned as None. Never evaluates code.
     """
-    # Validate tools - check for unsupported tool types
-    v1_tools = v1_assistant.get("tools", [])
-    
-    # Handle string-encoded tools (from project client serialization)
-    if isinstance(v1_tools, str):
+    if isinstance(value, expected_type):
+        return value
+    if isinstance(value, str):
         try:
-            v1_tools = json.loads(v1_tools)
+            decoded = json.loads(value)
         except json.JSONDecodeError:
-            print(f"   ⚠️  Warning: Could not parse tools string: {v1_tools}")
-            v1_tools = []
-    
-    # Ensure v1_tools is a list
-    if not isinstance(v1_tools, list):
-        v1_tools = []
+            decoded = None
+        if isinstance(decoded, expected_type):
+            return decoded
+        logger.warning(f"   ⚠️  Warning: Could not parse {field_name} string: {value[:200]}")
+    return None
+
+def _transform_file_search_tool(tool: Dict[str, Any], tool_resources: Dict[str, Any]) -> Dict[str, Any]:
+    # v2 embeds the vector stores in the tool instead of tool_resources
+    transformed_tool = {"type": "file_search"}
+    file_search_resources = tool_resources.get("file_search")
+    if isinstance(file_search_resources, dict) and "vector_store_ids" in file_search_resources:
+        transformed_tool["vector_store_ids"] = file_search_resources["vector_store_ids"]
+    return transformed_tool
+
+def _transform_code_interpreter_tool(tool: Dict[str, Any], tool_resources: Dict[str, Any]) -> Dict[str, Any]:
+    # v2 needs a container; files from tool_resources move into it
+    container = {"type": "auto"}
+    code_resources = tool_resources.get("code_interpreter")
+    if isinstance(code_resources, dict) and "file_ids" in code_resources:
+        container["file_ids"] = code_resources["file_ids"]
+    return {"type": "code_interpreter", "container": container}
+
+def _copy_tool_properties(keys: Optional[List[str]] = None, skip_none: bool = False) -> Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]:
+    """
+    Build a transformer that copies `keys` (or every property when keys is None) from the v1 tool next to its type.
+    """
+    def transform(tool: Dict[str, Any], tool_resources: Dict[str, Any]) -> Dict[str, Any]:
+        transformed_tool = {"type": tool.get("type")}
+        for key in (keys if keys is not None else tool.keys()):
+            if key == "type" or key not in tool or (skip_none and tool[key] is None):
+                continue
+            transformed_tool[key] = tool[key]
+        return transformed_tool
+    return transform
+
+# v1 tool type -> transformer(tool, tool_resources) returning the v2 tool; unlisted types copy all properties
+TOOL_TRANSFORMERS: Dict[str, Callable[[Dict[str, Any], Dict[str, Any]], Dict[str, Any]]] = {
+    "file_search": _transform_file_search_tool,
+    "code_interpreter": _transform_code_interpreter_tool,
+    "function": _copy_tool_properties(["function"]),
+    "mcp": _copy_tool_properties(["server_label", "server_description", "server_url", "require_approval", "project_connection_id"], skip_none=True),
+    "computer_use_preview": _copy_tool_properties(["display_width", "display_height", "environment"]),
+    "image_generation": _copy_tool_properties(),
+    "azure_function": _copy_tool_properties(["name", "description", "parameters", "input_queue", "output_queue"]),
+}
+DEFAULT_TOOL_TRANSFORMER = _copy_tool_properties()
+
+def transform_v1_tools(v1_tools: List[Any], v1_tool_resources: Dict[str, Any]) -> tuple:
+    """
+    Convert v1 tools to v2 tools, merging in their tool_resources.
     
-    # Check for unsupported tool types and log warnings
-    assistant_id = v1_assistant.get("id", "unknown")
-    assistant_name = v1_assistant.get("name", "unknown")
+    Returns:
+        (transformed_tools, unsupported_tools) - unsupported tool types are warned about and skipped
+    """
+    transformed_tools = []
     unsupported_tools = []
-    
     for tool in v1_tools:
+        # Handle string-encoded individual tools
+        if isinstance(tool, str):
+            tool = parse_json_field(tool, dict, "tool")
         if not isinstance(tool, dict):
             continue
-            
-        tool_type = tool.get("type")
         
-        if tool_type == "connected_agent":
-            unsupported_tools.append(tool_type)
-            print(f"   ⚠️  WARNING: Your classic agent includes connected agents, which aren't supported in the new experience.")
-            print(f"   ℹ️  These connected agents won't be carried over when you create the new agent.")
-            print(f"   💡 To orchestrate multiple agents, use a workflow instead.")
-        elif tool_type == "event_binding":
-            unsupported_tools.append(tool_type)
-            print(f"   ⚠️  WARNING: Your classic agent uses 'event_binding' which isn't supported in the new experience.")
-            print(f"   ℹ️  This tool won't be carried over when you create the new agent.")
-        elif tool_type == "output_binding":
+        tool_type = tool.get("type")
+        if tool_type in UNSUPPORTED_TOOL_WARNINGS:
             unsupported_tools.append(tool_type)
-            print(f"   ⚠️  WARNING: Your classic agent uses 'output_binding' which isn't supported in the new experience.")
-            print(f"   ℹ️  This tool won't be carried over when you create the new agent.")
-            print(f"   💡 Consider using 'capture_structured_outputs' in your new agent instead.")
+            warning, *details = UNSUPPORTED_TOOL_WARNINGS[tool_type]
+            logger.warning(warning)
+            for line in details:
+                logger.debug(line)
+            continue
+        
+        transformed_tool = TOOL_TRANSFORMERS.get(tool_type, DEFAULT_TOOL_TRANSFORMER)(tool, v1_tool_resources)
+        logger.debug("   Transformed %s tool: %s", tool_type, transformed_tool)
+        transformed_tools.append(transformed_tool)
+    return transformed_tools, unsupported_tools
+
+def v1_assistant_to_v2_agent(v1_assistant: Dict[str, Any], agent_name: Optional[str] = None, version: str = "1") -> Dict[str, Any]:
+    """
+    Transform a v1 assistant object to v2 agent structure.
+    Based on the migration document mapping from v1 Agent to v2 AgentObject + AgentVersionObject.
+    """
+    # Parse string-encoded tools/tool_resources (JSON only) and transform each tool via TOOL_TRANSFORMERS
+    v1_tools = parse_json_field(v1_assistant.get("tools", []), list, "tools") or []
+    v1_tool_resources = parse_json_field(v1_assistant.get("tool_resources", {}), dict, "tool_resources") or {}
+    transformed_tools, unsupported_tools = transform_v1_tools(v1_tools, v1_tool_resources)
     
     if unsupported_tools:
-        print(f"   📋 Unsupported tools that will be skipped: {', '.join(unsupported_tools)}")
+        logger.debug(f"   📋 Unsupported tools that will be skipped: {', '.join(unsupported_tools)}")
     
     # Derive agent name if not provided
     if not agent_name:
@@ -978,7 +1960,7 @@ def v1_assistant_to_v2_agent(v1_assistant: Dict[str, Any], agent_name: Optional[
     
     # Ensure v1_metadata is a dictionary (defensive programming)
     if not isinstance(v1_metadata, dict):
-        print(f"   ⚠️  Warning: metadata is not a dict (type: {type(v1_metadata)}), using empty dict")
+        logger.warning(f"   ⚠️  Warning: metadata is not a dict (type: {type(v1_metadata)}), using empty dict")
         v1_metadata = {}
     
     feature_flags = {}
@@ -997,7 +1979,7 @@ def v1_assistant_to_v2_agent(v1_assistant: Dict[str, Any], agent_name: Optional[
     enhanced_metadata = v1_metadata.copy() if isinstance(v1_metadata, dict) else {}
     if feature_flags and isinstance(feature_flags, dict):
         enhanced_metadata["feature_flags"] = feature_flags
-        print(f"   🚩 Preserving {len(feature_flags)} feature flags: {list(feature_flags.keys())}")
+        logger.debug(f"   🚩 Preserving {len(feature_flags)} feature flags: {list(feature_flags.keys())}")
     
     # Create the v2 AgentObject (metadata level)
     agent_object = {
@@ -1007,137 +1989,6 @@ def v1_assistant_to_v2_agent(v1_assistant: Dict[str, Any], agent_name: Optional[
         "labels": []  # New: Label associations (empty for now)
     }
 
-     # Transform tools and merge with tool_resources
-    # Note: v1_tools already validated and parsed above during connected_agent check
-    v1_tool_resources = v1_assistant.get("tool_resources", {})
-
-    # Handle string-encoded tool_resources (from project client serialization)
-    if isinstance(v1_tool_resources, str):
-        try:
-            v1_tool_resources = json.loads(v1_tool_resources)
-        except json.JSONDecodeError:
-            # Try eval as fallback for string representations
-            try:
-                v1_tool_resources = eval(v1_tool_resources) if v1_tool_resources.strip().startswith('{') else {}
-            except:
-                print(f"   ⚠️  Could not parse tool_resources string: {v1_tool_resources}")
-                v1_tool_resources = {}
-    
-    # Ensure v1_tool_resources is a dict
-    if not isinstance(v1_tool_resources, dict):
-        v1_tool_resources = {}
-
-    # DEBUG: Print the actual tools and tool_resources structure
-    print(f"🔧 DEBUG - Tools transformation:")
-    print(f"   v1_tools: {v1_tools}")
-    print(f"   v1_tools type: {type(v1_tools)}")
-    print(f"   v1_tool_resources: {v1_tool_resources}")
-    print(f"   v1_tool_resources type: {type(v1_tool_resources)}")
-       
-    # Transform tools to v2 format by merging with tool_resources
-    transformed_tools = []
-    for i, tool in enumerate(v1_tools):
-        print(f"   Processing tool {i}: {tool} (type: {type(tool)})")
-        # Handle string-encoded individual tools
-        if isinstance(tool, str):
-            try:
-                tool = json.loads(tool)
-            except json.JSONDecodeError:
-                try:
-                    tool = eval(tool) if tool.strip().startswith('{') else {}
-                except:
-                    print(f"     ⚠️  Could not parse tool string: {tool}")
-                    continue
-        
-        if isinstance(tool, dict):
-            tool_type = tool.get("type")
-            
-            # Skip unsupported tools
-            if tool_type in ["connected_agent", "event_binding", "output_binding"]:
-                print(f"     ⏭️  Skipping unsupported tool type: {tool_type}")
-                continue
-            transformed_tool = {"type": tool_type}
-            
-            # Handle file_search tool
-            if tool_type == "file_search" and "file_search" in v1_tool_resources:
-                file_search_resources = v1_tool_resources["file_search"]
-                print(f"     Found file_search resources: {file_search_resources}")
-                if "vector_store_ids" in file_search_resources:
-                    transformed_tool["vector_store_ids"] = file_search_resources["vector_store_ids"]
-                    print(f"     Added vector_store_ids: {file_search_resources['vector_store_ids']}")
-            
-            # Handle code_interpreter tool
-            elif tool_type == "code_interpreter" and "code_interpreter" in v1_tool_resources:
-                code_resources = v1_tool_resources["code_interpreter"]
-                print(f"     Found code_interpreter resources: {code_resources}")
-                if "file_ids" in code_resources:
-                    # Add container with auto type and file_ids for v2 format
-                    transformed_tool["container"] = {
-                        "type": "auto",
-                        "file_ids": code_resources["file_ids"]
-                    }
-                    print(f"     Added container with auto type and file_ids: {code_resources['file_ids']}")
-                else:
-                    # If no file_ids, still add container with auto type
-                    transformed_tool["container"] = {"type": "auto"}
-                    print(f"     Added container with auto type (no file_ids)")
-            
-            # Handle code_interpreter tool without resources
-            elif tool_type == "code_interpreter":
-                # If no tool_resources, still add container with auto type
-                transformed_tool["container"] = {"type": "auto"}
-                print(f"     Added container with auto type (no resources)")
-            
-            # Handle function tools (no resources typically)
-            elif tool_type == "function":
-                # Copy function definition if present
-                if "function" in tool:
-                    transformed_tool["function"] = tool["function"]
-            
-            # Handle MCP tools
-            elif tool_type == "mcp":
-                # Copy all MCP-specific properties that actually exist (don't copy None/null values)
-                for key in ["server_label", "server_description", "server_url", "require_approval", "project_connection_id"]:
-                    if key in tool and tool[key] is not None:
-                        transformed_tool[key] = tool[key]
-                print(f"     Added MCP tool properties: {[k for k in tool.keys() if k != 'type' and tool[k] is not None]}")
-            
-            # Handle computer_use_preview tools
-            elif tool_type == "computer_use_preview":
-                # Copy all computer use specific properties
-                for key in ["display_width", "display_height", "environment"]:
-                    if key in tool:
-                        transformed_tool[key] = tool[key]
-                print(f"     Added computer use tool properties: {[k for k in tool.keys() if k != 'type']}")
-            
-            # Handle image_generation tools
-            elif tool_type == "image_generation":
-                # Copy any image generation specific properties (currently none, but future-proof)
-                for key, value in tool.items():
-                    if key != "type":
-                        transformed_tool[key] = value
-                print(f"     Added image generation tool properties: {[k for k in tool.keys() if k != 'type']}")
-            
-            # Handle azure_function tools
-            elif tool_type == "azure_function":
-                # Copy all azure function specific properties
-                for key in ["name", "description", "parameters", "input_queue", "output_queue"]:
-                    if key in tool:
-                        transformed_tool[key] = tool[key]
-                print(f"     Added Azure Function tool properties: {[k for k in tool.keys() if k != 'type']}")
-            
-            # Handle any other tool types by copying all properties except 'type'
-            else:
-                for key, value in tool.items():
-                    if key != "type":
-                        transformed_tool[key] = value
-                print(f"     Added generic tool properties for {tool_type}: {[k for k in tool.keys() if k != 'type']}")
-            
-            transformed_tools.append(transformed_tool)
-
-        print(f"   Final transformed_tools: {transformed_tools}")
-        print(f"   Transformed tools count: {len(transformed_tools)}")
-    
     # Create the v2 AgentVersionObject (definition level)
     agent_version = {
         "object": "agent.version",  # New object type
@@ -1243,16 +2094,16 @@ def save_v2_agent_to_cosmos(v2_agent_data: Dict[str, Any], connection_string: st
         "migrated_at": int(time.time())  # Keep our migration timestamp too
     }
     
-    print(f"🔍 Document structure for partition key:")
-    print(f"   - id: {agent_version_doc['id']}")
-    print(f"   - object: {agent_version_doc['object']}")
-    print(f"   - object type: {type(agent_version_doc['object'])}")
+    logger.debug("🔍 Document structure for partition key:")
+    logger.debug(f"   - id: {agent_version_doc['id']}")
+    logger.debug(f"   - object: {agent_version_doc['object']}")
+    logger.debug(f"   - object type: {type(agent_version_doc['object'])}")
     if isinstance(agent_version_doc['object'], dict):
-        print(f"   - object.project_id: {agent_version_doc['object']['project_id']}")
-        print(f"   - object.agent_name: {agent_version_doc['object']['agent_name']}")
-        print(f"   - object.object_type: {agent_version_doc['object']['object_type']}")
+        logger.debug(f"   - object.project_id: {agent_version_doc['object']['project_id']}")
+        logger.debug(f"   - object.agent_name: {agent_version_doc['object']['agent_name']}")
+        logger.debug(f"   - object.object_type: {agent_version_doc['object']['object_type']}")
     else:
-        print(f"   ❌ ERROR: 'object' field is not a dict: {agent_version_doc['object']}")
+        logger.error(f"   ❌ ERROR: 'object' field is not a dict: {agent_version_doc['object']}")
     
     # Also save migration metadata (optional)
     migration_timestamp = int(time.time() * 1000)  # Milliseconds like in example
@@ -1277,455 +2128,1532 @@ def save_v2_agent_to_cosmos(v2_agent_data: Dict[str, Any], connection_string: st
     
     try:
         # Debug: Print document IDs and partition key values
-        print(f"🔍 Attempting to save documents:")
-        print(f"   - Agent Version ID: {agent_version_doc['id']}")
-        print(f"   - Migration ID: {migration_doc['id']}")
+        logger.debug("🔍 Attempting to save documents:")
+        logger.debug(f"   - Agent Version ID: {agent_version_doc['id']}")
+        logger.debug(f"   - Migration ID: {migration_doc['id']}")
         
         # Save documents one by one with error handling
-        print("   - Saving Agent Version (main document)...")
+        logger.debug("   - Saving Agent Version (main document)...")
         agent_version_result = container.upsert_item(agent_version_doc)
-        print("   ✅ Agent Version saved")
+        logger.debug("   ✅ Agent Version saved")
         
-        print("   - Saving Migration Metadata...")
+        logger.debug("   - Saving Migration Metadata...")
         migration_result = container.upsert_item(migration_doc)
-        print("   ✅ Migration Metadata saved")
+        logger.debug("   ✅ Migration Metadata saved")
         
-        print(f"✅ Successfully saved v2 agent '{v2_agent_data['v2_agent_object']['name']}' to Cosmos DB")
-        print(f"   - Agent Version: {agent_version_doc['id']}")
-        print(f"   - Migration Metadata: {migration_doc['id']}")
+        logger.debug(f"✅ Successfully saved v2 agent '{v2_agent_data['v2_agent_object']['name']}' to Cosmos DB")
+        logger.debug(f"   - Agent Version: {agent_version_doc['id']}")
+        logger.debug(f"   - Migration Metadata: {migration_doc['id']}")
         
         return {
             "agent_version": agent_version_result,
             "migration": migration_result
         }
     except Exception as e:
-        print(f"❌ Failed to save v2 agent to Cosmos DB: {e}")
-        print(f"❌ Error type: {type(e)}")
-        print(f"❌ Document that failed:")
-        print(f"   Agent Version Doc: {agent_version_doc}")
-        print(f"   Migration Doc: {migration_doc}")
+        logger.error(f"❌ Failed to save v2 agent to Cosmos DB: {e}")
+        logger.error(f"❌ Error type: {type(e)}")
+        logger.error("❌ Document that failed:")
+        logger.debug(f"   Agent Version Doc: {agent_version_doc}")
+        logger.debug(f"   Migration Doc: {migration_doc}")
         raise
 
-def process_v1_assistants_to_v2_agents(args=None, assistant_id: Optional[str] = None, cosmos_connection_string: Optional[str] = None, use_api: bool = False, project_endpoint: Optional[str] = None, project_connection_string: Optional[str] = None, project_subscription: Optional[str] = None, project_resource_group: Optional[str] = None, project_name: Optional[str] = None, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_tenant: Optional[str] = None, source_tenant: Optional[str] = None):
+# Migration journal (checkpoint / resume)
+DEFAULT_JOURNAL_PATH = os.getenv("MIGRATION_JOURNAL") or os.path.join("output", "migration_journal.jsonl")
+JOURNAL_STATUS_FETCHED = "fetched"
+JOURNAL_STATUS_CONVERTED = "converted"
+JOURNAL_STATUS_POSTED = "posted"
+JOURNAL_STATUS_FAILED = "failed"
+
+class MigrationJournal:
     """
-    Main processing function that reads v1 assistants from Cosmos DB, API, Project endpoint, or Project connection string,
-    converts them to v2 agents, and saves via v2 API.
+    Append-only JSONL journal of per-assistant migration progress, keyed by original_v1_id.
     
-    Args:
-        assistant_id: Optional specific assistant ID to migrate (if not provided, migrates all)
-        cosmos_connection_string: Optional Cosmos connection string (if not provided, uses environment variable)
-        use_api: If True, read v1 assistants from API instead of Cosmos DB
-        project_endpoint: Optional project endpoint for AIProjectClient (e.g., "https://...api/projects/p-3")
-        project_connection_string: Optional project connection string for AIProjectClient (e.g., "eastus.api.azureml.ms;...;...;...")
-        source_tenant: Optional source tenant ID for authentication when reading v1 assistants
+    Each line records one status transition (fetched -> converted -> posted, or failed) with any
+    extra fields such as the created v2 version id. On open, the existing journal is replayed so a
+    restarted run (--resume) can skip assistants that were already posted.
+    Writes are serialized with a lock and flushed per line, so the journal is safe to share across workers
+    and survives the process being killed mid-run.
     """
-    
-    # Handle package version management based on usage
-    need_beta_version = os.environ.get('NEED_BETA_VERSION') == 'true' or project_connection_string is not None
-    
-    if need_beta_version:
-        print("🔧 Project connection string detected - ensuring beta version is installed...")
-        if not ensure_project_connection_package():
-            print("❌ Failed to install required beta version")
-            sys.exit(1)
-    if project_connection_string:
-        print(f"🏢 Reading v1 assistants from Project Connection String")
-        if not PROJECT_CLIENT_AVAILABLE:
-            print("❌ Error: azure-ai-projects package is required for project connection string functionality")
-            print("Install with: pip install azure-ai-projects==1.0.0b10")
-            sys.exit(1)
-        
-        # Get assistants from Project Client using connection string
-        if assistant_id:
-            print(f"🎯 Fetching specific assistant from project connection: {assistant_id}")
-            try:
-                assistant_data = get_assistant_from_project_connection(project_connection_string, assistant_id)
-                v1_assistants = [assistant_data]
-            except Exception as e:
-                print(f"❌ Failed to fetch assistant {assistant_id} from project connection: {e}")
-                return
-        else:
-            print("📊 Fetching all assistants from project connection")
-            try:
-                v1_assistants = list_assistants_from_project_connection(project_connection_string)
-            except Exception as e:
-                print(f"❌ Failed to fetch assistants from project connection: {e}")
-                return
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._updated: Dict[str, int] = {}  # original_v1_id -> line number of its latest entry
+        self._lines = 0
+        self.resumed_count = 0
         
-        if not v1_assistants:
-            print("❌ No v1 assistants found from project connection")
-            return
-        
-        print(f"📊 Found {len(v1_assistants)} v1 assistant records from project connection")
-        
-    elif project_endpoint:
-        print(f"🏢 Reading v1 assistants from Project Endpoint: {project_endpoint}")
-        if not PROJECT_CLIENT_AVAILABLE:
-            print("❌ Error: azure-ai-projects package is required for project endpoint functionality")
-            print("Install with: pip install azure-ai-projects")
-            sys.exit(1)
-        
-        # Get assistants from Project Client
-        if assistant_id:
-            print(f"🎯 Fetching specific assistant from project: {assistant_id}")
-            try:
-                assistant_data = get_assistant_from_project(project_endpoint, assistant_id, project_subscription, project_resource_group, project_name)
-                v1_assistants = [assistant_data]
-            except Exception as e:
-                print(f"❌ Failed to fetch assistant {assistant_id} from project: {e}")
-                return
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A partially written last line from an interrupted run - ignore it
+                        continue
+                    v1_id = entry.get("original_v1_id")
+                    if v1_id:
+                        self._state.setdefault(v1_id, {}).update(entry)
+                        self._updated[v1_id] = self._lines
+                        self._lines += 1
         else:
-            print("📊 Fetching all assistants from project")
-            try:
-                v1_assistants = list_assistants_from_project(project_endpoint, project_subscription, project_resource_group, project_name)
-            except Exception as e:
-                print(f"❌ Failed to fetch assistants from project: {e}")
-                return
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
         
-        if not v1_assistants:
-            print("❌ No v1 assistants found from project")
-            return
-        
-        print(f"📊 Found {len(v1_assistants)} v1 assistant records from project")
-        
-    elif use_api:
-        print("🌐 Reading v1 assistants from API")
-        # Ensure we have API authentication
-        if not TOKEN and not set_api_token():
-            print("❌ Error: Unable to obtain API authentication token")
-            print("Set AZ_TOKEN env var or ensure az CLI is installed and logged in")
-            sys.exit(1)
-        
-        # Get assistants from API
-        if assistant_id:
-            print(f"🎯 Fetching specific assistant from API: {assistant_id}")
+        self._file = open(path, "a", encoding="utf-8")
+        if self._file.tell() > 0:
+            # Make sure new entries never get appended to a partially written last line
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self._file.write("\n")
+                    self._file.flush()
+
+    def record(self, original_v1_id: str, status: str, **fields) -> Dict[str, Any]:
+        """Append a status transition for an assistant and return its merged state."""
+        entry = {"original_v1_id": original_v1_id, "status": status, "timestamp": int(time.time() * 1000)}
+        entry.update({k: v for k, v in fields.items() if v is not None})
+        line = json.dumps(entry, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+            state = self._state.setdefault(original_v1_id, {})
+            state.update(entry)
+            self._updated[original_v1_id] = self._lines
+            self._lines += 1
+            return dict(state)
+
+    def get(self, original_v1_id: str) -> Optional[Dict[str, Any]]:
+        """Return the latest merged state for an assistant, or None if it has never been seen."""
+        with self._lock:
+            state = self._state.get(original_v1_id)
+            return dict(state) if state else None
+
+    def is_completed(self, original_v1_id: str, target: str = "") -> bool:
+        """True if the assistant was already posted to the v2 target `target` (see get_target_key) in this or a previous run."""
+        state = self.get(original_v1_id)
+        return bool(state) and state.get("status") == JOURNAL_STATUS_POSTED and state.get("target") == target
+
+    def states(self) -> List[Dict[str, Any]]:
+        """Return a snapshot of the latest merged state of every assistant in the journal."""
+        with self._lock:
+            return [dict(state) for state in self._state.values()]
+    
+    def posted_states(self, target: str) -> List[Dict[str, Any]]:
+        """Return the latest state of every assistant posted to `target`, in journal order (most recent post last)."""
+        with self._lock:
+            posted = [v1_id for v1_id, state in self._state.items() if state.get("status") == JOURNAL_STATUS_POSTED and state.get("target") == target]
+            posted.sort(key=self._updated.__getitem__)
+            return [dict(self._state[v1_id]) for v1_id in posted]
+    
+    def mark_resumed(self):
+        """Count an assistant skipped because it was completed in a previous run."""
+        with self._lock:
+            self.resumed_count += 1
+
+    def summary(self) -> Dict[str, int]:
+        """Return the number of assistants in each status."""
+        counts: Dict[str, int] = {}
+        with self._lock:
+            for state in self._state.values():
+                status = state.get("status", "unknown")
+                counts[status] = counts.get(status, 0) + 1
+        return counts
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+# Offline dry-run output (--dry-run)
+DEFAULT_DRY_RUN_OUTPUT = os.path.join("output", "v2_payloads.jsonl")
+
+def iter_assistants_from_jsonl(path: str) -> Iterable[Dict[str, Any]]:
+    """
+    Stream v1 assistants from a JSONL export file (one assistant JSON object per line).
+    Lines holding a Cosmos-style document ({"object_type": "v1_assistant", "data": {...}}) are unwrapped.
+    Malformed lines are reported and skipped.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line:
+                continue
             try:
-                assistant_data = get_assistant_from_api(assistant_id)
-                v1_assistants = [assistant_data]
-            except Exception as e:
-                print(f"❌ Failed to fetch assistant {assistant_id} from API: {e}")
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                logger.warning(f"⚠️  Skipping malformed JSON on line {line_number} of {path}: {e}")
+                continue
+            if isinstance(record, dict) and isinstance(record.get("data"), dict) and "object_type" in record:
+                record = record["data"]
+            if not isinstance(record, dict):
+                logger.warning(f"⚠️  Skipping line {line_number} of {path}: expected a JSON object, got {type(record).__name__}")
+                continue
+            yield record
+
+class PayloadWriter:
+    """
+    Thread-safe JSONL sink for prepared v2 API payloads, used instead of POSTing in --dry-run mode.
+    Each line holds the original v1 id, the target agent name and the exact payload that would be sent.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+
+    def write(self, original_v1_id: Optional[str], agent_name: str, payload: Dict[str, Any]):
+        line = json.dumps({"original_v1_id": original_v1_id, "agent_name": agent_name, "payload": payload}, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+def prepare_agent_version(v1_assistant: Dict[str, Any], args=None) -> Dict[str, Any]:
+    """
+    Convert stage: clean up a v1 assistant, add any requested test tools, convert it to a v2 agent
+    and prepare the v2 API payload, tagged with its content hash.
+    
+    Args:
+        v1_assistant: The v1 assistant record
+        args: Parsed command line arguments (used for test tool injection)
+    
+    Returns:
+        {"agent_name": ..., "api_payload": ..., "content_hash": ...}
+    """
+    # Clean up None values
+    v1_assistant = {k: v for k, v in v1_assistant.items() if v is not None}
+    
+    # Helper function to ensure tools array exists and is properly formatted
+    def ensure_tools_array():
+        if "tools" not in v1_assistant:
+            v1_assistant["tools"] = []
+        elif isinstance(v1_assistant["tools"], str):
+            # Handle string-encoded tools
+            try:
+                v1_assistant["tools"] = json.loads(v1_assistant["tools"])
+            except:
+                v1_assistant["tools"] = []
+        
+        # Ensure tools is a list
+        if not isinstance(v1_assistant["tools"], list):
+            v1_assistant["tools"] = []
+    
+    # Add test tools if requested
+    if args:
+        # Add test function tool
+        if hasattr(args, 'add_test_function') and args.add_test_function:
+            logger.info("🧪 Adding test function tool for testing...")
+            test_function_tool = {
+                "type": "function",
+                "function": {
+                    "name": "get_current_temperature",
+                    "description": "Get the current temperature for a specific location",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "location": {
+                                "type": "string",
+                                "description": "The city and state, e.g., San Francisco, CA"
+                            },
+                            "unit": {
+                                "type": "string",
+                                "enum": ["Celsius", "Fahrenheit"],
+                                "description": "The temperature unit to use. Infer this from the user's location."
+                            }
+                        },
+                        "required": ["location", "unit"]
+                    }
+                }
+            }
+            ensure_tools_array()
+            v1_assistant["tools"].append(test_function_tool)
+            logger.info(f"   ✅ Added test function tool: {test_function_tool['function']['name']}")
+        
+        # Add test MCP tool
+        if hasattr(args, 'add_test_mcp') and args.add_test_mcp:
+            logger.info("🧪 Adding test MCP tool for testing...")
+            test_mcp_tool = {
+                "type": "mcp",
+                "server_label": "dmcp",
+                "server_description": "A Dungeons and Dragons MCP server to assist with dice rolling.",
+                "server_url": "https://dmcp-server.deno.dev/sse",
+                "require_approval": "never",
+            }
+            ensure_tools_array()
+            v1_assistant["tools"].append(test_mcp_tool)
+            logger.info(f"   ✅ Added test MCP tool: {test_mcp_tool['server_label']}")
+        
+        # Add test image generation tool
+        if hasattr(args, 'add_test_imagegen') and args.add_test_imagegen:
+            logger.info("🧪 Adding test image generation tool for testing...")
+            test_imagegen_tool = {
+                "type": "image_generation"
+            }
+            ensure_tools_array()
+            v1_assistant["tools"].append(test_imagegen_tool)
+            logger.info("   ✅ Added test image generation tool")
+        
+        # Add test computer use tool
+        if hasattr(args, 'add_test_computer') and args.add_test_computer:
+            logger.info("🧪 Adding test computer use tool for testing...")
+            test_computer_tool = {
+                "type": "computer_use_preview",
+                "display_width": 1024,
+                "display_height": 768,
+                "environment": "browser"  # other possible values: "mac", "windows", "ubuntu"
+            }
+            ensure_tools_array()
+            v1_assistant["tools"].append(test_computer_tool)
+            logger.info(f"   ✅ Added test computer use tool: {test_computer_tool['environment']} environment")
+        
+        # Add test Azure Function tool
+        if hasattr(args, 'add_test_azurefunction') and args.add_test_azurefunction:
+            logger.info("🧪 Adding test Azure Function tool for testing...")
+            # Using your local Azurite instance
+            storage_service_endpoint = "https://127.0.0.1:8001"
+            test_azurefunction_tool = {
+                "type": "azure_function",
+                "name": "foo",
+                "description": "Get answers from the foo bot.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "query": {
+                            "type": "string", 
+                            "description": "The question to ask."
+                        },
+                        "outputqueueuri": {
+                            "type": "string", 
+                            "description": "The full output queue URI."
+                        }
+                    },
+                    "required": ["query"]
+                },
+                "input_queue": {
+                    "queue_name": "azure-function-foo-input",
+                    "storage_service_endpoint": storage_service_endpoint
+                },
+                "output_queue": {
+                    "queue_name": "azure-function-foo-output", 
+                    "storage_service_endpoint": storage_service_endpoint
+                }
+            }
+            ensure_tools_array()
+            v1_assistant["tools"].append(test_azurefunction_tool)
+            logger.info(f"   ✅ Added test Azure Function tool: {test_azurefunction_tool['name']} (using Azurite at {storage_service_endpoint})")
+    
+    # Pretty print the full v1 object for inspection
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("\n📋 Full v1 Assistant Object:\n%s\n%s\n%s", "=" * 60, pprint.pformat(v1_assistant, indent=2, width=80), "=" * 60)
+    
+    assistant_id = v1_assistant.get('id', 'unknown')
+    
+    logger.debug(f"   Assistant ID: {assistant_id}")
+    logger.debug(f"   Assistant Name: {v1_assistant.get('name', 'N/A')}")
+    logger.debug(f"   Assistant Model: {v1_assistant.get('model', 'N/A')}")
+    
+    # Preview the detected agent kind
+    detected_kind = determine_agent_kind(v1_assistant)
+    logger.debug(f"   🔍 Detected Agent Kind: {detected_kind}")
+    
+    # Convert v1 to v2
+    convert_start = time.perf_counter()
+    v2_agent = v1_assistant_to_v2_agent(v1_assistant)
+    
+    # Save the v2 agent via v2 API
+    logger.debug("🌐 Saving via v2 API...")
+    # Extract agent name (without version) for the API endpoint
+    agent_name = v2_agent['v2_agent_object']['name']
+    
+    # Prepare the payload for v2 API, tagged with a hash of its content so unchanged agents aren't re-posted
+    api_payload = prepare_v2_api_payload(v2_agent)
+    content_hash = compute_payload_hash(api_payload)
+    api_payload.setdefault("metadata", {})[CONTENT_HASH_METADATA_KEY] = content_hash
+    METRICS.observe("convert", time.perf_counter() - convert_start)
+    
+    return {"agent_name": agent_name, "api_payload": api_payload, "content_hash": content_hash}
+
+def upload_agent_version(agent_name: str, api_payload: Dict[str, Any], content_hash: str, args=None, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_tenant: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Upload stage: create the agent version via the v2 API, unless the agent's latest version already
+    carries the same content hash (and --force-new-version isn't set).
+    
+    Returns:
+        {"v2_id": ..., "v2_version": ..., "unchanged": bool}, or None if no production token is available
+    """
+    # Create the agent version via v2 API
+    # Production token is provided via environment variable
+    production_token = get_production_token(production_tenant) if production_resource else None
+    if production_resource and not production_token:
+        logger.error(f"❌ Production resource specified but no production token available for tenant {production_tenant or PRODUCTION_TENANT} (PRODUCTION_TOKEN environment variable or az CLI login). Skipping v2 API save.")
+        logger.info("💡 Use run-migration-docker-auth.ps1 for automatic dual-token authentication")
+        return None
+    
+    if not getattr(args, 'force_new_version', False):
+        with METRICS.timed("lookup"):
+            unchanged = find_unchanged_agent_version(agent_name, content_hash, production_resource, production_subscription, production_token)
+        if unchanged:
+            METRICS.increment("skipped_unchanged")
+            logger.info(f"⏭️  '{agent_name}' is unchanged since version {unchanged.get('v2_id') or unchanged.get('v2_version') or 'N/A'}, not creating a new version")
+            return {"v2_id": unchanged.get('v2_id'), "v2_version": unchanged.get('v2_version'), "unchanged": True}
+    
+    limiter = get_adaptive_limiter(get_target_key(production_resource, production_subscription))
+    with (limiter.slot() if limiter else contextlib.nullcontext()):
+        with METRICS.timed("post"):
+            api_result = create_agent_version_via_api(agent_name, api_payload, production_resource, production_subscription, production_token)
+    logger.info(f"✅ Agent version created via v2 API: {api_result.get('id', 'N/A')}")
+    KNOWN_CONTENT_HASHES.put(agent_name, content_hash, api_result.get('id'), api_result.get('version'), target=get_target_key(production_resource, production_subscription))
+    return {"v2_id": api_result.get('id'), "v2_version": api_result.get('version'), "unchanged": False}
+
+def journal_upload_result(journal: Optional[MigrationJournal], original_v1_id: Optional[str], agent_name: str, content_hash: str, result: Optional[Dict[str, Any]], target: str = "") -> bool:
+    """
+    Record the outcome of upload_agent_version in the journal, with the v2 target (see get_target_key) it was posted to.
+    Returns True if the record counts as migrated.
+    """
+    if result is None:
+        if journal and original_v1_id:
+            journal.record(original_v1_id, JOURNAL_STATUS_FAILED, error="No PRODUCTION_TOKEN available")
+        return False
+    if journal and original_v1_id:
+        journal.record(original_v1_id, JOURNAL_STATUS_POSTED, agent_name=agent_name, v2_id=result["v2_id"], v2_version=result["v2_version"], content_hash=content_hash, unchanged=result["unchanged"] or None, target=target)
+    return True
+
+def migrate_v1_assistant(v1_assistant: Dict[str, Any], record_label: str, source_label: str, args=None, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, journal: Optional[MigrationJournal] = None, resume: bool = False, payload_writer: Optional[PayloadWriter] = None, production_tenant: Optional[str] = None) -> bool:
+    """
+    Run the per-assistant migration pipeline: v1_assistant_to_v2_agent -> prepare_v2_api_payload -> create_agent_version_via_api.
+    Used by the thread engine; the pipeline engine runs the same stages from run_migration_pipeline.
+    
+    Args:
+        v1_assistant: The v1 assistant record
+        record_label: Human readable position of the record (e.g., "3/120")
+        source_label: Human readable name of the source the record was read from
+        args: Parsed command line arguments (used for test tool injection)
+        production_resource: Optional production resource name
+        production_subscription: Optional production subscription ID
+        journal: Optional journal recording fetched/converted/posted progress
+        resume: If True, skip assistants the journal already marks as posted
+        payload_writer: If provided (dry run), write the prepared payload to it instead of POSTing
+        production_tenant: Optional production tenant ID (defaults to PRODUCTION_TENANT)
+    
+    Returns:
+        True if the agent version was created (or already existed on resume), False if the record was skipped
+    """
+    original_v1_id = v1_assistant.get('id')
+    if skip_already_migrated(v1_assistant, record_label, source_label, journal, resume, get_target_key(production_resource, production_subscription)):
+        return True
+    if journal and original_v1_id:
+        journal.record(original_v1_id, JOURNAL_STATUS_FETCHED, source=source_label)
+    
+    prepared = prepare_agent_version(v1_assistant, args)
+    agent_name = prepared["agent_name"]
+    if journal and original_v1_id:
+        journal.record(original_v1_id, JOURNAL_STATUS_CONVERTED, agent_name=agent_name)
+    
+    if payload_writer:
+        # Dry run: record what would be sent instead of calling the v2 API
+        payload_writer.write(original_v1_id, agent_name, prepared["api_payload"])
+        logger.info(f"📝 Dry run: payload for '{agent_name}' written to {payload_writer.path}")
+        return True
+    
+    result = upload_agent_version(agent_name, prepared["api_payload"], prepared["content_hash"], args, production_resource, production_subscription, production_tenant)
+    return journal_upload_result(journal, original_v1_id, agent_name, prepared["content_hash"], result, get_target_key(production_resource, production_subscription))
+
+def skip_already_migrated(v1_assistant: Dict[str, Any], record_label: str, source_label: str, journal: Optional[MigrationJournal] = None, resume: bool = False, target: str = "") -> bool:
+    """Log the start of a record; True if --resume should skip it because the journal marks it as posted to `target`."""
+    logger.info(f"\n🔄 Processing record {record_label}")
+    logger.info(f"   ✅ Processing {source_label} data for assistant: {v1_assistant.get('id', 'unknown')}")
+    original_v1_id = v1_assistant.get('id')
+    if journal and original_v1_id and resume and journal.is_completed(original_v1_id, target):
+        previous = journal.get(original_v1_id)
+        logger.info(f"   ⏭️  Already migrated in a previous run (v2 version: {previous.get('v2_id', 'N/A')}), skipping")
+        journal.mark_resumed()
+        return True
+    return False
+
+def report_record_error(idx: int, v1_assistant: Dict[str, Any], error: Exception) -> str:
+    """Log why a record failed (call from the except block, for the traceback) and return a short description for the journal."""
+    if isinstance(error, KeyError):
+        logger.error(f"❌ KeyError processing record {idx + 1}: {error}")
+        logger.info(f"   Assistant data keys: {list(v1_assistant.keys()) if isinstance(v1_assistant, dict) else 'N/A'}")
+        return f"KeyError: {error}"
+    if isinstance(error, json.JSONDecodeError):
+        logger.error(f"❌ JSON decode error processing record {idx + 1}: {error}")
+        return f"JSONDecodeError: {error}"
+    logger.error(f"❌ Error processing record {idx + 1}: {error}")
+    logger.info(f"   Error type: {type(error)}")
+    logger.debug("Traceback:", exc_info=True)
+    return f"{type(error).__name__}: {error}"
+
+def migrate_v1_assistant_isolated(idx: int, total: Optional[int], v1_assistant: Dict[str, Any], source_label: str, **options) -> bool:
+    """
+    Migrate a single assistant, isolating any failure to this record so the rest of the run continues.
+    `options` are passed through to migrate_v1_assistant.
+    Returns True if the record was migrated, False otherwise.
+    """
+    journal = options.get("journal")
+    try:
+        record_label = f"{idx + 1}/{total}" if total is not None else f"{idx + 1}"
+        return migrate_v1_assistant(v1_assistant, record_label, source_label, **options)
+    except Exception as e:
+        error = report_record_error(idx, v1_assistant, e)
+    
+    if journal and isinstance(v1_assistant, dict) and v1_assistant.get('id'):
+        journal.record(v1_assistant['id'], JOURNAL_STATUS_FAILED, error=error[:1000])
+    return False
+
+def stream_with_error_report(records: Iterable[Dict[str, Any]], failure_message: str) -> Iterable[Dict[str, Any]]:
+    """
+    Pass records through from a streaming source, reporting a fetch failure instead of raising it.
+    Records yielded before the failure are still migrated.
+    """
+    try:
+        yield from records
+    except Exception as e:
+        logger.error(f"{failure_message}: {e}")
+
+def run_with_bounded_concurrency(items: Iterable[Any], worker: Callable[[int, Any], bool], concurrency: int = DEFAULT_CONCURRENCY) -> tuple:
+    """
+    Run `worker(idx, item)` for every item using at most `concurrency` threads.
+    Items are pulled lazily from the iterable and only a bounded number of them are in flight at once,
+    so memory stays flat for large inputs. The worker is expected to handle its own errors.
+    
+    Returns:
+        (succeeded, seen) - the number of items for which the worker returned True, and the number of items read
+    """
+    succeeded = 0
+    seen = 0
+    if concurrency <= 1:
+        # Serial path - same ordering and output as a plain loop
+        for idx, item in enumerate(items):
+            seen += 1
+            if worker(idx, item):
+                succeeded += 1
+        return succeeded, seen
+    
+    max_in_flight = concurrency * 2
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="migration") as executor:
+        in_flight = set()
+        for idx, item in enumerate(items):
+            seen += 1
+            in_flight.add(executor.submit(worker, idx, item))
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                succeeded += sum(1 for future in done if future.result())
+        for future in in_flight:
+            if future.result():
+                succeeded += 1
+    return succeeded, seen
+
+# Pipeline engine (--engine pipeline): reader -> converter -> uploaders -> journal writer over bounded queues
+DEFAULT_ENGINE = "pipeline"
+ENGINES = ["pipeline", "threads"]
+DEFAULT_PIPELINE_QUEUE_SIZE = 100  # Records buffered between two pipeline stages
+_PIPELINE_END = object()  # Sentinel closing a pipeline queue
+
+def run_migration_pipeline(records: Iterable[Dict[str, Any]], total: Optional[int], source_label: str, concurrency: int = DEFAULT_CONCURRENCY, queue_size: int = DEFAULT_PIPELINE_QUEUE_SIZE, on_result: Optional[Callable[[bool], None]] = None, record_slot: Optional[Callable[[], Any]] = None, **options) -> tuple:
+    """
+    Migrate records through an asyncio pipeline whose stages run at their own rate:
+    one reader pulling from the source, one converter, `concurrency` uploaders and one journal writer.
+    Queues between stages hold at most `queue_size` records, so a throttled v2 API slows the reader down
+    instead of buffering the whole source in memory, and wall time tends to the slowest stage instead of
+    the sum of all stages. Blocking calls (source pages, conversion, v2 API requests) run in a dedicated thread pool.
+    
+    Args:
+        records: Source records (list or stream)
+        total: Number of records if known up front (for "3/120" labels)
+        source_label: Human readable name of the source
+        concurrency: Number of uploaders, i.e. v2 API requests in flight
+        queue_size: Capacity of each queue between stages
+        on_result: Called with True/False for every finished record (metrics, progress)
+        record_slot: Optional factory of a context manager held around each upload (manifest mode limits)
+        options: args, production_resource, production_subscription, production_tenant, journal, resume, payload_writer
+    
+    Returns:
+        (succeeded, seen) like run_with_bounded_concurrency
+    """
+    return asyncio.run(_run_migration_pipeline(records, total, source_label, concurrency, queue_size, on_result, record_slot, options))
+
+async def _run_migration_pipeline(records, total, source_label, concurrency, queue_size, on_result, record_slot, options) -> tuple:
+    loop = asyncio.get_running_loop()
+    args = options.get("args")
+    journal = options.get("journal")
+    payload_writer = options.get("payload_writer")
+    target = get_target_key(options.get("production_resource"), options.get("production_subscription"))
+    to_convert: asyncio.Queue = asyncio.Queue(queue_size)
+    to_upload: asyncio.Queue = asyncio.Queue(queue_size)
+    to_journal: asyncio.Queue = asyncio.Queue(queue_size)
+    counts = {"seen": 0, "succeeded": 0}
+    # One thread for the reader, one for the converter and one per uploader
+    executor = ThreadPoolExecutor(max_workers=concurrency + 2, thread_name_prefix="pipeline")
+    
+    async def emit(v1_assistant: Dict[str, Any], status: Optional[str] = None, outcome: Optional[bool] = None, **fields):
+        await to_journal.put((v1_assistant.get('id') if isinstance(v1_assistant, dict) else None, status, fields, outcome))
+    
+    async def fail(idx: int, v1_assistant: Dict[str, Any], error: Exception):
+        message = report_record_error(idx, v1_assistant, error)
+        await emit(v1_assistant, JOURNAL_STATUS_FAILED, False, error=message[:1000])
+    
+    async def read():
+        iterator = iter(records)
+        try:
+            while True:
+                v1_assistant = await loop.run_in_executor(executor, next, iterator, _PIPELINE_END)
+                if v1_assistant is _PIPELINE_END:
+                    break
+                idx = counts["seen"]
+                counts["seen"] += 1
+                record_label = f"{idx + 1}/{total}" if total is not None else f"{idx + 1}"
+                if skip_already_migrated(v1_assistant, record_label, source_label, journal, options.get("resume", False), target):
+                    await emit(v1_assistant, outcome=True)
+                    continue
+                await emit(v1_assistant, JOURNAL_STATUS_FETCHED, source=source_label)
+                await to_convert.put((idx, v1_assistant))
+        except Exception as e:
+            logger.error(f"❌ Failed to read v1 assistants from {source_label}: {e}")
+        finally:
+            await to_convert.put(_PIPELINE_END)
+    
+    async def convert():
+        try:
+            while True:
+                entry = await to_convert.get()
+                if entry is _PIPELINE_END:
+                    break
+                idx, v1_assistant = entry
+                try:
+                    # CPU-bound: run it off the event loop so reading and uploading don't stall behind it
+                    prepared = await loop.run_in_executor(executor, prepare_agent_version, v1_assistant, args)
+                except Exception as e:
+                    await fail(idx, v1_assistant, e)
+                    continue
+                await emit(v1_assistant, JOURNAL_STATUS_CONVERTED, agent_name=prepared["agent_name"])
+                await to_upload.put((idx, v1_assistant, prepared))
+        finally:
+            for _ in range(concurrency):
+                await to_upload.put(_PIPELINE_END)
+    
+    def upload_blocking(prepared: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        with (record_slot() if record_slot else contextlib.nullcontext()):
+            return upload_agent_version(
+                prepared["agent_name"], prepared["api_payload"], prepared["content_hash"], args,
+                options.get("production_resource"), options.get("production_subscription"), options.get("production_tenant")
+            )
+    
+    async def upload():
+        while True:
+            entry = await to_upload.get()
+            if entry is _PIPELINE_END:
                 return
-        else:
-            print("📊 Fetching all assistants from API")
+            idx, v1_assistant, prepared = entry
+            agent_name = prepared["agent_name"]
+            if payload_writer:
+                # Dry run: record what would be sent instead of calling the v2 API
+                payload_writer.write(v1_assistant.get('id'), agent_name, prepared["api_payload"])
+                logger.info(f"📝 Dry run: payload for '{agent_name}' written to {payload_writer.path}")
+                await emit(v1_assistant, outcome=True)
+                continue
             try:
-                v1_assistants = list_assistants_from_api()
+                result = await loop.run_in_executor(executor, upload_blocking, prepared)
             except Exception as e:
-                print(f"❌ Failed to fetch assistants from API: {e}")
+                await fail(idx, v1_assistant, e)
+                continue
+            if result is None:
+                await emit(v1_assistant, JOURNAL_STATUS_FAILED, False, error="No PRODUCTION_TOKEN available")
+            else:
+                await emit(v1_assistant, JOURNAL_STATUS_POSTED, True, agent_name=agent_name, v2_id=result["v2_id"], v2_version=result["v2_version"], content_hash=prepared["content_hash"], unchanged=result["unchanged"] or None, target=target)
+    
+    async def write_journal():
+        # Single writer: journal lines and outcome callbacks never race
+        while True:
+            event = await to_journal.get()
+            if event is _PIPELINE_END:
                 return
+            v1_id, status, fields, outcome = event
+            if journal and v1_id and status:
+                journal.record(v1_id, status, **fields)
+            if outcome is not None:
+                if outcome:
+                    counts["succeeded"] += 1
+                if on_result:
+                    on_result(outcome)
+    
+    journal_writer = asyncio.create_task(write_journal())
+    try:
+        await asyncio.gather(read(), convert(), *(upload() for _ in range(concurrency)))
+    finally:
+        await to_journal.put(_PIPELINE_END)
+        await journal_writer
+        executor.shutdown(wait=False)
+    return counts["succeeded"], counts["seen"]
+
+# Post-migration verification (--verify): fetch what landed in v2 and diff it against freshly prepared payloads
+DEFAULT_VERIFY_REPORT = os.path.join("output", "verification_report.jsonl")
+DEFAULT_VERIFY_CONCURRENCY = 16  # Agent versions fetched in parallel while verifying
+VERIFY_IGNORED_METADATA = {"migration_timestamp"}  # Set per run, so it never matches a fresh payload
+MAX_REPORTED_DIFFERENCES = 20  # Per agent, so one badly broken agent doesn't flood the report
+VERIFY_MATCH = "match"
+VERIFY_MISMATCH = "mismatch"
+VERIFY_MISSING = "missing"
+VERIFY_ERROR = "error"
+
+def get_agent_version(agent_name: str, version: str, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_token: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Fetch one version of a v2 agent.
+    
+    Returns:
+        The agent version object, or None if it doesn't exist
+    """
+    agent_name = agent_name.lower()
+    url = f"{get_v2_agents_base_url(production_resource, production_subscription)}/agents/{agent_name}/versions/{version}"
+    params = {"api-version": API_VERSION}
+    production_token = production_token or (get_production_token() if production_resource else None)
+    if production_resource and production_token:
+        response = do_api_request_with_token("GET", url, production_token, params=params, expected_statuses=(404,))
+    else:
+        response = do_api_request("GET", url, params=params, expected_statuses=(404,))
+    if response.status_code == 404:
+        return None
+    return response.json()
+
+def normalize_for_verify(value: Any) -> Any:
+    """Drop None values recursively, so an omitted field and an explicit null compare equal."""
+    if isinstance(value, dict):
+        return {k: normalize_for_verify(v) for k, v in value.items() if v is not None}
+    if isinstance(value, list):
+        return [normalize_for_verify(v) for v in value]
+    return value
+
+def verification_view(agent_version: Dict[str, Any]) -> Dict[str, Any]:
+    """The compared part of a payload or fetched agent version: description, definition and metadata (minus per-run fields)."""
+    view = json.loads(json.dumps({k: agent_version.get(k) for k in ("description", "definition", "metadata")}, default=str))
+    view["metadata"] = {k: v for k, v in (view.get("metadata") or {}).items() if k not in VERIFY_IGNORED_METADATA}
+    return normalize_for_verify(view)
+
+def diff_expected(expected: Any, actual: Any, path: str, differences: List[str]):
+    """
+    Append a description of every place where `actual` doesn't match `expected` to `differences`.
+    Keys only present in `actual` (defaults filled in by the service) are not differences.
+    """
+    if len(differences) >= MAX_REPORTED_DIFFERENCES:
+        return
+    if isinstance(expected, dict):
+        if not isinstance(actual, dict):
+            differences.append(f"{path}: expected an object, got {type(actual).__name__}")
+            return
+        for key, value in expected.items():
+            child = f"{path}.{key}" if path else key
+            if key not in actual:
+                differences.append(f"{child}: missing")
+            else:
+                diff_expected(value, actual[key], child, differences)
+    elif isinstance(expected, list):
+        if not isinstance(actual, list) or len(actual) != len(expected):
+            found = f"{len(actual)} item(s)" if isinstance(actual, list) else type(actual).__name__
+            differences.append(f"{path}: expected {len(expected)} item(s), got {found}")
+            return
+        for i, (expected_item, actual_item) in enumerate(zip(expected, actual)):
+            diff_expected(expected_item, actual_item, f"{path}[{i}]", differences)
+    elif expected != actual:
+        differences.append(f"{path}: expected {json.dumps(expected, default=str)[:200]}, got {json.dumps(actual, default=str)[:200]}")
+
+def check_v1_tools_carried_over(v1_assistant: Dict[str, Any], definition: Dict[str, Any]) -> List[str]:
+    """
+    Check the v2 definition against the original v1 assistant: every supported v1 tool has a v2 tool of the
+    same type, and the vector stores and files from its tool_resources were moved into that tool.
+    
+    Returns:
+        One message per problem found
+    """
+    v1_tools = parse_json_field(v1_assistant.get("tools") or [], list, "tools") or []
+    v1_tool_resources = parse_json_field(v1_assistant.get("tool_resources") or {}, dict, "tool_resources") or {}
+    v1_types = set()
+    for tool in v1_tools:
+        if isinstance(tool, str):
+            tool = parse_json_field(tool, dict, "tool")
+        if isinstance(tool, dict) and tool.get("type") not in UNSUPPORTED_TOOL_WARNINGS:
+            v1_types.add(tool.get("type"))
+    
+    v2_tools = [tool for tool in (definition.get("tools") or []) if isinstance(tool, dict)]
+    problems = [f"v1 tool '{tool_type}' is missing from the v2 definition" for tool_type in sorted(v1_types - {tool.get("type") for tool in v2_tools}, key=str)]
+    
+    # (tool type, tool_resources key, where the v2 tool carries the ids)
+    resource_locations = [
+        ("file_search", "vector_store_ids", lambda tool: tool.get("vector_store_ids")),
+        ("code_interpreter", "file_ids", lambda tool: tool.get("container", {}).get("file_ids") if isinstance(tool.get("container"), dict) else None),
+    ]
+    for tool_type, resource_key, carried_ids in resource_locations:
+        resources = v1_tool_resources.get(tool_type)
+        if tool_type not in v1_types or not isinstance(resources, dict):
+            continue
+        carried = {resource_id for tool in v2_tools if tool.get("type") == tool_type for resource_id in (carried_ids(tool) or [])}
+        missing = [resource_id for resource_id in resources.get(resource_key) or [] if resource_id not in carried]
+        if missing:
+            problems.append(f"tool_resources.{tool_type}.{resource_key}: {len(missing)} id(s) not in the v2 {tool_type} tool (e.g. {missing[0]})")
+    return problems
+
+def verify_v1_assistant(v1_assistant: Dict[str, Any], args=None, journal: Optional[MigrationJournal] = None, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_tenant: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Verify one migrated assistant: prepare its v2 payload again, fetch the agent version the journal recorded
+    for it (or the agent's latest version if the journal doesn't know it) and diff the two.
+    
+    Returns:
+        {"original_v1_id", "agent_name", "v2_version", "status", "differences"} with status
+        "match", "mismatch" or "missing"
+    """
+    original_v1_id = v1_assistant.get("id")
+    prepared = prepare_agent_version(v1_assistant, args)
+    state = journal.get(original_v1_id) if journal and original_v1_id else None
+    posted = bool(journal) and bool(original_v1_id) and journal.is_completed(original_v1_id, get_target_key(production_resource, production_subscription))
+    agent_name = (state or {}).get("agent_name") or prepared["agent_name"]
+    result = {"original_v1_id": original_v1_id, "agent_name": agent_name, "v2_version": state.get("v2_version") if posted else None}
+    
+    production_token = get_production_token(production_tenant) if production_resource else None
+    with METRICS.timed("lookup"):
+        if result["v2_version"]:
+            actual = get_agent_version(agent_name, result["v2_version"], production_resource, production_subscription, production_token)
+        else:
+            actual = get_latest_agent_version(agent_name, production_resource, production_subscription, production_token)
+    if actual is None:
+        where = f"version {result['v2_version']}" if result["v2_version"] else "no version"
+        return dict(result, status=VERIFY_MISSING, differences=[f"{where} of agent '{agent_name}' found in v2"])
+    
+    result["v2_version"] = actual.get("version") or result["v2_version"]
+    differences: List[str] = []
+    diff_expected(verification_view(prepared["api_payload"]), verification_view(actual), "", differences)
+    differences.extend(check_v1_tools_carried_over(v1_assistant, actual.get("definition") or {}))
+    return dict(result, status=VERIFY_MISMATCH if differences else VERIFY_MATCH, differences=differences[:MAX_REPORTED_DIFFERENCES] or None)
+
+class VerificationReport:
+    """
+    Thread-safe JSONL sink for verification results. Only agents that need attention (anything but a match)
+    are written, so the report stays small for large runs; every result is counted.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.counts = {status: 0 for status in (VERIFY_MATCH, VERIFY_MISMATCH, VERIFY_MISSING, VERIFY_ERROR)}
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+    
+    def write(self, result: Dict[str, Any]):
+        line = json.dumps({k: v for k, v in result.items() if v is not None}, default=str) if result["status"] != VERIFY_MATCH else None
+        with self._lock:
+            self.counts[result["status"]] += 1
+            if line:
+                self._file.write(line + "\n")
+                self._file.flush()
+    
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+def verify_migrated_assistants(v1_assistants: Iterable[Dict[str, Any]], report: VerificationReport, concurrency: int = DEFAULT_VERIFY_CONCURRENCY, on_result: Optional[Callable[[bool], None]] = None, **options) -> tuple:
+    """
+    Stream v1 assistants through verify_v1_assistant with `concurrency` parallel workers, writing every
+    result to `report`. `options` are passed through to verify_v1_assistant.
+    
+    Returns:
+        (matched, seen) like run_with_bounded_concurrency
+    """
+    def verify_record(idx: int, v1_assistant: Dict[str, Any]) -> bool:
+        try:
+            result = verify_v1_assistant(v1_assistant, **options)
+        except Exception as e:
+            error = report_record_error(idx, v1_assistant, e)
+            result = {"original_v1_id": v1_assistant.get("id") if isinstance(v1_assistant, dict) else None, "status": VERIFY_ERROR, "differences": [error[:1000]]}
+        report.write(result)
+        if result["status"] == VERIFY_MATCH:
+            logger.info(f"✅ '{result['agent_name']}' (version {result['v2_version']}) matches {result['original_v1_id']}")
+        elif result["status"] != VERIFY_ERROR:
+            logger.warning(f"❗ '{result['agent_name']}' ({result['original_v1_id']}): {result['status']} - {result['differences'][0]}")
+        matched = result["status"] == VERIFY_MATCH
+        if on_result:
+            on_result(matched)
+        return matched
+    
+    return run_with_bounded_concurrency(v1_assistants, verify_record, concurrency)
+
+class ProgressReporter:
+    """
+    Compact progress output for large runs: one throttled status line on stderr instead of per-record logs.
+    Safe to call from multiple worker threads.
+    """
+    
+    def __init__(self, interval: float = 1.0, stream=None):
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.processed = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.started = time.monotonic()
+        self._last_report = 0.0
+        self._lock = threading.Lock()
+    
+    def update(self, success: bool):
+        """
+        Count one finished record and refresh the status line if `interval` seconds have passed.
+        """
+        with self._lock:
+            self.processed += 1
+            if success:
+                self.succeeded += 1
+            else:
+                self.failed += 1
+            now = time.monotonic()
+            if now - self._last_report >= self.interval:
+                self._last_report = now
+                self.stream.write("\r" + self._format(now))
+                self.stream.flush()
+    
+    def finish(self):
+        """
+        Print the final status line.
+        """
+        with self._lock:
+            self.stream.write("\r" + self._format(time.monotonic()) + "\n")
+            self.stream.flush()
+    
+    def _format(self, now: float) -> str:
+        elapsed = max(now - self.started, 1e-6)
+        line = (f"⏳ {self.processed} processed | ✅ {self.succeeded} ok | ❌ {self.failed} failed | "
+                f"{self.processed / elapsed:.1f} rec/s | {elapsed:.0f}s elapsed")
+        limits = adaptive_limits()
+        if limits:
+            line += f" | 🎚️  POST limit {'+'.join(str(limit) for limit in limits.values())}"
+        return line
+
+def build_dataframe_column_plan(columns: Iterable[str]) -> tuple:
+    """
+    Work out once per DataFrame how each column maps into the v1 assistant dict.
+    
+    Returns:
+        (plan, data_position) - plan is a list of (column_position, nested_path) for flattened 'data.*' columns
+        (e.g. 'data.internal_metadata.feature_flags' -> ('internal_metadata', 'feature_flags')), and data_position
+        is the position of a raw 'data' column, used only when there are no flattened columns
+    """
+    plan = []
+    data_position = None
+    for position, column in enumerate(columns):
+        if column.startswith('data.'):
+            plan.append((position, tuple(column[5:].split('.'))))  # Remove 'data.' (5 characters)
+        elif column == 'data':
+            data_position = position
+    return plan, (None if plan else data_position)
+
+def iter_assistants_from_dataframe(v1_data) -> Iterable[Dict[str, Any]]:
+    """
+    Rebuild v1 assistant dicts from a Cosmos DB DataFrame (flattened 'data.*' columns or a raw 'data' column).
+    The column-to-path plan is computed once and rows are read as plain tuples, so there is no per-row column scanning.
+    """
+    plan, data_position = build_dataframe_column_plan(v1_data.columns)
+    if not plan and data_position is None:
+        return
+    
+    for row in v1_data.itertuples(index=False, name=None):
+        if plan:
+            # Reconstruct nested structure
+            v1_assistant = {}
+            for position, path in plan:
+                current = v1_assistant
+                for part in path[:-1]:
+                    current = current.setdefault(part, {})
+                current[path[-1]] = row[position]
+        else:
+            raw_data = row[data_position]
+            if isinstance(raw_data, str):
+                v1_assistant = json.loads(raw_data)
+            elif isinstance(raw_data, dict):
+                v1_assistant = raw_data
+            else:
+                continue
+        
+        # Clean up None values
+        yield {k: v for k, v in v1_assistant.items() if v is not None}
+
+def process_v1_assistants_to_v2_agents(args=None, assistant_id: Optional[str] = None, cosmos_connection_string: Optional[str] = None, use_api: bool = False, project_endpoint: Optional[str] = None, project_connection_string: Optional[str] = None, project_subscription: Optional[str] = None, project_resource_group: Optional[str] = None, project_name: Optional[str] = None, production_resource: Optional[str] = None, production_subscription: Optional[str] = None, production_tenant: Optional[str] = None, source_tenant: Optional[str] = None, progress: Optional["ProgressReporter"] = None, record_slot: Optional[Callable[[], Any]] = None) -> Optional[tuple]:
+    """
+    Main processing function that reads v1 assistants from Cosmos DB, API, Project endpoint, or Project connection string,
+    converts them to v2 agents, and saves via v2 API.
+    
+    Args:
+        assistant_id: Optional specific assistant ID to migrate (if not provided, migrates all)
+        cosmos_connection_string: Optional Cosmos connection string (if not provided, uses environment variable)
+        use_api: If True, read v1 assistants from API instead of Cosmos DB
+        project_endpoint: Optional project endpoint for AIProjectClient (e.g., "https://...api/projects/p-3")
+        project_connection_string: Optional project connection string for AIProjectClient (e.g., "eastus.api.azureml.ms;...;...;...")
+        source_tenant: Optional source tenant ID for authentication when reading v1 assistants
+        progress: Optional progress reporter shared with other migrations (manifest mode); created from args.progress otherwise
+        record_slot: Optional factory of a context manager held while each record is migrated (manifest mode concurrency limits)
+    
+    Returns:
+        (processed_count, seen_count), or None if nothing was migrated
+    """
+    
+    # Message reported when a streamed listing turns out to be empty
+    empty_message = None
+    
+    # Offline options: read from an export file and/or write payloads locally instead of POSTing
+    input_jsonl = getattr(args, 'input_jsonl', None)
+    dry_run = bool(getattr(args, 'dry_run', False))
+    verify = bool(getattr(args, 'verify', False))
+    payload_writer = None
+    journal = None
+    try:
+        if dry_run:
+            payload_writer = PayloadWriter(getattr(args, 'output_jsonl', None) or DEFAULT_DRY_RUN_OUTPUT)
+            logger.info(f"📝 Dry run: v2 payloads will be written to {payload_writer.path} (no v2 API calls)")
+        
+        # Open the checkpoint journal so progress survives restarts (--resume skips completed assistants).
+        # Dry runs never post, so they don't touch the journal; --verify only reads it to find the posted versions.
+        journal_path = getattr(args, 'journal', None) or DEFAULT_JOURNAL_PATH
+        resume = bool(getattr(args, 'resume', False)) and not dry_run and not verify
+        journal = None if dry_run else MigrationJournal(journal_path)
+        # Journal entries only count for the v2 target they were posted to
+        target = get_target_key(production_resource, production_subscription)
+        if journal:
+            KNOWN_CONTENT_HASHES.seed_from_journal(journal, target)
+        if resume:
+            completed = len(journal.posted_states(target))
+            logger.info(f"♻️  Resuming from journal {journal_path} ({completed} assistants already migrated to {target or 'the local v2 API'})")
         
-        if not v1_assistants:
-            print("❌ No v1 assistants found from API")
+        if resume and assistant_id and journal.is_completed(assistant_id, target):
+            logger.info(f"⏭️  Assistant {assistant_id} was already migrated (v2 version: {journal.get(assistant_id).get('v2_id', 'N/A')}), nothing to do")
             return
         
-        print(f"📊 Found {len(v1_assistants)} v1 assistant records from API")
+        # Curated ID list: fetched concurrently per ID (or filtered in one query/pass for Cosmos and JSONL sources)
+        assistant_ids = None
+        assistant_ids_file = getattr(args, 'assistant_ids_file', None)
+        fetch_concurrency = getattr(args, 'fetch_concurrency', None) or DEFAULT_FETCH_CONCURRENCY
+        if assistant_ids_file:
+            assistant_ids = read_assistant_ids_file(assistant_ids_file)
+            logger.info(f"📋 Migrating {len(assistant_ids)} assistant ID(s) from {assistant_ids_file}")
+            if resume:
+                pending_ids = [a for a in assistant_ids if not journal.is_completed(a, target)]
+                for _ in range(len(assistant_ids) - len(pending_ids)):
+                    journal.mark_resumed()
+                if len(pending_ids) < len(assistant_ids):
+                    logger.info(f"⏭️  {len(assistant_ids) - len(pending_ids)} of them were already migrated and won't be fetched again")
+                assistant_ids = pending_ids
+            if not assistant_ids:
+                logger.warning(f"⚠️  No assistant IDs left to migrate from {assistant_ids_file}")
+                return
         
-    else:
-        print(f"📖 Reading v1 assistants from Cosmos DB: {DATABASE_NAME}/{SOURCE_CONTAINER}")
-        # Use provided connection string or fall back to environment variable
-        connection_string = cosmos_connection_string or COSMOS_CONNECTION_STRING
-        
-        if not connection_string:
-            print("Error: COSMOS_CONNECTION_STRING environment variable must be set or provided as parameter")
-            print("Set it with: $env:COSMOS_CONNECTION_STRING='AccountEndpoint=...;AccountKey=...'")
-            print("Or provide it as command line argument: python v1_to_v2_migration.py <assistant_id> <cosmos_connection_string>")
-            sys.exit(1)
+        def record_fetch_failure(failed_id: str, error: str):
+            """Journal a curated ID that could not be fetched, so it shows up as failed rather than silently missing."""
+            if journal:
+                journal.record(failed_id, JOURNAL_STATUS_FAILED, error=error[:1000])
         
-        # Build query - filter by assistant_id if provided
-        if assistant_id:
-            query = f"SELECT * FROM c WHERE c.object_type = 'v1_assistant' AND c.data.id = '{assistant_id}'"
-            print(f"🎯 Filtering for specific assistant ID: {assistant_id}")
-        else:
-            query = "SELECT * FROM c WHERE c.object_type = 'v1_assistant'"
-            print("📊 Processing all v1 assistants")
-        
-        # Read v1 assistant data from source container
-        v1_data = fetch_data(
-            database_name=DATABASE_NAME,
-            container_name=SOURCE_CONTAINER,
-            connection_string=connection_string,
-            query=query
-        )
+        # Handle package version management based on usage
+        need_beta_version = os.environ.get('NEED_BETA_VERSION') == 'true' or project_connection_string is not None
         
-        if v1_data is None or v1_data.empty:
-            print("❌ No v1 assistant data found in source container")
-            return
+        if need_beta_version:
+            logger.info("🔧 Project connection string detected - checking that the beta version is installed...")
+            if not ensure_project_connection_package():
+                logger.error("❌ Required beta version of azure-ai-projects is not installed")
+                sys.exit(1)
+        if input_jsonl:
+            logger.info(f"📂 Reading v1 assistants from export file: {input_jsonl}")
+            if not os.path.exists(input_jsonl):
+                logger.error(f"❌ Input file not found: {input_jsonl}")
+                sys.exit(1)
         
-        print(f"📊 Found {len(v1_data)} v1 assistant records from Cosmos DB")
+            v1_assistants = stream_with_error_report(
+                iter_assistants_from_jsonl(input_jsonl),
+                f"❌ Failed to read assistants from {input_jsonl}"
+            )
+            if assistant_id:
+                logger.info(f"🎯 Filtering for specific assistant ID: {assistant_id}")
+                v1_assistants = (a for a in v1_assistants if a.get("id") == assistant_id)
+            elif assistant_ids:
+                wanted_ids = set(assistant_ids)
+                v1_assistants = (a for a in v1_assistants if a.get("id") in wanted_ids)
+            empty_message = f"❌ No v1 assistants found in {input_jsonl}"
         
-        # Convert pandas DataFrame to list for uniform processing
-        v1_assistants = []
-        for idx, (index, row) in enumerate(v1_data.iterrows()):
-            # Process Cosmos DB row format (same logic as before)
-            v1_assistant = {}
-            
-            # Check if we have flattened 'data.*' columns
-            data_columns = [col for col in row.keys() if col.startswith('data.')]
-            
-            if data_columns:
-                # Reconstruct nested structure
-                for col in data_columns:
-                    field_name = col[5:]  # Remove 'data.' (5 characters)
-                    value = row[col]
-                    
-                    # Handle nested fields like 'internal_metadata.feature_flags'
-                    if '.' in field_name:
-                        parts = field_name.split('.')
-                        current = v1_assistant
-                        for part in parts[:-1]:
-                            if part not in current:
-                                current[part] = {}
-                            current = current[part]
-                        current[parts[-1]] = value
-                    else:
-                        v1_assistant[field_name] = value
-                        
-            elif 'data' in row and row['data'] is not None:
-                raw_data = row['data']
-                if isinstance(raw_data, str):
-                    v1_assistant = json.loads(raw_data)
-                elif isinstance(raw_data, dict):
-                    v1_assistant = raw_data
-                else:
-                    continue
+        elif project_connection_string:
+            logger.info("🏢 Reading v1 assistants from Project Connection String")
+            if not PROJECT_CLIENT_AVAILABLE:
+                logger.error("❌ Error: azure-ai-projects package is required for project connection string functionality")
+                logger.info("Install with: pip install azure-ai-projects==1.0.0b10")
+                sys.exit(1)
+        
+            # Get assistants from Project Client using connection string
+            if assistant_id:
+                logger.info(f"🎯 Fetching specific assistant from project connection: {assistant_id}")
+                try:
+                    assistant_data = get_assistant_from_project_connection(project_connection_string, assistant_id)
+                    v1_assistants = [assistant_data]
+                except Exception as e:
+                    logger.error(f"❌ Failed to fetch assistant {assistant_id} from project connection: {e}")
+                    return
+            elif assistant_ids:
+                v1_assistants = iter_assistants_by_id(
+                    assistant_ids,
+                    lambda a: get_assistant_from_project_connection(project_connection_string, a),
+                    fetch_concurrency, "project connection", record_fetch_failure
+                )
+                empty_message = "❌ None of the requested assistants could be fetched from project connection"
             else:
-                continue
-            
-            # Clean up None values
-            v1_assistant = {k: v for k, v in v1_assistant.items() if v is not None}
-            v1_assistants.append(v1_assistant)
-    
-    # Ensure we have API authentication for v2 API saving
-    # Use source tenant for authentication (for reading v1 assistants)
-    # Force refresh if we have production resource (might have switched tenants)
-    force_refresh = production_resource is not None
-    tenant_for_auth = source_tenant if source_tenant else SOURCE_TENANT
-    if not TOKEN and not set_api_token(force_refresh=force_refresh, tenant_id=tenant_for_auth):
-        print("❌ Error: Unable to obtain API authentication token for v2 API saving")
-        print("Set AZ_TOKEN env var or ensure az CLI is installed and logged in")
-        sys.exit(1)
-    
-    # Now we have uniform v1_assistants list regardless of source
-    # Process each v1 assistant
-    processed_count = 0
-    for idx, v1_assistant in enumerate(v1_assistants):
-        try:
-            print(f"\n🔄 Processing record {idx + 1}/{len(v1_assistants)}")
-            
-            if project_connection_string:
-                print(f"   ✅ Processing Project Connection data for assistant: {v1_assistant.get('id', 'unknown')}")
-            elif project_endpoint:
-                print(f"   ✅ Processing Project Endpoint data for assistant: {v1_assistant.get('id', 'unknown')}")
-            elif use_api:
-                print(f"   ✅ Processing API data for assistant: {v1_assistant.get('id', 'unknown')}")
+                logger.info("📊 Fetching all assistants from project connection")
+                # Stream page by page so conversion starts as soon as the first page arrives
+                v1_assistants = stream_with_error_report(
+                    iter_assistants_from_project_connection(project_connection_string),
+                    "❌ Failed to fetch assistants from project connection"
+                )
+                empty_message = "❌ No v1 assistants found from project connection"
+        
+        elif project_endpoint:
+            logger.info(f"🏢 Reading v1 assistants from Project Endpoint: {project_endpoint}")
+            if not PROJECT_CLIENT_AVAILABLE:
+                logger.error("❌ Error: azure-ai-projects package is required for project endpoint functionality")
+                logger.info("Install with: pip install azure-ai-projects")
+                sys.exit(1)
+        
+            # Get assistants from Project Client
+            if assistant_id:
+                logger.info(f"🎯 Fetching specific assistant from project: {assistant_id}")
+                try:
+                    assistant_data = get_assistant_from_project(project_endpoint, assistant_id, project_subscription, project_resource_group, project_name)
+                    v1_assistants = [assistant_data]
+                except Exception as e:
+                    logger.error(f"❌ Failed to fetch assistant {assistant_id} from project: {e}")
+                    return
+            elif assistant_ids:
+                v1_assistants = iter_assistants_by_id(
+                    assistant_ids,
+                    lambda a: get_assistant_from_project(project_endpoint, a, project_subscription, project_resource_group, project_name),
+                    fetch_concurrency, "project", record_fetch_failure
+                )
+                empty_message = "❌ None of the requested assistants could be fetched from project"
             else:
-                print(f"   ✅ Processing Cosmos DB data for assistant: {v1_assistant.get('id', 'unknown')}")
-            
-            # Clean up None values
-            v1_assistant = {k: v for k, v in v1_assistant.items() if v is not None}
-            
-            # Helper function to ensure tools array exists and is properly formatted
-            def ensure_tools_array():
-                if "tools" not in v1_assistant:
-                    v1_assistant["tools"] = []
-                elif isinstance(v1_assistant["tools"], str):
-                    # Handle string-encoded tools
-                    try:
-                        v1_assistant["tools"] = json.loads(v1_assistant["tools"])
-                    except:
-                        v1_assistant["tools"] = []
-                
-                # Ensure tools is a list
-                if not isinstance(v1_assistant["tools"], list):
-                    v1_assistant["tools"] = []
-            
-            # Add test tools if requested
-            if args:
-                # Add test function tool
-                if hasattr(args, 'add_test_function') and args.add_test_function:
-                    print("🧪 Adding test function tool for testing...")
-                    test_function_tool = {
-                        "type": "function",
-                        "function": {
-                            "name": "get_current_temperature",
-                            "description": "Get the current temperature for a specific location",
-                            "parameters": {
-                                "type": "object",
-                                "properties": {
-                                    "location": {
-                                        "type": "string",
-                                        "description": "The city and state, e.g., San Francisco, CA"
-                                    },
-                                    "unit": {
-                                        "type": "string",
-                                        "enum": ["Celsius", "Fahrenheit"],
-                                        "description": "The temperature unit to use. Infer this from the user's location."
-                                    }
-                                },
-                                "required": ["location", "unit"]
-                            }
-                        }
-                    }
-                    ensure_tools_array()
-                    v1_assistant["tools"].append(test_function_tool)
-                    print(f"   ✅ Added test function tool: {test_function_tool['function']['name']}")
-                
-                # Add test MCP tool
-                if hasattr(args, 'add_test_mcp') and args.add_test_mcp:
-                    print("🧪 Adding test MCP tool for testing...")
-                    test_mcp_tool = {
-                        "type": "mcp",
-                        "server_label": "dmcp",
-                        "server_description": "A Dungeons and Dragons MCP server to assist with dice rolling.",
-                        "server_url": "https://dmcp-server.deno.dev/sse",
-                        "require_approval": "never",
-                    }
-                    ensure_tools_array()
-                    v1_assistant["tools"].append(test_mcp_tool)
-                    print(f"   ✅ Added test MCP tool: {test_mcp_tool['server_label']}")
-                
-                # Add test image generation tool
-                if hasattr(args, 'add_test_imagegen') and args.add_test_imagegen:
-                    print("🧪 Adding test image generation tool for testing...")
-                    test_imagegen_tool = {
-                        "type": "image_generation"
-                    }
-                    ensure_tools_array()
-                    v1_assistant["tools"].append(test_imagegen_tool)
-                    print(f"   ✅ Added test image generation tool")
-                
-                # Add test computer use tool
-                if hasattr(args, 'add_test_computer') and args.add_test_computer:
-                    print("🧪 Adding test computer use tool for testing...")
-                    test_computer_tool = {
-                        "type": "computer_use_preview",
-                        "display_width": 1024,
-                        "display_height": 768,
-                        "environment": "browser"  # other possible values: "mac", "windows", "ubuntu"
-                    }
-                    ensure_tools_array()
-                    v1_assistant["tools"].append(test_computer_tool)
-                    print(f"   ✅ Added test computer use tool: {test_computer_tool['environment']} environment")
-                
-                # Add test Azure Function tool
-                if hasattr(args, 'add_test_azurefunction') and args.add_test_azurefunction:
-                    print("🧪 Adding test Azure Function tool for testing...")
-                    # Using your local Azurite instance
-                    storage_service_endpoint = "https://127.0.0.1:8001"
-                    test_azurefunction_tool = {
-                        "type": "azure_function",
-                        "name": "foo",
-                        "description": "Get answers from the foo bot.",
-                        "parameters": {
-                            "type": "object",
-                            "properties": {
-                                "query": {
-                                    "type": "string", 
-                                    "description": "The question to ask."
-                                },
-                                "outputqueueuri": {
-                                    "type": "string", 
-                                    "description": "The full output queue URI."
-                                }
-                            },
-                            "required": ["query"]
-                        },
-                        "input_queue": {
-                            "queue_name": "azure-function-foo-input",
-                            "storage_service_endpoint": storage_service_endpoint
-                        },
-                        "output_queue": {
-                            "queue_name": "azure-function-foo-output", 
-                            "storage_service_endpoint": storage_service_endpoint
-                        }
-                    }
-                    ensure_tools_array()
-                    v1_assistant["tools"].append(test_azurefunction_tool)
-                    print(f"   ✅ Added test Azure Function tool: {test_azurefunction_tool['name']} (using Azurite at {storage_service_endpoint})")
-            
-            # Pretty print the full v1 object for inspection
-            print(f"\n📋 Full v1 Assistant Object:")
-            print("=" * 60)
-            import pprint
-            pprint.pprint(v1_assistant, indent=2, width=80)
-            print("=" * 60)
-            
-            assistant_id = v1_assistant.get('id', 'unknown')
-            
-            print(f"   Assistant ID: {assistant_id}")
-            print(f"   Assistant Name: {v1_assistant.get('name', 'N/A')}")
-            print(f"   Assistant Model: {v1_assistant.get('model', 'N/A')}")
-            
-            # Preview the detected agent kind
-            detected_kind = determine_agent_kind(v1_assistant)
-            print(f"   🔍 Detected Agent Kind: {detected_kind}")
-            
-            # Convert v1 to v2
-            v2_agent = v1_assistant_to_v2_agent(v1_assistant)
-            
-            # Save to target container with proper project_id
-            # You can customize this project_id as needed
-            project_id = "e2e-tests-westus2-account@e2e-tests-westus2@AML"  # Match existing data format
-            
-            # Extract feature flags to pass to save function
-            v1_metadata = v1_assistant.get("metadata", {})
-            assistant_feature_flags = {}
-            if "feature_flags" in v1_metadata:
-                assistant_feature_flags = v1_metadata.get("feature_flags", {})
-            elif "internal_metadata" in v1_assistant and isinstance(v1_assistant["internal_metadata"], dict):
-                assistant_feature_flags = v1_assistant["internal_metadata"].get("feature_flags", {})
-            
-            # Save the v2 agent via v2 API
-            print("🌐 Saving via v2 API...")
-            # Extract agent name (without version) for the API endpoint
-            agent_name = v2_agent['v2_agent_object']['name']
+                logger.info("📊 Fetching all assistants from project")
+                # Stream page by page so conversion starts as soon as the first page arrives
+                v1_assistants = stream_with_error_report(
+                    iter_assistants_from_project(project_endpoint, project_subscription, project_resource_group, project_name),
+                    "❌ Failed to fetch assistants from project"
+                )
+                empty_message = "❌ No v1 assistants found from project"
+        
+        elif use_api:
+            logger.info("🌐 Reading v1 assistants from API")
+            # Ensure we have API authentication
+            if not TOKEN and not set_api_token():
+                logger.error("❌ Error: Unable to obtain API authentication token")
+                logger.info("Set AZ_TOKEN env var or ensure az CLI is installed and logged in")
+                sys.exit(1)
+        
+            # Get assistants from API
+            if assistant_id:
+                logger.info(f"🎯 Fetching specific assistant from API: {assistant_id}")
+                try:
+                    assistant_data = get_assistant_from_api(assistant_id)
+                    v1_assistants = [assistant_data]
+                except Exception as e:
+                    logger.error(f"❌ Failed to fetch assistant {assistant_id} from API: {e}")
+                    return
+            elif assistant_ids:
+                v1_assistants = iter_assistants_by_id(assistant_ids, get_assistant_from_api, fetch_concurrency, "API", record_fetch_failure)
+                empty_message = "❌ None of the requested assistants could be fetched from API"
+            else:
+                logger.info("📊 Fetching all assistants from API")
+                # Stream page by page so conversion starts as soon as the first page arrives
+                v1_assistants = stream_with_error_report(
+                    iter_assistants_from_api(),
+                    "❌ Failed to fetch assistants from API"
+                )
+                empty_message = "❌ No v1 assistants found from API"
+        
+        else:
+            logger.info(f"📖 Reading v1 assistants from Cosmos DB: {DATABASE_NAME}/{SOURCE_CONTAINER}")
+            # Use provided connection string or fall back to environment variable
+            connection_string = cosmos_connection_string or COSMOS_CONNECTION_STRING
+        
+            if not connection_string:
+                logger.error("Error: COSMOS_CONNECTION_STRING environment variable must be set or provided as parameter")
+                logger.info("Set it with: $env:COSMOS_CONNECTION_STRING='AccountEndpoint=...;AccountKey=...'")
+                logger.info("Or provide it as command line argument: python v1_to_v2_migration.py <assistant_id> <cosmos_connection_string>")
+                sys.exit(1)
+        
+            if getattr(args, 'cosmos_dataframe', False):
+                # Legacy reader: load the whole result into a DataFrame before processing starts
+                if assistant_id:
+                    # fetch_data takes no query parameters, so quote the ID as a Cosmos SQL string literal
+                    quoted_id = assistant_id.replace("\\", "\\\\").replace("'", "\\'")
+                    query = f"SELECT * FROM c WHERE c.object_type = 'v1_assistant' AND c.data.id = '{quoted_id}'"
+                    logger.info(f"🎯 Filtering for specific assistant ID: {assistant_id}")
+                else:
+                    query = "SELECT * FROM c WHERE c.object_type = 'v1_assistant'"
+                    logger.info("📊 Processing all v1 assistants")
             
-            # Prepare the payload for v2 API
-            api_payload = prepare_v2_api_payload(v2_agent)
+                # Read v1 assistant data from source container (read_cosmos_data pulls in pandas)
+                from read_cosmos_data import fetch_data
+                v1_data = fetch_data(
+                    database_name=DATABASE_NAME,
+                    container_name=SOURCE_CONTAINER,
+                    connection_string=connection_string,
+                    query=query
+                )
             
-            # Create the agent version via v2 API
-            # Production token is provided via environment variable
-            if production_resource and not PRODUCTION_TOKEN:
-                print(f"❌ Production resource specified but no PRODUCTION_TOKEN environment variable found. Skipping v2 API save.")
-                print("💡 Use run-migration-docker-auth.ps1 for automatic dual-token authentication")
-                continue
+                if v1_data is None or v1_data.empty:
+                    logger.error("❌ No v1 assistant data found in source container")
+                    return
             
-            api_result = create_agent_version_via_api(agent_name, api_payload, production_resource, production_subscription)
-            print(f"✅ Agent version created via v2 API: {api_result.get('id', 'N/A')}")
+                logger.info(f"📊 Found {len(v1_data)} v1 assistant records from Cosmos DB")
             
-            processed_count += 1
+                # Reconstruct assistants row by row as the migration consumes them
+                v1_assistants = iter_assistants_from_dataframe(v1_data)
+            else:
+                cosmos_partition_key = getattr(args, 'cosmos_partition_key', None)
+                point_read = None
+                if assistant_id:
+                    logger.info(f"🎯 Filtering for specific assistant ID: {assistant_id}")
+                    if cosmos_partition_key is not None:
+                        # Point read: one cheap read instead of a cross-partition query
+                        item_id = getattr(args, 'cosmos_item_id', None) or assistant_id
+                        logger.info(f"🎯 Point-reading Cosmos item {item_id} (partition key: {cosmos_partition_key})")
+                        point_read = read_assistant_from_cosmos(connection_string, item_id, cosmos_partition_key, assistant_id=assistant_id)
+                        if point_read is None:
+                            logger.warning("⚠️  Point read found no matching v1 assistant, falling back to a query")
+                else:
+                    logger.info("📊 Processing all v1 assistants")
             
-        except KeyError as ke:
-            print(f"❌ KeyError processing record {idx + 1}: {ke}")
-            print(f"   Assistant data keys: {list(v1_assistant.keys()) if v1_assistant else 'N/A'}")
-            continue
-        except json.JSONDecodeError as je:
-            print(f"❌ JSON decode error processing record {idx + 1}: {je}")
-            continue
-        except Exception as e:
-            print(f"❌ Error processing record {idx + 1}: {e}")
-            print(f"   Error type: {type(e)}")
-            import traceback
-            traceback.print_exc()
-            continue
+                if point_read is not None:
+                    v1_assistants = [point_read]
+                else:
+                    # Stream page by page (optionally one query per feed range) so conversion starts with the first page
+                    v1_assistants = stream_with_error_report(
+                        iter_assistants_from_cosmos(
+                            connection_string,
+                            assistant_id=assistant_id,
+                            assistant_ids=assistant_ids,
+                            parallelism=getattr(args, 'cosmos_parallelism', None) or DEFAULT_COSMOS_PARALLELISM,
+                            page_size=getattr(args, 'cosmos_page_size', None) or COSMOS_PAGE_SIZE
+                        ),
+                        "❌ Failed to read v1 assistants from Cosmos DB"
+                    )
+                    empty_message = "❌ No v1 assistant data found in source container"
+        
+        # Ensure we have API authentication for v2 API saving
+        # Use source tenant for authentication (for reading v1 assistants)
+        # Force refresh if we have production resource (might have switched tenants)
+        force_refresh = production_resource is not None
+        tenant_for_auth = source_tenant if source_tenant else SOURCE_TENANT
+        if not dry_run and not TOKEN and not set_api_token(force_refresh=force_refresh, tenant_id=tenant_for_auth):
+            logger.error("❌ Error: Unable to obtain API authentication token for v2 API saving")
+            logger.info("Set AZ_TOKEN env var or ensure az CLI is installed and logged in")
+            sys.exit(1)
+        
+        # Now we have uniform v1_assistants records (a list or a page-by-page stream) regardless of source
+        # Process each v1 assistant (in parallel when --concurrency > 1)
+        if input_jsonl:
+            source_label = "Input JSONL"
+        elif project_connection_string:
+            source_label = "Project Connection"
+        elif project_endpoint:
+            source_label = "Project Endpoint"
+        elif use_api:
+            source_label = "API"
+        else:
+            source_label = "Cosmos DB"
+        
+        concurrency = getattr(args, 'concurrency', None) or DEFAULT_CONCURRENCY
+        if concurrency > 1 and not verify:
+            logger.info(f"⚡ Migrating with concurrency {concurrency} ({getattr(args, 'engine', None) or DEFAULT_ENGINE} engine)")
+        
+        # Streamed sources don't know their size up front
+        total = len(v1_assistants) if isinstance(v1_assistants, list) else None
+        owns_progress = progress is None and getattr(args, 'progress', False)
+        if owns_progress:
+            progress = ProgressReporter()
+        
+        record_options = dict(
+            args=args, production_resource=production_resource, production_subscription=production_subscription,
+            journal=journal, resume=resume, payload_writer=payload_writer, production_tenant=production_tenant
+        )
+        
+        def record_result(success: bool):
+            METRICS.increment("succeeded" if success else "failed")
+            if progress:
+                progress.update(success)
+        
+        def migrate_record(idx: int, v1_assistant: Dict[str, Any]) -> bool:
+            with (record_slot() if record_slot else contextlib.nullcontext()):
+                success = migrate_v1_assistant_isolated(idx, total, v1_assistant, source_label, **record_options)
+            record_result(success)
+            return success
+        
+        if verify:
+            report = VerificationReport(getattr(args, 'verify_report', None) or DEFAULT_VERIFY_REPORT)
+            verify_concurrency = getattr(args, 'verify_concurrency', None) or DEFAULT_VERIFY_CONCURRENCY
+            logger.info(f"🔎 Verifying migrated agents with {verify_concurrency} parallel fetches (report: {report.path})")
+            try:
+                matched_count, seen_count = verify_migrated_assistants(
+                    METRICS.timed_iter(v1_assistants, "fetch"), report, verify_concurrency, on_result=record_result,
+                    args=args, journal=journal, production_resource=production_resource,
+                    production_subscription=production_subscription, production_tenant=production_tenant
+                )
+            finally:
+                if owns_progress:
+                    progress.finish()
+                report.close()
+        
+            if seen_count == 0 and empty_message:
+                logger.warning(empty_message)
+                return
+        
+            counts = report.counts
+            print("\n🔎 Verification completed!")
+            print(f"   Agents verified: {seen_count}")
+            print(f"   ✅ Match: {counts[VERIFY_MATCH]} | ❗ Mismatch: {counts[VERIFY_MISMATCH]} | ❓ Missing: {counts[VERIFY_MISSING]} | ❌ Errors: {counts[VERIFY_ERROR]}")
+            print(f"   Report: {report.path} ({seen_count - matched_count} agent(s) need attention)")
+            return matched_count, seen_count
+        
+        try:
+            if (getattr(args, 'engine', None) or DEFAULT_ENGINE) == "pipeline":
+                processed_count, seen_count = run_migration_pipeline(
+                    METRICS.timed_iter(v1_assistants, "fetch"), total, source_label, concurrency,
+                    getattr(args, 'pipeline_queue_size', None) or DEFAULT_PIPELINE_QUEUE_SIZE,
+                    on_result=record_result, record_slot=record_slot, **record_options
+                )
+            else:
+                processed_count, seen_count = run_with_bounded_concurrency(METRICS.timed_iter(v1_assistants, "fetch"), migrate_record, concurrency)
+        finally:
+            if owns_progress:
+                progress.finish()
+        
+        if seen_count == 0 and empty_message:
+            logger.warning(empty_message)
+            return
+        
+        print("\n🎉 Migration completed!")
+        print(f"   Total records processed: {processed_count}/{seen_count}")
+        if journal and journal.resumed_count:
+            print(f"   Skipped (already migrated): {journal.resumed_count}")
+        if journal:
+            print(f"   Journal: {journal_path}")
+        if input_jsonl:
+            print(f"   Source: Input JSONL ({input_jsonl})")
+        elif project_connection_string:
+            print("   Source: Project Connection String")
+        elif project_endpoint:
+            print(f"   Source: Project Endpoint ({project_endpoint})")
+        elif use_api:
+            print(f"   Source: API ({BASE_V1})")
+        else:
+            print(f"   Source: Cosmos DB ({DATABASE_NAME}/{SOURCE_CONTAINER})")
+        
+        if payload_writer:
+            print(f"   Target: dry run ({payload_writer.count} payloads written to {payload_writer.path})")
+        else:
+            print(f"   Target: v2 API ({get_v2_agents_base_url(production_resource, production_subscription)})")
+        
+        return processed_count, seen_count
+    finally:
+        if journal:
+            journal.close()
+        if payload_writer:
+            payload_writer.close()
+
+def print_metrics_summary(metrics_report: Optional[str] = None):
+    """Print the run's throughput, stage latencies, retries and throttles, and write the JSON report if a path is given."""
+    report = METRICS.report()
+    stage_latencies = ", ".join(f"{stage} p95 {stats['p95_ms']:.0f} ms" for stage, stats in report["stages"].items() if stats["count"])
+    print(f"   Throughput: {report['records']['per_second']} records/s over {report['elapsed_s']:.1f}s ({stage_latencies or 'no stage timings'})")
+    print(f"   Retries: {report['retries']}, throttled responses: {report['throttles']}")
+    if report["adaptive_concurrency"]:
+        limits = ", ".join(f"{target or 'v2 API'}: {limit}" for target, limit in report["adaptive_concurrency"]["limits"].items())
+        print(f"   Adaptive POST concurrency: {limits or 'no POSTs'} ({report['adaptive_concurrency']['decreases']} decrease(s))")
+    if metrics_report:
+        METRICS.write_report(metrics_report)
+        print(f"   Metrics report: {metrics_report}")
+
+# Manifest mode (--manifest): many source projects and v2 targets migrated in one process
+DEFAULT_TARGET_CONCURRENCY = 4  # Records in flight per v2 target
+DEFAULT_MANIFEST_PARALLEL_PROJECTS = 4  # Manifest migrations streamed at the same time
+MANIFEST_SOURCE_KEYS = ["input_jsonl", "project_connection_string", "project_endpoint", "use_api", "cosmos_connection_string"]
+MANIFEST_ENTRY_KEYS = set(MANIFEST_SOURCE_KEYS) | {
+    "name", "assistant_id", "assistant_ids_file",
+    "project_subscription", "project_resource_group", "project_name", "source_tenant",
+    "production_resource", "production_subscription", "production_tenant",
+    "target_concurrency", "journal", "output_jsonl",
+}
+
+def load_migration_manifest(path: str) -> List[Dict[str, Any]]:
+    """
+    Load a migration manifest: a JSON or YAML (requires PyYAML) document with an optional `defaults`
+    mapping and a `migrations` list. Each migration names one source and one production target,
+    using the command line option names (e.g. project_endpoint, production_resource).
     
-    print(f"\n🎉 Migration completed!")
-    print(f"   Total records processed: {processed_count}/{len(v1_assistants)}")
-    if project_connection_string:
-        print(f"   Source: Project Connection String")
-    elif project_endpoint:
-        print(f"   Source: Project Endpoint ({project_endpoint})")
-    elif use_api:
-        print(f"   Source: API ({HOST})")
+    Returns:
+        The migrations with defaults applied, each with a unique `name`
+    
+    Raises:
+        ValueError: If the manifest is malformed
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if path.lower().endswith((".yaml", ".yml")):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError(f"Reading {path} requires PyYAML (pip install pyyaml); use a JSON manifest otherwise")
+        try:
+            document = yaml.safe_load(text)
+        except yaml.YAMLError as e:
+            raise ValueError(str(e))
     else:
-        print(f"   Source: Cosmos DB ({DATABASE_NAME}/{SOURCE_CONTAINER})")
+        document = json.loads(text)
+    
+    if isinstance(document, list):
+        document = {"migrations": document}
+    if not isinstance(document, dict) or not isinstance(document.get("migrations"), list) or not document["migrations"]:
+        raise ValueError(f"{path} must contain a non-empty 'migrations' list")
+    defaults = document.get("defaults") or {}
+    if not isinstance(defaults, dict):
+        raise ValueError(f"'defaults' in {path} must be a mapping")
+    
+    entries = []
+    names = set()
+    for index, migration in enumerate(document["migrations"]):
+        if not isinstance(migration, dict):
+            raise ValueError(f"Migration #{index + 1} in {path} must be a mapping")
+        entry = dict(defaults, **migration)
+        unknown = set(entry) - MANIFEST_ENTRY_KEYS
+        if unknown:
+            raise ValueError(f"Migration #{index + 1} in {path} has unknown key(s): {', '.join(sorted(unknown))}")
+        sources = [key for key in MANIFEST_SOURCE_KEYS if entry.get(key)]
+        if len(sources) > 1:
+            raise ValueError(f"Migration #{index + 1} in {path} has more than one source: {', '.join(sources)}")
+        entry["name"] = str(entry.get("name") or f"migration-{index + 1}")
+        if entry["name"] in names:
+            raise ValueError(f"Duplicate migration name '{entry['name']}' in {path}")
+        names.add(entry["name"])
+        entries.append(entry)
+    return entries
+
+class MigrationSlots:
+    """
+    Limits on records in flight shared by all manifest migrations: one global limit (--concurrency)
+    and one per v2 target (--target-concurrency, or the lowest target_concurrency of its migrations).
+    """
+    def __init__(self, total: int, target_limits: Dict[str, int]):
+        self._global = threading.BoundedSemaphore(total)
+        self._targets = {target: threading.BoundedSemaphore(limit) for target, limit in target_limits.items()}
     
-    # Always using v2 API
-    print(f"   Target: v2 API ({BASE_V2})")
+    @contextlib.contextmanager
+    def slot(self, target: str):
+        """Hold one slot of `target` and one global slot, always acquired in that order."""
+        with self._targets[target]:
+            with self._global:
+                yield
+
+def run_migration_manifest(args) -> int:
+    """
+    Run every migration in the --manifest file in this process. Migrations share the token cache,
+    the HTTP connection pool and project clients, and draw records from a global limit with
+    per-target limits on top, so hundreds of projects don't each pay for a container start and login.
+    
+    Returns:
+        The number of migrations that failed
+    
+    Raises:
+        ValueError: If the manifest is malformed or a migration has no target
+    """
+    entries = load_migration_manifest(args.manifest)
+    
+    target_limits: Dict[str, int] = {}
+    for entry in entries:
+        if not args.dry_run and not BASE_V2 and not (entry.get("production_resource") and entry.get("production_subscription") and (entry.get("production_tenant") or PRODUCTION_TENANT)):
+            raise ValueError(f"Migration '{entry['name']}' needs production_resource, production_subscription and production_tenant (unless --dry-run or --v2-base-url is used)")
+        target = get_target_key(entry.get("production_resource"), entry.get("production_subscription"))
+        limit = int(entry.get("target_concurrency") or args.target_concurrency)
+        if limit < 1:
+            raise ValueError(f"target_concurrency of migration '{entry['name']}' must be at least 1")
+        target_limits[target] = min(limit, target_limits.get(target, limit))
+    
+    # The v1 API token is process-wide, so all sources must live in one tenant
+    source_tenants = {entry.get("source_tenant") or args.source_tenant or SOURCE_TENANT for entry in entries}
+    if len(source_tenants) > 1:
+        raise ValueError(f"All manifest migrations must read from the same source tenant, found: {', '.join(sorted(source_tenants))}")
+    source_tenant = source_tenants.pop()
+    
+    print(f"📋 Manifest {args.manifest}: {len(entries)} migration(s) to {len(target_limits)} target(s)")
+    print(f"⚡ {args.concurrency} record(s) in flight overall, {args.manifest_parallel_projects} migration(s) at a time")
+    for target, limit in sorted(target_limits.items()):
+        print(f"   🎯 {target or 'default target'}: up to {limit} in flight")
+    print("=" * 50)
+    
+    # Authenticate once up front; every migration reuses the cached token
+    if not args.dry_run and not TOKEN and not set_api_token(tenant_id=source_tenant):
+        logger.error("❌ Error: Unable to obtain API authentication token")
+        logger.info("Set AZ_TOKEN env var or ensure az CLI is installed and logged in")
+        return len(entries)
+    
+    slots = MigrationSlots(args.concurrency, target_limits)
+    progress = ProgressReporter() if args.progress else None
+    output_dir = os.path.dirname(args.journal) or "."
+    
+    def run_entry(entry: Dict[str, Any]) -> Dict[str, Any]:
+        name = entry["name"]
+        target = get_target_key(entry.get("production_resource"), entry.get("production_subscription"))
+        file_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        entry_args = argparse.Namespace(**vars(args))
+        entry_args.assistant_ids_file = entry.get("assistant_ids_file")
+        entry_args.input_jsonl = entry.get("input_jsonl")
+        entry_args.journal = entry.get("journal") or os.path.join(output_dir, "journals", f"{file_name}.jsonl")
+        entry_args.output_jsonl = entry.get("output_jsonl") or os.path.join(output_dir, "payloads", f"{file_name}.jsonl")
+        entry_args.concurrency = min(args.concurrency, target_limits[target])
+        logger.info(f"▶️  Starting migration '{name}'")
+        try:
+            result = process_v1_assistants_to_v2_agents(
+                entry_args, entry.get("assistant_id"), entry.get("cosmos_connection_string"), bool(entry.get("use_api")),
+                entry.get("project_endpoint"), entry.get("project_connection_string"), entry.get("project_subscription"),
+                entry.get("project_resource_group"), entry.get("project_name"), entry.get("production_resource"),
+                entry.get("production_subscription"), entry.get("production_tenant") or PRODUCTION_TENANT, source_tenant,
+                progress=progress, record_slot=lambda: slots.slot(target)
+            )
+        except (Exception, SystemExit) as e:
+            # sys.exit() in a migration (e.g. a missing input file) only fails that migration
+            error = f"stopped with exit code {e.code}" if isinstance(e, SystemExit) else str(e) or type(e).__name__
+            logger.error(f"❌ Migration '{name}' failed: {error}")
+            return {"name": name, "target": target, "processed": 0, "seen": 0, "error": error}
+        processed_count, seen_count = result or (0, 0)
+        return {"name": name, "target": target, "processed": processed_count, "seen": seen_count, "error": None}
+    
+    with ThreadPoolExecutor(max_workers=min(args.manifest_parallel_projects, len(entries)), thread_name_prefix="manifest") as executor:
+        results = list(executor.map(run_entry, entries))
+    if progress:
+        progress.finish()
+    
+    failed = [r for r in results if r["error"] or r["processed"] < r["seen"]]
+    print("\n🎉 Manifest migration completed!")
+    for r in results:
+        status = "❌" if r in failed else "✅"
+        detail = f"error: {r['error']}" if r["error"] else f"{r['processed']}/{r['seen']} records"
+        print(f"   {status} {r['name']} -> {r['target'] or 'default target'}: {detail}")
+    print(f"   Migrations: {len(results) - len(failed)} succeeded, {len(failed)} with failures")
+    print_metrics_summary(args.metrics_report)
+    return len(failed)
 
 def main():
     """
     Main function to orchestrate the v1 to v2 migration.
     """
+    global MAX_RETRIES, PRODUCTION_TENANT, BASE_V1, BASE_V2, ADAPTIVE_MAX_LIMIT, ADAPTIVE_START_LIMIT
+    
     parser = argparse.ArgumentParser(
         description="Migrate v1 OpenAI Assistants to v2 Azure ML Agents",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1778,6 +3706,39 @@ Examples:
         help='Optional: Cosmos DB connection string. If not provided, uses COSMOS_CONNECTION_STRING environment variable.'
     )
     
+    parser.add_argument(
+        '--manifest',
+        type=str,
+        help='Migrate every source project/target pair listed in this JSON or YAML manifest in one process (see README). Sources and targets then come from the manifest.'
+    )
+    
+    parser.add_argument(
+        '--target-concurrency',
+        type=int,
+        default=DEFAULT_TARGET_CONCURRENCY,
+        help=f'With --manifest: records in flight per v2 target, on top of the global --concurrency limit (default: {DEFAULT_TARGET_CONCURRENCY}; a migration\'s target_concurrency overrides it).'
+    )
+    
+    parser.add_argument(
+        '--manifest-parallel-projects',
+        type=int,
+        default=DEFAULT_MANIFEST_PARALLEL_PROJECTS,
+        help=f'With --manifest: number of migrations streamed at the same time (default: {DEFAULT_MANIFEST_PARALLEL_PROJECTS}).'
+    )
+    
+    parser.add_argument(
+        '--assistant-ids-file',
+        type=str,
+        help='Migrate the assistants listed in this file (one ID per line, duplicates ignored). IDs are fetched concurrently and converted as they arrive.'
+    )
+    
+    parser.add_argument(
+        '--fetch-concurrency',
+        type=int,
+        default=DEFAULT_FETCH_CONCURRENCY,
+        help=f'Number of assistants fetched in parallel with --assistant-ids-file (default: {DEFAULT_FETCH_CONCURRENCY}).'
+    )
+    
     parser.add_argument(
         '--use-api',
         action='store_true',
@@ -1848,22 +3809,19 @@ Examples:
     parser.add_argument(
         '--production-resource',
         type=str,
-        required=True,
-        help='Production Azure AI resource name (REQUIRED). Example: "nextgen-eastus"'
+        help='Production Azure AI resource name (REQUIRED unless --dry-run). Example: "nextgen-eastus"'
     )
     
     parser.add_argument(
         '--production-subscription', 
         type=str,
-        required=True,
-        help='Production subscription ID (REQUIRED). Example: "b1615458-c1ea-49bc-8526-cafc948d3c25"'
+        help='Production subscription ID (REQUIRED unless --dry-run). Example: "b1615458-c1ea-49bc-8526-cafc948d3c25"'
     )
     
     parser.add_argument(
         '--production-tenant',
         type=str,
-        required=True,
-        help='Production tenant ID for Azure authentication (REQUIRED). Example: "33e577a9-b1b8-4126-87c0-673f197bf624"'
+        help='Production tenant ID for Azure authentication (REQUIRED unless --dry-run). Example: "33e577a9-b1b8-4126-87c0-673f197bf624"'
     )
     
     parser.add_argument(
@@ -1872,63 +3830,339 @@ Examples:
         help='Source tenant ID for reading v1 assistants. If not provided, uses SOURCE_TENANT environment variable or defaults to Microsoft tenant (72f988bf-86f1-41af-91ab-2d7cd011db47). Example: "72f988bf-86f1-41af-91ab-2d7cd011db47"'
     )
     
+    # Bulk migration performance options
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f'Number of assistants to migrate in parallel (default: {DEFAULT_CONCURRENCY}). Each worker runs convert -> prepare payload -> POST independently; a failure only affects its own record.'
+    )
+    
+    parser.add_argument(
+        '--rate-limit',
+        type=float,
+        default=DEFAULT_RATE_LIMIT,
+        help='Maximum number of API requests per second sent to any single host, shared across all workers (default: 0 = unlimited).'
+    )
+    
+    parser.add_argument(
+        '--adaptive-concurrency',
+        action='store_true',
+        help='Adapt the number of agent version POSTs in flight per target (AIMD): raise it while responses are fast and not throttled, halve it on 429/503. --concurrency becomes the upper bound.'
+    )
+    
+    parser.add_argument(
+        '--adaptive-initial-limit',
+        type=int,
+        default=ADAPTIVE_INITIAL_LIMIT,
+        help=f'Starting POST concurrency per target with --adaptive-concurrency (default: {ADAPTIVE_INITIAL_LIMIT}, capped at --concurrency).'
+    )
+    
+    parser.add_argument(
+        '--engine',
+        choices=ENGINES,
+        default=DEFAULT_ENGINE,
+        help='How records are processed: "pipeline" runs fetch, convert, upload and journal writes as separate stages connected by bounded queues (--concurrency uploads in flight); "threads" runs the whole per-record migration in --concurrency worker threads (default: %(default)s).'
+    )
+    
+    parser.add_argument(
+        '--pipeline-queue-size',
+        type=int,
+        default=DEFAULT_PIPELINE_QUEUE_SIZE,
+        help=f'Records buffered between two pipeline stages; bounds memory when the v2 API is the bottleneck (default: {DEFAULT_PIPELINE_QUEUE_SIZE}).'
+    )
+    
+    parser.add_argument(
+        '--http-pool-size',
+        type=int,
+        default=None,
+        help='Number of keep-alive connections pooled per host (default: concurrency + 2, minimum 10).'
+    )
+    
+    parser.add_argument(
+        '--max-retries',
+        type=int,
+        default=MAX_RETRIES,
+        help=f'Maximum retries for throttled (429/503) or transient API failures, with Retry-After-aware exponential backoff (default: {MAX_RETRIES}).'
+    )
+    
+    # Cosmos DB source options
+    parser.add_argument(
+        '--cosmos-parallelism',
+        type=int,
+        default=DEFAULT_COSMOS_PARALLELISM,
+        help=f'Number of Cosmos DB feed ranges queried in parallel when reading from Cosmos DB (default: {DEFAULT_COSMOS_PARALLELISM}; 1 = single cross-partition query).'
+    )
+    
+    parser.add_argument(
+        '--cosmos-page-size',
+        type=int,
+        default=COSMOS_PAGE_SIZE,
+        help=f'Items per Cosmos DB query page (default: {COSMOS_PAGE_SIZE}).'
+    )
+    
+    parser.add_argument(
+        '--cosmos-partition-key',
+        type=str,
+        help='Partition key value of the assistant document. With an assistant ID this point-reads the single document instead of running a cross-partition query.'
+    )
+    
+    parser.add_argument(
+        '--cosmos-item-id',
+        type=str,
+        help='Cosmos DB document ID for the point read, when it differs from the assistant ID (default: the assistant ID).'
+    )
+    
+    parser.add_argument(
+        '--cosmos-dataframe',
+        action='store_true',
+        help='Use the legacy Cosmos DB reader that loads the full result into a DataFrame (read_cosmos_data.fetch_data) before processing.'
+    )
+    
+    # Endpoint overrides (e.g. for load-testing against mock_agents_server.py)
+    parser.add_argument(
+        '--v1-base-url',
+        type=str,
+        help='Base URL of the v1 assistants API used by --use-api (default: AGENTS_V1_BASE_URL env var or the AGENTS_HOST workspace URL).'
+    )
+    
+    parser.add_argument(
+        '--v2-base-url',
+        type=str,
+        help='Base URL that v2 agent versions are POSTed to ({base}/agents/{name}/versions), overriding the production/local endpoint. Production parameters are then optional.'
+    )
+    
+    # Offline conversion options
+    parser.add_argument(
+        '--input-jsonl',
+        type=str,
+        help='Read v1 assistants from a local JSONL export (one assistant JSON object per line) instead of Cosmos DB, API or project.'
+    )
+    
+    parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Convert and prepare payloads without calling the v2 API; payloads are written to --output-jsonl. Production parameters are not required.'
+    )
+    
+    parser.add_argument(
+        '--output-jsonl',
+        type=str,
+        default=DEFAULT_DRY_RUN_OUTPUT,
+        help=f'Where --dry-run writes the prepared v2 payloads (default: {DEFAULT_DRY_RUN_OUTPUT}).'
+    )
+    
+    # Output options
+    parser.add_argument(
+        '--log-level',
+        choices=LOG_LEVELS,
+        type=str.upper,
+        help=f'Verbosity of per-record output: DEBUG adds full v1 objects and request payloads, WARNING/ERROR keep only problems (default: {DEFAULT_LOG_LEVEL}, or WARNING with --progress).'
+    )
+    
+    parser.add_argument(
+        '--progress',
+        action='store_true',
+        help='Show a compact progress line (processed/ok/failed, rec/s) on stderr instead of detailed per-record output.'
+    )
+    
+    parser.add_argument(
+        '--metrics-report',
+        type=str,
+        default=DEFAULT_METRICS_REPORT,
+        help=f'Where to write the JSON run report: per-stage p50/p95/p99 timings, per-host HTTP latency, retries, throttles and records/s (default: {DEFAULT_METRICS_REPORT}; empty string to skip).'
+    )
+    
+    parser.add_argument(
+        '--otel',
+        action='store_true',
+        help='Also record metrics through OpenTelemetry (requires opentelemetry-api; exported by the configured SDK, e.g. under opentelemetry-instrument).'
+    )
+    
+    parser.add_argument(
+        '--force-new-version',
+        action='store_true',
+        help='Always create a new agent version, even when the latest version already has the same content hash.'
+    )
+    
+    # Post-migration verification
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Verify a previous run instead of migrating: fetch the agent version recorded in the journal for each v1 assistant (or the latest version), and diff it against a freshly prepared payload and the original v1 tools/tool_resources. Nothing is posted.'
+    )
+    
+    parser.add_argument(
+        '--verify-report',
+        type=str,
+        default=DEFAULT_VERIFY_REPORT,
+        help=f'Where --verify writes one JSON line per mismatched, missing or failed agent (default: {DEFAULT_VERIFY_REPORT}).'
+    )
+    
+    parser.add_argument(
+        '--verify-concurrency',
+        type=int,
+        default=DEFAULT_VERIFY_CONCURRENCY,
+        help=f'Agent versions fetched in parallel by --verify (default: {DEFAULT_VERIFY_CONCURRENCY}).'
+    )
+    
+    # Checkpoint / resume options
+    parser.add_argument(
+        '--journal',
+        type=str,
+        default=DEFAULT_JOURNAL_PATH,
+        help=f'Path of the JSONL journal that records fetched/converted/posted status per assistant (default: {DEFAULT_JOURNAL_PATH}, or MIGRATION_JOURNAL env var).'
+    )
+    
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Resume a previous run: skip assistants the journal already records as posted, so no duplicate agent versions are created.'
+    )
+    
     args = parser.parse_args()
     
+    BASE_V1 = (args.v1_base_url or BASE_V1).rstrip('/')
+    BASE_V2 = (args.v2_base_url or BASE_V2 or '').rstrip('/') or None
+    if args.manifest:
+        conflicting = [option for option, value in [
+            ("assistant_id", args.assistant_id), ("cosmos_endpoint", args.cosmos_endpoint), ("--assistant-ids-file", args.assistant_ids_file),
+            ("--input-jsonl", args.input_jsonl), ("--use-api", args.use_api), ("--project-endpoint", args.project_endpoint),
+            ("--project-connection-string", args.project_connection_string), ("--production-resource", args.production_resource),
+            ("--production-subscription", args.production_subscription),
+        ] if value]
+        if conflicting:
+            parser.error(f"--manifest takes sources and targets from the manifest and cannot be combined with {', '.join(conflicting)}")
+        if args.target_concurrency < 1 or args.manifest_parallel_projects < 1:
+            parser.error("--target-concurrency and --manifest-parallel-projects must be at least 1")
+    elif not args.dry_run and not BASE_V2 and not (args.production_resource and args.production_subscription and args.production_tenant):
+        parser.error("--production-resource, --production-subscription and --production-tenant are required (unless --dry-run or --v2-base-url is used)")
+    if args.verify and (args.dry_run or args.manifest):
+        parser.error("--verify checks a previous run against the v2 API and cannot be combined with --dry-run or --manifest")
+    if args.concurrency < 1 or args.verify_concurrency < 1:
+        parser.error("--concurrency and --verify-concurrency must be at least 1")
+    if args.adaptive_initial_limit < 1:
+        parser.error("--adaptive-initial-limit must be at least 1")
+    if args.pipeline_queue_size < 1:
+        parser.error("--pipeline-queue-size must be at least 1")
+    if args.max_retries < 0:
+        parser.error("--max-retries must be 0 or greater")
+    if args.assistant_ids_file and args.assistant_id:
+        parser.error("--assistant-ids-file cannot be combined with a single assistant_id")
+    if args.assistant_ids_file and args.cosmos_dataframe:
+        parser.error("--assistant-ids-file is not supported with --cosmos-dataframe")
+    if args.fetch_concurrency < 1:
+        parser.error("--fetch-concurrency must be at least 1")
+    if args.cosmos_parallelism < 1 or args.cosmos_page_size < 1:
+        parser.error("--cosmos-parallelism and --cosmos-page-size must be at least 1")
+    configure_logging(args.log_level or ("WARNING" if args.progress else DEFAULT_LOG_LEVEL))
+    if args.otel and not METRICS.enable_opentelemetry():
+        logger.warning("⚠️  --otel requested but opentelemetry-api is not installed (pip install opentelemetry-api); metrics go to the JSON report only")
+    RATE_LIMITER.rate = args.rate_limit
+    MAX_RETRIES = args.max_retries
+    if args.adaptive_concurrency:
+        ADAPTIVE_MAX_LIMIT = args.concurrency
+        ADAPTIVE_START_LIMIT = args.adaptive_initial_limit
+    # Leave headroom for the page prefetcher and token/connectivity calls on top of the workers
+    if args.manifest:
+        # Every migration in flight may run its own ID fetchers and page prefetcher
+        fetchers = (args.fetch_concurrency + 1) * args.manifest_parallel_projects
+    else:
+        fetchers = args.fetch_concurrency if args.assistant_ids_file else 0
+    configure_http_session(args.http_pool_size or max(args.concurrency + fetchers + 2, HTTP_POOL_SIZE))
+    
+    if args.manifest:
+        PRODUCTION_TENANT = args.production_tenant or PRODUCTION_TENANT
+        if PRODUCTION_TOKEN:
+            # Targets in PRODUCTION_TENANT use the provided token; other tenants get theirs from az CLI
+            TOKEN_CACHE.put(PRODUCTION_TOKEN, PRODUCTION_TENANT)
+        print("🚀 Starting v1 to v2 Agent Migration (manifest mode)")
+        print("=" * 50)
+        METRICS.start()
+        try:
+            failed = run_migration_manifest(args)
+        except (OSError, ValueError) as e:
+            parser.error(f"Invalid manifest {args.manifest}: {e}")
+        sys.exit(1 if failed else 0)
+    
     # Handle empty string as None for assistant_id
     assistant_id = args.assistant_id if args.assistant_id and args.assistant_id.strip() else None
     cosmos_connection_string = args.cosmos_endpoint if args.cosmos_endpoint and args.cosmos_endpoint.strip() else None
     
-    # Production arguments are now required, so no additional validation needed
+    # Production arguments are validated above (required unless --dry-run)
     
     print("🚀 Starting v1 to v2 Agent Migration")
     print("=" * 50)
     
-    # Production parameters are required
-    print(f"🏭 Production v2 API Configuration:")
-    print(f"   🎯 Resource: {args.production_resource}")
-    print(f"   📋 Subscription: {args.production_subscription}")
-    print(f"   🔐 Tenant: {args.production_tenant}")
-    
-    if PRODUCTION_TOKEN:
-        print(f"   ✅ Production token available (length: {len(PRODUCTION_TOKEN)})")
+    if args.dry_run:
+        print(f"📝 Dry run: no v2 API calls, payloads written to {args.output_jsonl}")
+    elif BASE_V2 and not args.production_resource:
+        print(f"🎯 v2 API base URL: {BASE_V2}")
     else:
-        print("   ⚠️  No PRODUCTION_TOKEN environment variable found")
-        print("   💡 Use run-migration-docker-auth.ps1 for automatic dual-token authentication")
+        # Production parameters are required
+        print("🏭 Production v2 API Configuration:")
+        print(f"   🎯 Resource: {args.production_resource}")
+        print(f"   📋 Subscription: {args.production_subscription}")
+        print(f"   🔐 Tenant: {args.production_tenant}")
+        
+        if PRODUCTION_TOKEN:
+            # Seed the shared cache so the production token is refreshed before it expires during long runs
+            PRODUCTION_TENANT = args.production_tenant or PRODUCTION_TENANT
+            TOKEN_CACHE.put(PRODUCTION_TOKEN, PRODUCTION_TENANT)
+            print(f"   ✅ Production token available (length: {len(PRODUCTION_TOKEN)})")
+        else:
+            print("   ⚠️  No PRODUCTION_TOKEN environment variable found")
+            print("   💡 Use run-migration-docker-auth.ps1 for automatic dual-token authentication")
     
     if assistant_id:
         print(f"🎯 Target Assistant ID: {assistant_id}")
+    elif args.assistant_ids_file:
+        print(f"📋 Assistant IDs from: {args.assistant_ids_file} ({args.fetch_concurrency} parallel fetches)")
     else:
         print("📊 Processing all assistants")
-        
-    if cosmos_connection_string:
-        print("🔗 Using provided Cosmos connection string")
-    else:
-        print("🔗 Using COSMOS_CONNECTION_STRING environment variable")
-    
-    if args.project_connection_string:
-        print(f"🏢 Reading assistants from Project Connection String")
-    elif args.project_endpoint:
-        print(f"🏢 Reading assistants from Project Endpoint: {args.project_endpoint}")
-    elif args.use_api:
-        print("🌐 Reading assistants from v1 API")
+    
+    if args.input_jsonl:
+        print(f"📂 Reading assistants from export file: {args.input_jsonl}")
     else:
-        print("💾 Reading assistants from Cosmos DB")
+        if cosmos_connection_string:
+            print("🔗 Using provided Cosmos connection string")
+        else:
+            print("🔗 Using COSMOS_CONNECTION_STRING environment variable")
+        
+        if args.project_connection_string:
+            print("🏢 Reading assistants from Project Connection String")
+        elif args.project_endpoint:
+            print(f"🏢 Reading assistants from Project Endpoint: {args.project_endpoint}")
+        elif args.use_api:
+            print("🌐 Reading assistants from v1 API")
+        else:
+            print("💾 Reading assistants from Cosmos DB")
     
-    # Always using v2 API (required)
-    if args.production_resource:
+    # v2 API is always the target, unless this is a dry run
+    if args.verify:
+        print(f"🔎 Verifying migrated agents against the journal {args.journal} ({args.verify_concurrency} parallel fetches), report: {args.verify_report}")
+    elif BASE_V2 and not args.dry_run:
+        print(f"🎯 Saving agents via v2 API at {BASE_V2}")
+    elif not args.dry_run:
         print(f"🏭 Saving agents via PRODUCTION v2 API (resource: {args.production_resource})")
         print(f"   📋 Production subscription: {args.production_subscription}")
-    else:
-        print("🚀 Saving agents via PROD v2 API")
+    
+    if args.concurrency > 1 or args.rate_limit:
+        print(f"⚡ Concurrency: {args.concurrency} worker(s), rate limit: {args.rate_limit or 'unlimited'} req/s per host")
     
     print("=" * 50)
     
-    process_v1_assistants_to_v2_agents(
+    METRICS.start()
+    result = process_v1_assistants_to_v2_agents(
         args, assistant_id, cosmos_connection_string, args.use_api, 
         args.project_endpoint, args.project_connection_string, args.project_subscription, 
         args.project_resource_group, args.project_name, args.production_resource, 
         args.production_subscription, args.production_tenant, args.source_tenant
     )
+    if result is not None:
+        print_metrics_summary(args.metrics_report)
+    if args.verify and result is not None and result[0] < result[1]:
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
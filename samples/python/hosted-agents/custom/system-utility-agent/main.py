@@ -12,12 +12,16 @@ Tools included (per your request):
 - list_environment_variables
 """
 
+import asyncio
 import datetime
+import functools
 import os
 import json
+import threading
 
-from azure.identity import DefaultAzureCredential
-from azure.ai.projects import AIProjectClient
+from azure.identity.aio import DefaultAzureCredential
+from azure.ai.projects.aio import AIProjectClient
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any, Dict, List, AsyncGenerator, Union
 from azure.ai.agentserver.core import AgentRunContext, FoundryCBAgent
@@ -36,7 +40,7 @@ from azure.ai.agentserver.core.models.projects import (
 )
 from azure.ai.agentserver.core.logger import get_logger
 from dotenv import load_dotenv
-from openai import AzureOpenAI
+from openai import AsyncAzureOpenAI
 from local_tools import TOOLS, TOOL_IMPL
 
 from opentelemetry import trace
@@ -68,6 +72,8 @@ class AgentConfig:
     openai_api_version: str = field(default_factory=lambda: os.getenv("OPENAI_API_VERSION", "2025-11-15-preview"))
     openai_api_key: str = field(default_factory=lambda: os.getenv("AZURE_OPENAI_API_KEY", ""))
     azure_endpoint: str = field(default_factory=lambda: os.getenv("AZURE_ENDPOINT", ""))
+    tool_timeout_seconds: float = field(default_factory=lambda: float(os.getenv("AGENT_TOOL_TIMEOUT_SECONDS", "30")))
+    max_tool_workers: int = field(default_factory=lambda: int(os.getenv("AGENT_MAX_TOOL_WORKERS", "8")))
 
 
 class SystemUtilityAgent(FoundryCBAgent):
@@ -75,21 +81,44 @@ class SystemUtilityAgent(FoundryCBAgent):
         super().__init__(**kwargs)
 
         self.cfg = AgentConfig()
+        # Async clients, so waiting on the model doesn't block the server's event loop and
+        # concurrent conversations are served in parallel
+        self.credential = None
+        self.project_client = None
         if not self.cfg.project_endpoint:
-            self.client = AzureOpenAI(
+            self.client = AsyncAzureOpenAI(
                 api_version=self.cfg.openai_api_version,
                 azure_endpoint=self.cfg.azure_endpoint,
                 api_key=self.cfg.openai_api_key,
             )
-            logger.info("Using AzureOpenAI client with key-based auth.")
+            logger.info("Using AsyncAzureOpenAI client with key-based auth.")
         else:
+            self.credential = DefaultAzureCredential()
             self.project_client = AIProjectClient(
                 endpoint=self.cfg.project_endpoint,
-                credential=DefaultAzureCredential(),
+                credential=self.credential,
             )
             self.client = self.project_client.get_openai_client()
         
         self.hit_limit_warning = f"I hit the {self.cfg.max_turns} max turn limit for this turn. Try rephrasing."
+        # Tools are blocking (e.g. resource_snapshot samples CPU for ~0.8s), so they run off the event loop
+        self.tool_executor = ThreadPoolExecutor(max_workers=self.cfg.max_tool_workers, thread_name_prefix="tool")
+        # Timed-out tool calls can't be interrupted and keep their worker thread until they return
+        self._stalled_tools = 0
+        self._stalled_tools_lock = threading.Lock()
+        # The async clients hold aiohttp/httpx sessions that must be closed on the server's event loop
+        self.app.add_event_handler("shutdown", self.aclose)
+
+    async def aclose(self):
+        """Close the model clients and the credential, and stop the tool pool (registered as a server shutdown handler)."""
+        try:
+            # One failing close must not leave the others (or the tool pool) open
+            closers = [c.close() for c in (self.client, self.project_client, self.credential) if c]
+            for result in await asyncio.gather(*closers, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.warning(f"Error while closing a client on shutdown: {type(result).__name__}: {result}")
+        finally:
+            self.tool_executor.shutdown(wait=False, cancel_futures=True)
 
     def init_tracing_internal(self, exporter_endpoint=None, app_insights_conn_str=None):
         # optional: for local debugging, export spans to console
@@ -160,6 +189,65 @@ class SystemUtilityAgent(FoundryCBAgent):
 
         return _async_stream()
 
+    async def _run_tool_call(self, item: Any) -> Dict[str, Any]:
+        """Run one tool call on the tool pool and return its function_call_output item."""
+        with self.tracer.start_as_current_span("SystemUtilityAgent.tool_call_execution") as tool_span:
+            name, args, call_id = extract_tool_call(item)
+            tool_span.set_attribute("gen_ai.tool.name", name)
+            tool_span.set_attribute("gen_ai.tool.type", "function")
+            tool_span.set_attribute("gen_ai.tool.call.id", call_id or "")
+            tool_span.set_attribute(
+                "gen_ai.tool.call.arguments",
+                json.dumps(args or {}, default=str)[:1024],
+            )
+            with self._stalled_tools_lock:
+                workers_exhausted = self._stalled_tools >= self.cfg.max_tool_workers
+            if name not in TOOL_IMPL:
+                tool_result = {"supported": False, "reason": f"Unknown tool: {name}", "data": None}
+                tool_span.set_status(Status(StatusCode.ERROR, "Unknown tool"))
+            elif workers_exhausted:
+                # Every worker is stuck in a timed-out call; fail fast instead of queueing until this call times out too
+                tool_result = {"supported": False, "reason": "All tool workers are busy with calls that timed out earlier; try again later", "data": None}
+                tool_span.set_status(Status(StatusCode.ERROR, "No tool worker available"))
+            else:
+                future = self.tool_executor.submit(functools.partial(TOOL_IMPL[name], **(args or {})))
+                try:
+                    tool_result = await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.cfg.tool_timeout_seconds)
+                    tool_span.set_status(Status(StatusCode.OK))
+                except asyncio.TimeoutError:
+                    if not future.cancel():
+                        # Already running: the thread can't be interrupted, so it stays busy until the tool returns
+                        self._track_stalled_tool(name, future)
+                    tool_span.set_status(Status(StatusCode.ERROR, "Tool timed out"))
+                    tool_result = {"supported": False, "reason": f"Tool timed out after {self.cfg.tool_timeout_seconds:g}s", "data": None}
+                except Exception as e:
+                    tool_span.record_exception(e)
+                    tool_span.set_status(Status(StatusCode.ERROR, str(e)))
+                    tool_result = {"supported": False, "reason": f"Tool error: {type(e).__name__}: {e}", "data": None}
+            tool_span.set_attribute("gen_ai.tool.call.result", json.dumps(tool_result, default=str))
+            return {
+                "type": "function_call_output",
+                "call_id": call_id or name,
+                "output": json.dumps(tool_result),
+            }
+
+    def _track_stalled_tool(self, name: str, future: Any):
+        """Count a timed-out tool call as holding a worker until it returns."""
+        def release(_):
+            with self._stalled_tools_lock:
+                self._stalled_tools -= 1
+            logger.info(f"Timed-out tool call {name} finished; its result was discarded.")
+
+        with self._stalled_tools_lock:
+            self._stalled_tools += 1
+            stalled = self._stalled_tools
+        logger.warning(f"Tool call {name} timed out and keeps running in the background ({stalled}/{self.cfg.max_tool_workers} tool workers busy with timed-out calls).")
+        future.add_done_callback(release)
+
+    async def _run_tool_calls(self, tool_calls: List[Any]) -> List[Dict[str, Any]]:
+        """Run the tool calls of one model turn concurrently; outputs are returned in call order."""
+        return list(await asyncio.gather(*(self._run_tool_call(item) for item in tool_calls)))
+
     def _final_text_to_response(self, final_text: str, context: AgentRunContext) -> OpenAIResponse:
         """Convert final text to a non-streaming OpenAIResponse."""
         return OpenAIResponse({
@@ -197,7 +285,7 @@ class SystemUtilityAgent(FoundryCBAgent):
 
         current_conv = None
         try:
-            current_conv = self.client.conversations.retrieve(conversation_id=context.conversation_id)
+            current_conv = await self.client.conversations.retrieve(conversation_id=context.conversation_id)
         except Exception as e:
             logger.warning(f"Failed to retrieve conversation {context.conversation_id}: {e}. Agent will work without prior history.")
         total_input_tokens = 0
@@ -214,7 +302,7 @@ class SystemUtilityAgent(FoundryCBAgent):
                 if current_conv:
                     request_payload["conversation"] = current_conv.id
                 
-                resp = self.client.responses.create(**request_payload)
+                resp = await self.client.responses.create(**request_payload)
                 
                 if current_conv:
                     # reset this to avoid duplicate input items in conversation
@@ -236,7 +324,7 @@ class SystemUtilityAgent(FoundryCBAgent):
                     iter_span.set_attribute("gen_ai.usage.input_tokens", input_tokens)
                     iter_span.set_attribute("gen_ai.usage.output_tokens", output_tokens)
                 # Find tool calls; if none, print assistant text and break
-                called_any = False
+                tool_calls: List[Any] = []
                 assistant_text_chunks: List[str] = []
                 for item in resp.output:
                     item_type = item.type
@@ -248,34 +336,12 @@ class SystemUtilityAgent(FoundryCBAgent):
                         continue
                     # Tool call items often look like: {"type":"function_call", "name":..., "arguments":...}
                     if item_type == "function_call":
-                        with self.tracer.start_as_current_span("SystemUtilityAgent.tool_call_execution") as tool_span:
-                            called_any = True
-                            name, args, call_id = extract_tool_call(item)
-                            tool_span.set_attribute("gen_ai.tool.name", name)
-                            tool_span.set_attribute("gen_ai.tool.type", "function")
-                            tool_span.set_attribute("gen_ai.tool.call.id", call_id or "")
-                            tool_span.set_attribute(
-                                "gen_ai.tool.call.arguments",
-                                json.dumps(args or {}, default=str)[:1024],
-                            )
-                            if name not in TOOL_IMPL:
-                                tool_result = {"supported": False, "reason": f"Unknown tool: {name}", "data": None}
-                                tool_span.set_status(Status(StatusCode.ERROR, "Unknown tool"))
-                            else:
-                                try:
-                                    tool_result = TOOL_IMPL[name](**(args or {}))
-                                    tool_span.set_status(Status(StatusCode.OK))
-                                except Exception as e:
-                                    tool_span.record_exception(e)
-                                    tool_span.set_status(Status(StatusCode.ERROR, str(e)))
-                                    tool_result = {"supported": False, "reason": f"Tool error: {type(e).__name__}: {e}", "data": None}
-                            # Append tool result back to the conversation
-                            input_messages.append({
-                                "type": "function_call_output",
-                                "call_id": call_id or name,
-                                "output": json.dumps(tool_result),
-                            })
-                            tool_span.set_attribute("gen_ai.tool.call.result", json.dumps(tool_result, default=str))
+                        tool_calls.append(item)
+                # Run this turn's tool calls concurrently, so the turn takes as long as the slowest tool;
+                # results are appended back to the conversation in call order
+                called_any = bool(tool_calls)
+                if tool_calls:
+                    input_messages += await self._run_tool_calls(tool_calls)
             if not called_any:
                 # No tool calls; return final assistant text
                 final_text = "\n".join(assistant_text_chunks).strip()